@@ -0,0 +1,262 @@
+"""
+Benchmarks of the time and memory the framework itself adds to a test, against the local stand-in site.
+
+Cases:
+    page_fixture       ContextPool acquire, goto baseURL and release, as the page fixture does
+    report_screenshot  capture, base64-encode and embed a report screenshot, as pytest_runtest_makereport does
+    page_manager       PageManager construction
+    pdf_assert         PDFAssert text, regex and page count checks on main/resources/sample_report.pdf
+    excel_io           ExcelHandler write and read of a 500-row sheet
+    json_io            JsonHandler overwrite, append and read
+
+Each case reports cold (first call, or a call after its cache was reset), warm (median of repeated calls)
+and the peak Python memory of one warm call (tracemalloc). Browser cases are skipped when no browser can start.
+Results are compared with the baselines in benchmarks/baselines.json; the run fails when a metric is worse
+than its baseline by more than the threshold (and by more than a small absolute amount, to ignore noise),
+and when a measured case has no baseline yet.
+
+    python -m benchmarks.framework_overhead_bench                  # compare with the baselines
+    python -m benchmarks.framework_overhead_bench --save-baseline  # record new baselines on this machine
+    python -m benchmarks.framework_overhead_bench --cases pdf_assert json_io --threshold 0.3
+"""
+import argparse
+import json
+import logging
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from statistics import median
+from typing import Callable, Dict, List, Optional
+from benchmarks import standin_site
+from main.envi.settings import load_settings
+from main.utils.excel_handler import ExcelHandler
+from main.utils.json_handler import JsonHandler
+from main.utils.pdf_assert import PDFAssert
+from main.utils.pdf_text_store import PDFTextStore
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+BASELINE_PATH = PROJECT_ROOT / "benchmarks" / "baselines.json"
+RESULTS_PATH = PROJECT_ROOT / "reports" / "benchmarks.json"
+SAMPLE_PDF = PROJECT_ROOT / "main" / "resources" / "sample_report.pdf"
+
+# Differences below these are noise whatever the relative change
+MIN_DELTA = {"cold_ms": 5.0, "warm_ms": 2.0, "peak_kib": 64.0}
+
+BROWSER_CASES = ("page_fixture", "report_screenshot", "page_manager")
+CASES = BROWSER_CASES + ("pdf_assert", "excel_io", "json_io")
+
+
+class BrowserUnavailable(Exception):
+    pass
+
+
+def measure(run: Callable[[], object], reset: Optional[Callable[[], None]] = None, repeat: int = 10) -> Dict[str, float]:
+    """
+    Time a callable cold and warm, and the peak memory of a warm call.
+
+    With reset, every cold sample follows a reset and cold is their median; without it cold is the very first call.
+    """
+    cold_samples = []
+    for _ in range(repeat if reset else 1):
+        if reset:
+            reset()
+        start = time.perf_counter()
+        run()
+        cold_samples.append(time.perf_counter() - start)
+        if not reset:
+            break
+    run()  # warm-up after the last reset
+
+    warm_samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        warm_samples.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "cold_ms": round(median(cold_samples) * 1000, 3),
+        "cold_samples": len(cold_samples),
+        "warm_ms": round(median(warm_samples) * 1000, 3),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def file_cases(temp_dir: Path) -> Dict[str, tuple]:
+    """(run, reset) of the cases that need no browser."""
+    # A store of its own that the reset empties, so cold runs parse the PDF instead of loading stored text
+    text_store = PDFTextStore(temp_dir / "pdf_text_store")
+    PDFAssert.text_store = text_store
+
+    def pdf_reset():
+        PDFAssert.invalidate_cache()
+        text_store.clear()
+
+    def pdf_checks():
+        PDFAssert.assert_text_exists(SAMPLE_PDF, "Quality Assurance")
+        PDFAssert.assert_regex_pattern(SAMPLE_PDF, r"Quality\s+\w+")
+        PDFAssert.get_page_count(SAMPLE_PDF)
+
+    rows = [["name", "email", "service"]] + [[f"User {i}", f"user{i}@example.com", "Data"] for i in range(500)]
+    excel_path = temp_dir / "bench.xlsx"
+
+    def excel_io():
+        ExcelHandler.write_excel(excel_path, rows, sheet_name="users")
+        ExcelHandler.read_excel(excel_path, sheet_name="users")
+
+    json_path = temp_dir / "bench.json"
+    entries = {f"key_{i}": {"value": i, "label": f"entry {i}"} for i in range(200)}
+
+    def json_io():
+        JsonHandler.overwrite_json(json_path, entries)
+        JsonHandler.append_json(json_path, {"extra": True})
+        JsonHandler.read_json(json_path)
+
+    return {
+        "pdf_assert": (pdf_checks, pdf_reset),
+        "excel_io": (excel_io, None),
+        "json_io": (json_io, None),
+    }
+
+
+def run_browser_cases(selected: List[str], base_url: str, repeat: int) -> Dict[str, dict]:
+    from playwright.sync_api import Error as PlaywrightError, sync_playwright
+    from main.fixtures.contextPool import ContextPool
+    from main.fixtures.pageManager import PageManager
+    from main.fixtures.screenshotPipeline import ScreenshotPipeline
+
+    settings = load_settings("local", {"baseURL": base_url})
+    results = {}
+    with sync_playwright() as playwright:
+        try:
+            browser = playwright.chromium.launch(headless=True)
+        except PlaywrightError as e:
+            raise BrowserUnavailable(str(e).splitlines()[0]) from e
+        try:
+            pool = ContextPool(browser, settings, isolation="fresh", context_options={"viewport": None})
+
+            def page_fixture():
+                context, page = pool.acquire()
+                page.goto(settings.base_url, timeout=settings.navigation_timeout)
+                page.set_default_timeout(settings.default_timeout)
+                pool.release(context, page)
+
+            if "page_fixture" in selected:
+                results["page_fixture"] = measure(page_fixture, repeat=repeat)
+
+            context, page = pool.acquire()
+            page.goto(settings.base_url, timeout=settings.navigation_timeout)
+            screenshots = ScreenshotPipeline(policy="always")
+            try:
+                if "report_screenshot" in selected:
+                    results["report_screenshot"] = measure(
+                        lambda: screenshots.embed(screenshots.submit(screenshots.capture(page))), repeat=repeat)
+                if "page_manager" in selected:
+                    results["page_manager"] = measure(lambda: PageManager(page, settings), repeat=repeat)
+            finally:
+                screenshots.close()
+                pool.release(context, page)
+            pool.close()
+        finally:
+            browser.close()
+    return results
+
+
+def compare(results: Dict[str, dict], baselines: Dict[str, dict], threshold: float) -> List[str]:
+    """Regressions of results against baselines; cold is only compared when it was measured after resets."""
+    regressions = []
+    for case, result in results.items():
+        baseline = baselines.get(case)
+        if baseline is None:
+            continue
+        for metric, min_delta in MIN_DELTA.items():
+            if metric == "cold_ms" and result.get("cold_samples", 1) < 2:
+                continue
+            if metric not in baseline:
+                continue
+            delta = result[metric] - baseline[metric]
+            if delta > min_delta and result[metric] > baseline[metric] * (1 + threshold):
+                regressions.append(f"{case} {metric}: {result[metric]} vs baseline {baseline[metric]} "
+                                   f"(+{delta / baseline[metric] * 100 if baseline[metric] else float('inf'):.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", nargs="+", choices=CASES, default=list(CASES))
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed relative slow-down before failing (0.25 = 25%%)")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH))
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run's results as the new baselines")
+    parser.add_argument("--no-browser", action="store_true", help="Skip the cases that need a browser")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for case, (run, reset) in file_cases(Path(temp_dir)).items():
+            if case in args.cases:
+                results[case] = measure(run, reset, repeat=args.repeat)
+
+    browser_cases = [case for case in args.cases if case in BROWSER_CASES]
+    if browser_cases and not args.no_browser:
+        server, base_url = standin_site.start(port=0)
+        try:
+            results.update(run_browser_cases(browser_cases, base_url, args.repeat))
+        except BrowserUnavailable as e:
+            # Only a failed launch skips the cases; errors from the measured code fail the run
+            print(f"Skipping browser cases, the browser could not start: {e}")
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    print(f"{'case':<18} {'cold ms':>10} {'warm ms':>10} {'peak KiB':>10}")
+    for case in CASES:
+        if case in results:
+            result = results[case]
+            print(f"{case:<18} {result['cold_ms']:>10.2f} {result['warm_ms']:>10.2f} {result['peak_kib']:>10.1f}")
+
+    RESULTS_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(RESULTS_PATH, 'w') as f:
+        json.dump(results, f, indent=4)
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baselines = {}
+        if baseline_path.exists():
+            with open(baseline_path, 'r') as f:
+                baselines = json.load(f)
+        baselines.update(results)
+        with open(baseline_path, 'w') as f:
+            json.dump(baselines, f, indent=4)
+        print(f"\nBaselines saved to {baseline_path}")
+        return
+
+    # Without a baseline nothing can regress, so a missing one fails the run instead of passing it unchecked
+    baselines = {}
+    if baseline_path.exists():
+        with open(baseline_path, 'r') as f:
+            baselines = json.load(f)
+    missing = [case for case in results if case not in baselines]
+    if missing:
+        print(f"\nNo baselines for {', '.join(missing)} in {baseline_path}; record them on this machine with --save-baseline")
+        sys.exit(2)
+    regressions = compare(results, baselines, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regressions beyond {args.threshold:.0%}:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print(f"\nNo regressions beyond {args.threshold:.0%} of the baselines")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Micro-benchmark for serial vs process-pool PDF text extraction.
+
+Builds documents of increasing page counts by repeating the pages of a source PDF, then times
+PDFAssert.extract_text on a cold cache in both modes and prints where parallel extraction starts to win.
+
+    python -m benchmarks.pdf_extraction_bench
+    python -m benchmarks.pdf_extraction_bench path/to/file.pdf --pages 10 50 200 800 --workers 4
+"""
+import PyPDF2
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+from main.utils.pdf_assert import PDFAssert
+
+DEFAULT_SOURCE = "main/resources/sample_report.pdf"
+
+
+def build_document(source: Path, page_count: int, target: Path) -> Path:
+    reader = PyPDF2.PdfReader(str(source))
+    writer = PyPDF2.PdfWriter()
+    for page_index in range(page_count):
+        writer.add_page(reader.pages[page_index % len(reader.pages)])
+    with open(target, 'wb') as file:
+        writer.write(file)
+    return target
+
+
+def time_extraction(pdf_path: Path, parallel: bool, workers: int, repeat: int) -> tuple:
+    best = float('inf')
+    text = None
+    for _ in range(repeat):
+        PDFAssert.invalidate_cache()
+        start = time.perf_counter()
+        text = PDFAssert.extract_text(pdf_path, parallel=parallel, workers=workers)
+        best = min(best, time.perf_counter() - start)
+    return best, text
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", nargs="?", default=DEFAULT_SOURCE)
+    parser.add_argument("--pages", type=int, nargs="+", default=[5, 10, 25, 50, 100, 200, 400])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    configured_threshold = PDFAssert.parallel_min_pages
+    PDFAssert.parallel_min_pages = 0
+    # Stored text would let every repeat skip extraction altogether
+    PDFAssert.text_store = None
+    speed_ups = []
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # Start the pool once so its start-up cost is not charged to the first measurement
+        warm_up = build_document(Path(args.source), 2, Path(temp_dir) / "warm_up.pdf")
+        PDFAssert.extract_text(warm_up, parallel=True, workers=args.workers)
+
+        print(f"{'pages':>6} {'serial s':>10} {'parallel s':>11} {'speed-up':>9}")
+        for page_count in args.pages:
+            pdf_path = build_document(Path(args.source), page_count, Path(temp_dir) / f"bench_{page_count}.pdf")
+            serial_time, serial_text = time_extraction(pdf_path, False, args.workers, args.repeat)
+            parallel_time, parallel_text = time_extraction(pdf_path, True, args.workers, args.repeat)
+
+            if serial_text != parallel_text:
+                raise AssertionError(f"Parallel extraction differs from serial for {page_count} pages")
+
+            speed_up = serial_time / parallel_time if parallel_time else float('inf')
+            speed_ups.append((page_count, speed_up))
+            print(f"{page_count:>6} {serial_time:>10.3f} {parallel_time:>11.3f} {speed_up:>8.2f}x")
+
+    # The crossover is the smallest size from which parallel extraction stays ahead for every larger size
+    crossover = None
+    for page_count, speed_up in reversed(speed_ups):
+        if speed_up <= 1:
+            break
+        crossover = page_count
+
+    if args.workers < 2:
+        print("\nOnly one worker available, so both modes run serially")
+    elif crossover is None:
+        print(f"\nParallel extraction with {args.workers} workers never beat serial in this range")
+    else:
+        print(f"\nParallel extraction with {args.workers} workers wins from about {crossover} pages "
+              f"(PDFAssert.parallel_min_pages is {configured_threshold})")
+
+
+if __name__ == "__main__":
+    main()
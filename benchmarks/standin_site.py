@@ -0,0 +1,120 @@
+"""
+Local stand-in for the site under test: the dashboard with its contact form, the top menu and the pages
+navigationFunctions goes to, served from memory with no external requests.
+
+Serves on port 8080 by default, the baseURL of the `local` environment, so the suite can run against it too:
+
+    python -m benchmarks.standin_site
+    pytest --env local
+"""
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+
+MENU = """<nav id="top-menu-nav">
+    <ul id="top-menu">
+        <li><a href="/">Home</a></li>
+        <li><a href="/about-us/">About <span>3</span></a></li>
+        <li><a href="/services/">Services</a></li>
+        <li><a href="/contact-us/">Contact Us</a></li>
+    </ul>
+</nav>"""
+
+CONTACT_FORM = """<h2>Let's connect</h2>
+<form method="post" action="/">
+    <fieldset>
+        <label>Name <input type="text" name="name" placeholder="Name"></label>
+        <label>Email Address <input type="email" name="email" placeholder="Email Address"></label>
+        <label>Contact Number <input type="tel" name="contact" placeholder="Contact Number"></label>
+        <label>Company Name <input type="text" name="company" placeholder="Company Name"></label>
+        <label>Job Title <input type="text" name="job_title" placeholder="Job Title"></label>
+        <select name="service" aria-label="service">
+            <option value="">Select a service</option>
+            <option>Cloud</option>
+            <option>Data</option>
+            <option>Quality Assurance</option>
+        </select>
+        <textarea name="message" placeholder="Message"></textarea>
+        <ul><li><label><input type="checkbox" name="privacy">
+            <span>We value your privacy and we'll only use your details to reply. See our
+            <a href="/privacy-notice/">Privacy Notice</a>.</span>
+        </label></li></ul>
+    </fieldset>
+    <div><div class="actions"><button type="submit">GET IN TOUCH</button></div></div>
+</form>"""
+
+PAGES = {
+    "/": f"""<h1>Fast forward to the future</h1>
+<p>Welcome to Home</p>
+<h2>OUR SERVICES</h2>
+<h2>WHY STRATPOINT?</h2>
+{CONTACT_FORM}""",
+    "/about-us/": "<h1>About Us</h1>",
+    "/services/": "<h1>Our Services</h1>",
+    "/contact-us/": f"<h1>Contact Us</h1>\n{CONTACT_FORM}",
+    "/privacy-notice/": "<h1>Privacy Notice</h1>",
+}
+
+
+def render(path: str) -> bytes:
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head><meta charset="utf-8"><title>Stand-in site</title></head>
+<body>
+{MENU}
+<main>
+{PAGES[path]}
+</main>
+</body>
+</html>""".encode("utf-8")
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path not in PAGES:
+            self.send_error(404)
+            return
+        body = render(path)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "max-age=300")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        # The form submission lands back on the dashboard
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.path = "/"
+        self.do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start(port: int = 8080, host: str = "127.0.0.1") -> Tuple[ThreadingHTTPServer, str]:
+    """Serve the stand-in site on a background thread; port 0 picks a free port. Returns the server and its base URL."""
+    server = ThreadingHTTPServer((host, port), StandInHandler)
+    threading.Thread(target=server.serve_forever, name="standin-site", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), StandInHandler)
+    print(f"Serving the stand-in site on http://127.0.0.1:{args.port}/ (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,68 +1,352 @@
+import asyncio
 import pytest
+import pytest_asyncio
+from playwright.async_api import async_playwright
 from playwright.sync_api import sync_playwright
 from main.fixtures.pageManager import PageManager
-import json
+from main.fixtures.asyncPageManager import AsyncPageManager
+from main.fixtures.contextPool import ContextPool
+from main.fixtures.networkFilter import NetworkFilter
+from main.fixtures.harArchive import HAR_DIR, HarArchives
+from main.fixtures.screenshotPipeline import FORMATS_BY_SUFFIX, ScreenshotPipeline
+from main.fixtures.traceRecorder import TraceRecorder
+from main.envi.settings import ConfigError, configure, get_settings, load_run_profile, parse_overrides
+from main.utils.json_journal import JsonJournal
+from main.utils.excel_handler import ExcelStreamWriter
+from main.utils.artifact_registry import ArtifactRegistry, artifacts
+from main.utils.step_timer import StepTimer, format_table, step_timer
+from main.utils.wait_budget import wait_budget
+from main.utils.duration_scheduling import DurationHistory, DurationScheduling, auto_num_workers, save_grouped_modules
+from main.utils.impact_selection import CoverageRecorder, changed_files, is_affected, load_impact_map, needs_full_run
 from datetime import datetime
-import base64
+import glob
+import html
+import json
 import os
 import logging
 
+_results_writer = None
+_screenshots = None
+_step_summary = None
+_durations = None
+_scheduler = None
+_worker_busy = {}
+_impact_recorder = None
+
 def pytest_addoption(parser):
     parser.addoption(
-        "--enable-trace", action="store_true", default=False, help="Enable Playwright tracing"
+        "--enable-trace", action="store_true", default=False, help="Enable Playwright tracing (same as --trace-mode on)"
+    )
+    parser.addoption(
+        "--trace-mode", action="store", default="off", choices=TraceRecorder.MODES,
+        help="Playwright tracing: off, on (save every test) or retain-on-failure (save failed and rerun tests only)"
+    )
+    parser.addoption(
+        "--trace-max-files", action="store", type=int, default=50,
+        help="Keep at most this many traces in reports/trace, deleting the oldest"
+    )
+    parser.addoption(
+        "--trace-max-mb", action="store", type=float, default=1024,
+        help="Keep at most this many MB of traces in reports/trace, deleting the oldest"
+    )
+    parser.addoption(
+        "--results-xlsx", action="store", default=None, help="Stream per-test results into this Excel file"
+    )
+    parser.addoption(
+        "--env", action="store", default=None,
+        help="Environment profile from main/envi/urls.json (default: TEST_ENV or defaultEnvironment)"
+    )
+    parser.addoption(
+        "--config-override", action="append", default=[], metavar="KEY=VALUE",
+        help="Override a setting of the selected environment, e.g. baseURL=http://localhost:8080/"
+    )
+    parser.addoption(
+        "--run-profile", action="store", default="default",
+        help="Execution profile from main/envi/profiles.json, e.g. 'fast' for headless runs with resource blocking"
+    )
+    parser.addoption(
+        "--record-resource-sizes", action="store_true", default=False,
+        help="Record response sizes in reports/resource_sizes.json even when the run profile blocks nothing"
+    )
+    parser.addoption(
+        "--screenshot-policy", action="store", default="always", choices=ScreenshotPipeline.POLICIES,
+        help="When to capture the end-of-test screenshot for the report"
+    )
+    parser.addoption(
+        "--screenshot-format", action="store", default="png", choices=ScreenshotPipeline.FORMATS,
+        help="Screenshot encoding; jpeg and webp (needs Pillow) are much smaller than png"
+    )
+    parser.addoption(
+        "--screenshot-quality", action="store", type=int, default=80, help="jpeg/webp quality, 0-100"
+    )
+    parser.addoption(
+        "--screenshot-scale", action="store", default="device", choices=("device", "css"),
+        help="css captures one pixel per CSS pixel, which downscales screenshots on high-DPI displays"
+    )
+    parser.addoption(
+        "--screenshot-max-kb", action="store", type=int, default=None,
+        help="Screenshots larger than this are kept on disk but not embedded in the HTML report"
+    )
+    parser.addoption(
+        "--report-max-mb", action="store", type=float, default=None,
+        help="Total size of screenshots embedded in the HTML report; later ones are kept on disk only"
+    )
+    parser.addoption(
+        "--artifact-retention-days", action="store", type=float, default=7,
+        help="Delete screenshots under reports/screenshots older than this many days at startup (0 keeps everything)"
+    )
+    parser.addoption(
+        "--step-timing", action="store_true", default=False,
+        help="Time every BaseActions step and page flow and report the slowest ones (reports/step_timing.json)"
+    )
+    parser.addoption(
+        "--adaptive-waits", action="store_true", default=False,
+        help="Time out each step after p99 x factor of its latency in earlier runs instead of the default timeout"
+    )
+    parser.addoption(
+        "--wait-budget-factor", action="store", type=float, default=3.0,
+        help="Multiplier applied to a step's p99 latency to get its timeout budget"
+    )
+    parser.addoption(
+        "--wait-budget-min-ms", action="store", type=int, default=1000,
+        help="Smallest timeout budget given to any step"
+    )
+    parser.addoption(
+        "--no-duration-scheduling", action="store_false", dest="duration_scheduling", default=True,
+        help="Use xdist's default load scheduling instead of longest-first by recorded test durations"
+    )
+    parser.addoption(
+        "--impact-since", action="store", default=None, metavar="REF",
+        help="Run only the tests affected by files changed since this git ref (full suite when config files changed)"
+    )
+    parser.addoption(
+        "--impact-record", action="store_true", default=False,
+        help="Record which main/ modules each test executes, to sharpen --impact-since selection"
+    )
+    parser.addoption(
+        "--har-mode", action="store", default="off", choices=HarArchives.MODES,
+        help="record: capture each test's traffic into a HAR archive; replay: serve tests from their archives"
+    )
+    parser.addoption(
+        "--har-unmatched", action="store", default="fail", choices=HarArchives.UNMATCHED_RULES,
+        help="In replay mode, what happens to requests missing from the archive: fail (abort), fallback or passthrough"
+    )
+    parser.addoption(
+        "--har-dir", action="store", default=str(HAR_DIR), help="Directory holding the HAR archives"
+    )
+    parser.addoption(
+        "--context-isolation", action="store", default="fresh", choices=ContextPool.ISOLATION_LEVELS,
+        help="How browser contexts are isolated between tests: fresh (default), snapshot, reset or shared"
+    )
+    parser.addoption(
+        "--context-pool-size", action="store", type=int, default=1,
+        help="Number of pre-warmed browser contexts kept per worker when contexts are reused"
     )
 
+@pytest.fixture(scope="session")
+def settings():
+    """Settings of the selected environment, loaded once per worker in pytest_configure."""
+    return get_settings()
+
+@pytest.fixture(scope="session")
+def run_profile(request):
+    return load_run_profile(request.config.getoption("--run-profile"))
+
 @pytest.fixture(scope="session")
 def playwright_instance():
     with sync_playwright() as playwright:
         yield playwright
 
+def _launch_options(browser_name, run_profile, config):
+    launch_options = {"headless": run_profile["headless"] and not config.getoption("headed", False)}
+    if browser_name == "chromium" and run_profile.get("chromiumArgs"):
+        launch_options["args"] = run_profile["chromiumArgs"]
+    return launch_options
+
 @pytest.fixture(scope="session")
-def browser(playwright_instance, browser_name):
-    browser = getattr(playwright_instance, browser_name).launch(headless=False)
+def browser(playwright_instance, browser_name, run_profile, request):
+    browser = getattr(playwright_instance, browser_name).launch(**_launch_options(browser_name, run_profile, request.config))
     yield browser
     browser.close()
 
+@pytest.fixture(scope="session")
+def network_filter(settings, run_profile, request):
+    """Blocks resources the run profile does not need and learns response sizes to report the bytes saved."""
+    sizes = JsonJournal(os.path.join(os.path.dirname(__file__), 'reports', 'resource_sizes.json'))
+    network_filter = NetworkFilter(
+        settings.base_url,
+        block_resource_types=run_profile.get("blockResourceTypes", []),
+        allow_domains=run_profile.get("allowDomains", []),
+        deny_domains=run_profile.get("denyDomains", []),
+        known_sizes=sizes.read(),
+        record_sizes=request.config.getoption("--record-resource-sizes"),
+    )
+    yield network_filter
+    if network_filter.observed_sizes:
+        sizes.append(network_filter.observed_sizes)
+
+
+@pytest.fixture(scope="session")
+def trace_recorder(request):
+    trace_mode = request.config.getoption("--trace-mode")
+    if request.config.getoption("--enable-trace") and trace_mode == "off":
+        trace_mode = "on"
+    trace_max_mb = request.config.getoption("--trace-max-mb")
+    return TraceRecorder(
+        os.path.join(os.path.dirname(__file__), 'reports', 'trace'),
+        mode=trace_mode,
+        max_files=request.config.getoption("--trace-max-files"),
+        max_bytes=int(trace_max_mb * 1024 * 1024) if trace_max_mb else None,
+    )
+
+
+@pytest.fixture(scope="session")
+def har_archives(request):
+    return HarArchives(
+        request.config.getoption("--har-dir"),
+        mode=request.config.getoption("--har-mode"),
+        unmatched=request.config.getoption("--har-unmatched"),
+    )
+
+
+@pytest.fixture(scope="session")
+def context_pool(browser, settings, network_filter, request):
+    pool = ContextPool(
+        browser,
+        settings,
+        isolation=request.config.getoption("--context-isolation"),
+        size=request.config.getoption("--context-pool-size"),
+        context_options={"viewport": None},
+        snapshot_dir=os.path.join(os.path.dirname(__file__), 'reports', 'storage_state'),
+        context_setup=[network_filter.install],
+    )
+    pool.warm_up()
+    yield pool
+    pool.close()
+
 
 @pytest.fixture(scope="function")
-def page(browser, request):
-    context = browser.new_context(viewport=None)
-    page = context.new_page()
-
-    # Start tracing if --enable-trace option is enabled
-    trace_enabled = request.config.getoption("--enable-trace")
-    if trace_enabled:
-        test_name = request.node.name
-        trace_dir = os.path.join(os.path.dirname(__file__), 'reports', 'trace')
-        if not os.path.exists(trace_dir):
-            os.makedirs(trace_dir)
-
-        context.tracing.start(
-            screenshots=True,
-            snapshots=True,
-            sources=True
-        )
+def page(context_pool, network_filter, har_archives, trace_recorder, request, settings):
+    context, page = context_pool.acquire()
+    network_filter.reset_stats()
+    if har_archives.mode != "off":
+        try:
+            har_archives.attach(context, request.node.nodeid)
+        except Exception:
+            context_pool.release(context, page, discard=True)
+            raise
+
+    # One tracing session per context, one chunk per test; @pytest.mark.trace(snapshots=False) trims what is captured
+    if trace_recorder.enabled:
+        trace_recorder.start(context, request.node.nodeid,
+                             **TraceRecorder.marker_options(request.node.get_closest_marker("trace")))
 
-    with open("main/envi/urls.json", "r") as f:
-        urls = json.load(f)
-    page.goto(urls["baseURL"], timeout=60000)
-    page.set_default_timeout(60000)
+    page.goto(settings.base_url, timeout=settings.navigation_timeout)
+    page.set_default_timeout(settings.default_timeout)
 
     yield page
 
-    # Stop tracing and save trace file if enabled
-    if trace_enabled:
-        test_name = request.node.name
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        trace_file = os.path.join(trace_dir, f"{test_name}_{timestamp}.zip")
-        context.tracing.stop(path=trace_file)
-        print(f"Trace saved to: {trace_file}")
+    rep_call = getattr(request.node, "rep_call", None)
+    failed = rep_call is None or rep_call.failed
 
-    context.close()
+    if trace_recorder.enabled:
+        # execution_count > 1 marks a pytest-rerunfailures rerun
+        keep = trace_recorder.should_keep(failed, getattr(request.node, "execution_count", 1))
+        trace_file = trace_recorder.stop(context, request.node.name, keep)
+        if trace_file:
+            print(f"Trace saved to: {trace_file}")
+    context_pool.release(context, page, discard=failed)
+
+    # The archive is written when the context closes
+    if har_archives.mode == "record":
+        if failed:
+            har_archives.discard(request.node.nodeid)
+        else:
+            har_archives.recorded(request.node.nodeid, settings)
 
 @pytest.fixture(scope="function")
-def pageManager(page):
-    return PageManager(page)
+def pageManager(page, settings):
+    return PageManager(page, settings)
+
+# Async stack: one browser per worker on the session event loop, a fresh context per page set up like the sync ones.
+# Tests use @pytest.mark.asyncio(loop_scope="session") and can drive several pages with asyncio.gather.
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def async_playwright_instance():
+    async with async_playwright() as playwright:
+        yield playwright
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def async_browser(async_playwright_instance, browser_name, run_profile, request):
+    browser = await getattr(async_playwright_instance, browser_name).launch(**_launch_options(browser_name, run_profile, request.config))
+    yield browser
+    await browser.close()
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def async_page_factory(async_browser, settings, network_filter, har_archives, trace_recorder, request):
+    """
+    Open extra pages, each in its own context, ready on the baseURL: page = await async_page_factory().
+    Contexts get what the page fixture's get: the network filter, HAR record/replay, tracing, and a report
+    screenshot of the first page.
+    """
+    contexts = []
+    trace_options = TraceRecorder.marker_options(request.node.get_closest_marker("trace"))
+    network_filter.reset_stats()
+
+    async def new_page():
+        if har_archives.mode == "record" and contexts:
+            raise RuntimeError("--har-mode record keeps one archive per test, which can only record one async page")
+        context = await async_browser.new_context(viewport=None)
+        contexts.append(context)
+        await network_filter.install_async(context)
+        if har_archives.mode != "off":
+            await har_archives.attach_async(context, request.node.nodeid, reset_misses=len(contexts) == 1)
+        if trace_recorder.enabled:
+            await trace_recorder.start_async(context, request.node.nodeid, **trace_options)
+        page = await context.new_page()
+        page.set_default_timeout(settings.default_timeout)
+        await page.goto(settings.base_url, timeout=settings.navigation_timeout)
+        return page
+
+    yield new_page
+
+    rep_call = getattr(request.node, "rep_call", None)
+    failed = rep_call is None or rep_call.failed
+
+    # The report hook cannot drive an async page, so its screenshot is taken here, before the teardown report embeds it
+    if contexts and contexts[0].pages and _screenshots is not None and _screenshots.wants(failed):
+        test_status = "Failed" if failed else "Skipped" if rep_call.skipped else "Passed"
+        try:
+            image = await _screenshots.capture_async(contexts[0].pages[0])
+            pending = getattr(request.node, "pending_screenshots", [])
+            pending.insert(0, (_screenshots.submit(image, _report_screenshot_path(request.node, test_status)),
+                               _report_screenshot_label(request.node, test_status)))
+            request.node.pending_screenshots = pending
+        except Exception as e:
+            print(f"Failed to capture screenshot: {e}")
+
+    if trace_recorder.enabled:
+        keep = trace_recorder.should_keep(failed, getattr(request.node, "execution_count", 1))
+        for number, context in enumerate(contexts, start=1):
+            name = request.node.name if number == 1 else f"{request.node.name}_page{number}"
+            trace_file = await trace_recorder.stop_async(context, name, keep)
+            if trace_file:
+                print(f"Trace saved to: {trace_file}")
+    await asyncio.gather(*(context.close() for context in contexts))
+
+    # The archive is written when the context closes
+    if har_archives.mode == "record" and contexts:
+        if failed:
+            har_archives.discard(request.node.nodeid)
+        else:
+            har_archives.recorded(request.node.nodeid, settings)
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def async_page(async_page_factory):
+    return await async_page_factory()
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def asyncPageManager(async_page, settings):
+    return AsyncPageManager(async_page, settings)
 
 @pytest.fixture(scope="function")
 def logger():
@@ -79,6 +363,21 @@ def logger():
         logger.setLevel(logging.INFO)
     return logger
 
+def _report_screenshot_path(item, test_status):
+    test_name = '_'.join(item.originalname.split('_')[:2])
+    screenshot_folder = os.path.join(os.path.abspath(os.path.dirname(__file__)), 'reports', 'screenshots', test_name)
+    os.makedirs(screenshot_folder, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+    return os.path.join(screenshot_folder, f"{item.originalname}_{timestamp}_{test_status.lower()}.{_screenshots.extension}")
+
+def _report_screenshot_label(item, test_status):
+    labels = {
+        "Failed": f"🔴 FAILED Test Screenshot - {item.originalname}",
+        "Passed": f"✅ PASSED Test Screenshot - {item.originalname}",
+        "Skipped": f"⚠️ SKIPPED Test Screenshot - {item.originalname}",
+    }
+    return labels.get(test_status, f"Test {test_status} Screenshot")
+
 @pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     pytest_html = item.config.pluginmanager.getplugin('html')
@@ -113,90 +412,44 @@ def pytest_runtest_makereport(item, call):
         elif report.passed:
             test_status = "Passed"
 
-        my_test_name = item.originalname
-        parts = my_test_name.split('_')
-        test_name = '_'.join(parts[:2])
+        network_filter = item.funcargs.get("network_filter")
+        if network_filter is not None and network_filter.blocks_anything:
+            network_summary = network_filter.summary()
+            logging.getLogger(__name__).info(f"{item.nodeid} {network_summary}")
+            if pytest_html:
+                extra.append(pytest_html.extras.text(network_summary, "🌐 Network Savings"))
 
-        project_root = os.path.abspath(os.path.dirname(__file__))
-        screenshot_folder = os.path.join(project_root, 'reports', 'screenshots', test_name)
-
-        if not os.path.exists(screenshot_folder):
-            os.makedirs(screenshot_folder)
+        har_archives = item.funcargs.get("har_archives")
+        if har_archives is not None and har_archives.mode == "replay" and har_archives.misses:
+            har_summary = har_archives.summary()
+            logging.getLogger(__name__).warning(f"{item.nodeid} {har_summary}")
+            if pytest_html:
+                extra.append(pytest_html.extras.text(har_summary, "📼 HAR Replay Misses"))
 
         page_fixture = item.funcargs.get("page")
         pagemanager_fixture = item.funcargs.get("pageManager")
-
-        if page_fixture:
-            current_page = page_fixture
-
-            timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-            screenshot_filename = f"{my_test_name}_{timestamp}_{test_status.lower()}.png"
-            screenshot_path = os.path.join(screenshot_folder, screenshot_filename)
-
-            try:
-                current_page.screenshot(path=screenshot_path, full_page=True)
-
-                with open(screenshot_path, "rb") as image_file:
-                    image_data = base64.b64encode(image_file.read()).decode('utf-8')
-
-                screenshot_label = f"Test {test_status} Screenshot"
-                if report.failed:
-                    screenshot_label = f"🔴 FAILED Test Screenshot - {my_test_name}"
-                elif report.passed:
-                    screenshot_label = f"✅ PASSED Test Screenshot - {my_test_name}"
-                elif report.skipped:
-                    screenshot_label = f"⚠️ SKIPPED Test Screenshot - {my_test_name}"
-
-                if pytest_html:
-                    extra.append(pytest_html.extras.image(image_data, screenshot_label))
-            except Exception as e:
-                print(f"Failed to capture screenshot: {e}")
-
-        elif pagemanager_fixture and hasattr(pagemanager_fixture, 'page'):
+        current_page = page_fixture
+        if not current_page and pagemanager_fixture and hasattr(pagemanager_fixture, 'page'):
             current_page = pagemanager_fixture.page
 
-            timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-            screenshot_filename = f"{my_test_name}_{timestamp}_{test_status.lower()}.png"
-            screenshot_path = os.path.join(screenshot_folder, screenshot_filename)
-
+        if current_page and _screenshots is not None and _screenshots.wants(report.failed):
             try:
-                current_page.screenshot(path=screenshot_path, full_page=True)
-
-                with open(screenshot_path, "rb") as image_file:
-                    image_data = base64.b64encode(image_file.read()).decode('utf-8')
-
-                screenshot_label = f"Test {test_status} Screenshot"
-                if report.failed:
-                    screenshot_label = f"🔴 FAILED Test Screenshot - {my_test_name}"
-                elif report.passed:
-                    screenshot_label = f"✅ PASSED Test Screenshot - {my_test_name}"
-                elif report.skipped:
-                    screenshot_label = f"⚠️ SKIPPED Test Screenshot - {my_test_name}"
-
-                if pytest_html:
-                    extra.append(pytest_html.extras.image(image_data, screenshot_label))
+                image = _screenshots.capture(current_page)
+                # Encoded while the fixtures tear down, embedded with the teardown report
+                item.pending_screenshots = [(_screenshots.submit(image, _report_screenshot_path(item, test_status)),
+                                             _report_screenshot_label(item, test_status))]
             except Exception as e:
                 print(f"Failed to capture screenshot: {e}")
 
-        try:
-            screenshot_prefix = f"{test_name}_"
-            excluded_suffixes = ("_failed.png", "_passed.png", "_skipped.png", "_result.png", "_result.html")
-
-            if os.path.exists(screenshot_folder):
-                for filename in os.listdir(screenshot_folder):
-                    if filename.startswith(screenshot_prefix) and not filename.endswith(excluded_suffixes):
-                        screenshot_path = os.path.join(screenshot_folder, filename)
-
-                        try:
-                            with open(screenshot_path, "rb") as image_file:
-                                image_data = base64.b64encode(image_file.read()).decode('utf-8')
-
-                            if pytest_html:
-                                extra.append(pytest_html.extras.image(image_data, f"📸 Additional Screenshot - {filename}"))
-                        except Exception as e:
-                            print(f"Failed to process additional screenshot {filename}: {e}")
-        except Exception as e:
-            print(f"Failed to process additional screenshots: {e}")
+        # Only what this test registered, e.g. BaseActions.take_screenshot; they share the report screenshots'
+        # policy, format and size budgets. The files are already on disk.
+        for artifact in artifacts.pop(item.nodeid):
+            if artifact.kind == "screenshot" and _screenshots is not None and _screenshots.wants(report.failed):
+                future = _screenshots.submit(artifact.content,
+                                             source_format=FORMATS_BY_SUFFIX.get(artifact.path.suffix.lower(), "png"))
+                pending = getattr(item, "pending_screenshots", [])
+                pending.append((future, f"📸 Additional Screenshot - {artifact.label}"))
+                item.pending_screenshots = pending
 
         if call.when == 'call' and pytest_html:
             log_content = ""
@@ -226,12 +479,227 @@ def pytest_runtest_makereport(item, call):
 
         report.extras = extra
 
+    if report.when == 'teardown':
+        # Artifacts registered during teardown, or by a test that never reached its call phase
+        artifacts.pop(item.nodeid)
+
+    if report.when == 'teardown' and hasattr(item, 'pending_screenshots'):
+        pending = item.pending_screenshots
+        del item.pending_screenshots
+        screenshot_extras = []
+        for future, screenshot_label in pending:
+            screenshot, skipped_reason = _screenshots.embed(future)
+            if not pytest_html:
+                continue
+            if screenshot is not None:
+                screenshot_extras.append(pytest_html.extras.image(screenshot.data, screenshot_label,
+                                                                  mime_type=screenshot.mime_type, extension=screenshot.extension))
+            else:
+                screenshot_extras.append(pytest_html.extras.text(skipped_reason, screenshot_label))
+        report.extras = getattr(report, 'extras', []) + screenshot_extras
+
+def pytest_runtest_logreport(report):
+    # Runs on the controller for every worker's reports, so a single writer sees the whole session
+    worker = getattr(getattr(report, 'node', None), 'gateway', None)
+    if _durations is not None and report.outcome != "rerun":
+        _durations.add(report.nodeid, report.duration)
+        worker_id = worker.id if worker else "main"
+        _worker_busy[worker_id] = _worker_busy.get(worker_id, 0.0) + report.duration
+
+    if _results_writer is None:
+        return
+    if report.when != "call" and report.passed:
+        return
+
+    _results_writer.write_row([
+        report.nodeid,
+        report.when,
+        report.outcome,
+        round(report.duration, 3),
+        worker.id if worker else "main",
+        datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+    ], sheet_name="results")
+
 @pytest.hookimpl(tryfirst=True)
 def pytest_configure(config):
+    global _results_writer, _screenshots, _durations, _impact_recorder
     reports_dir = os.path.join(os.path.dirname(__file__), 'reports')
     if not os.path.exists(reports_dir):
         os.makedirs(reports_dir)
 
-@pytest.hookimpl(trylast=True)
+    try:
+        configure(config.getoption("--env"), parse_overrides(config.getoption("--config-override")))
+        load_run_profile(config.getoption("--run-profile"))
+        if config.getoption("--har-mode") != "off" and config.getoption("--context-isolation") != "fresh":
+            # Reused or snapshot contexts navigate live while warming up and would mix traffic between archives
+            raise ConfigError("--har-mode record/replay needs --context-isolation fresh")
+    except (ConfigError, OSError) as e:
+        raise pytest.UsageError(f"Invalid test configuration: {e}")
+
+    report_max_mb = config.getoption("--report-max-mb")
+    screenshot_max_kb = config.getoption("--screenshot-max-kb")
+    _screenshots = ScreenshotPipeline(
+        policy=config.getoption("--screenshot-policy"),
+        image_format=config.getoption("--screenshot-format"),
+        quality=config.getoption("--screenshot-quality"),
+        scale=config.getoption("--screenshot-scale"),
+        max_test_bytes=screenshot_max_kb * 1024 if screenshot_max_kb else None,
+        max_total_bytes=int(report_max_mb * 1024 * 1024) if report_max_mb else None,
+    )
+
+    if config.getoption("--adaptive-waits"):
+        wait_budget.enable(
+            factor=config.getoption("--wait-budget-factor"),
+            min_ms=config.getoption("--wait-budget-min-ms"),
+            max_ms=get_settings().default_timeout,
+        )
+
+    if config.getoption("--step-timing"):
+        step_timer.enabled = True
+        if not hasattr(config, "workerinput"):
+            # Drop worker files left by an earlier run before the workers start writing theirs
+            for stale_file in glob.glob(os.path.join(reports_dir, 'step_timing', '*.json')):
+                os.remove(stale_file)
+
+    retention_days = config.getoption("--artifact-retention-days")
+    if retention_days and not hasattr(config, "workerinput"):
+        ArtifactRegistry.cleanup(os.path.join(reports_dir, 'screenshots'), retention_days)
+
+    if not hasattr(config, "workerinput"):
+        _durations = DurationHistory()
+
+    if config.getoption("--impact-record"):
+        _impact_recorder = CoverageRecorder()
+
+    results_xlsx = config.getoption("--results-xlsx")
+    if results_xlsx and not hasattr(config, "workerinput"):
+        _results_writer = ExcelStreamWriter(results_xlsx)
+        _results_writer.add_sheet("results", headers=["test", "phase", "outcome", "duration_s", "worker", "finished_at"])
+
+def _uses_shared_fixtures(item):
+    # Fixtures defined in this conftest reach into most of main/, so their users depend on all of it
+    fixture_info = getattr(item, "_fixtureinfo", None)
+    if fixture_info is None:
+        return True
+    return any(fixturedef.func.__code__.co_filename == __file__
+               for fixturedefs in fixture_info.name2fixturedefs.values() for fixturedef in fixturedefs)
+
+def pytest_collection_modifyitems(session, config, items):
+    # A bad trace marker would only fail once the test runs with tracing on
+    for item in items:
+        try:
+            TraceRecorder.marker_options(item.get_closest_marker("trace"))
+        except ValueError as e:
+            raise pytest.UsageError(f"{item.nodeid}: {e}")
+
+    if getattr(config, "workerinput", {}).get("workerid") == "gw0" and config.getoption("duration_scheduling"):
+        # Written before this worker reports its collection, so the scheduler reads it once all have
+        save_grouped_modules(items)
+
+    since = config.getoption("--impact-since")
+    if not since:
+        return
+    try:
+        changed = changed_files(since, config.rootpath)
+    except (OSError, ValueError) as e:
+        raise pytest.UsageError(f"--impact-since {since}: {e}")
+
+    trigger = needs_full_run(changed)
+    if trigger:
+        logging.info(f"Impact selection: {trigger} changed since {since}, running the full suite")
+        return
+
+    impact_map = load_impact_map()
+    selected, deselected = [], []
+    for item in items:
+        affected = is_affected(item.path, item.nodeid, changed, impact_map, _uses_shared_fixtures(item))
+        (selected if affected else deselected).append(item)
+    logging.info(f"Impact selection: {len(selected)} of {len(items)} tests affected by {len(changed)} files changed since {since}")
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    if _impact_recorder is None:
+        yield
+        return
+    _impact_recorder.start(item.nodeid)
+    try:
+        yield
+    finally:
+        _impact_recorder.stop()
+
+def _collect_step_timing(session):
+    global _step_summary
+    reports_dir = os.path.join(os.path.dirname(__file__), 'reports')
+    worker = getattr(session.config, "workerinput", {}).get("workerid", "main")
+    step_timer.save(os.path.join(reports_dir, 'step_timing', f'{worker}.json'))
+
+    if not hasattr(session.config, "workerinput"):
+        # xdist workers have finished and written their files by the time the controller gets here
+        _step_summary = StepTimer.summarize(StepTimer.load_all(os.path.join(reports_dir, 'step_timing')))
+        with open(os.path.join(reports_dir, 'step_timing.json'), 'w') as f:
+            json.dump(_step_summary, f, indent=4)
+
+def _step_summary_lines():
+    lines = []
+    for key, title in (("steps", "Slowest steps"), ("targets", "Slowest locators"), ("tests", "Tests with the most step time")):
+        lines.extend(format_table(title, _step_summary[key]))
+        lines.append("")
+    return lines
+
+def pytest_terminal_summary(terminalreporter):
+    if _scheduler is not None and _scheduler.predicted_makespan is not None and _worker_busy:
+        terminalreporter.write_sep("=", "scheduling")
+        busy = ", ".join(f"{worker} {seconds:.1f}s" for worker, seconds in sorted(_worker_busy.items()))
+        terminalreporter.write_line(f"Predicted makespan {_scheduler.predicted_makespan:.1f}s, "
+                                    f"actual {max(_worker_busy.values()):.1f}s (busy time per worker: {busy})")
+
+    if _step_summary is None:
+        return
+    terminalreporter.write_sep("=", "step timing")
+    for line in _step_summary_lines():
+        terminalreporter.write_line(line)
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    # Only replaces the default --dist load; other --dist modes keep their own scheduler
+    global _scheduler
+    if config.getoption("dist") != "load" or not config.getoption("duration_scheduling"):
+        return None
+    _scheduler = DurationScheduling(config, log, _durations)
+    return _scheduler
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_auto_num_workers(config):
+    return auto_num_workers()
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_html_results_summary(prefix, summary, postfix, session):
+    if _step_summary is not None:
+        tables = html.escape("\n".join(_step_summary_lines()))
+        postfix.append(f"<h2>Step Timing</h2><pre>{tables}</pre>")
+
+@pytest.hookimpl(hookwrapper=True)
 def pytest_sessionfinish(session, exitstatus):
-    pass
+    global _results_writer, _screenshots
+    # Before pytest-html writes the report, so the summary can go into it
+    if step_timer.enabled:
+        _collect_step_timing(session)
+
+    yield
+
+    if _durations is not None:
+        _durations.save()
+    if wait_budget.enabled:
+        wait_budget.save()
+    if _impact_recorder is not None:
+        _impact_recorder.save()
+    if _screenshots is not None:
+        _screenshots.close()
+        _screenshots = None
+    if _results_writer is not None:
+        _results_writer.close()
+        print(f"Results written to: {_results_writer.file_path}")
+        _results_writer = None
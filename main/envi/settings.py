@@ -0,0 +1,194 @@
+import json
+import os
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Optional, Union
+from urllib.parse import urljoin
+import logging
+
+logger = logging.getLogger(__name__)
+
+CONFIG_PATH = Path(__file__).resolve().parent / "urls.json"
+PROFILES_PATH = Path(__file__).resolve().parent / "profiles.json"
+DEFAULT_ENVIRONMENT = "prod"
+
+# Typed settings every environment must resolve to; extra keys are kept but not validated
+FIELDS = {
+    "baseURL": str,
+    "dashboardURL": str,
+    "loginURL": str,
+    "defaultTimeout": int,
+    "navigationTimeout": int,
+}
+URL_FIELDS = ("baseURL", "dashboardURL", "loginURL")
+
+
+class ConfigError(ValueError):
+    pass
+
+
+def env_var_name(key: str) -> str:
+    """Environment variable that overrides a setting, e.g. baseURL -> TEST_BASE_URL."""
+    snake = "".join(f"_{char}" if char.isupper() and index and not key[index - 1].isupper() else char
+                    for index, char in enumerate(key))
+    return f"TEST_{snake.upper()}"
+
+
+class Settings:
+    """
+    Read-only, validated settings for one environment.
+    Typed values are available as attributes (settings.base_url) and every key by name (settings["baseURL"]).
+    """
+
+    def __init__(self, environment: str, values: Dict[str, object]):
+        self.environment = environment
+        self._values = MappingProxyType(dict(values))
+
+    @property
+    def base_url(self) -> str:
+        return self._values["baseURL"]
+
+    @property
+    def dashboard_url(self) -> str:
+        return self._values["dashboardURL"]
+
+    @property
+    def login_url(self) -> str:
+        return self._values["loginURL"]
+
+    @property
+    def default_timeout(self) -> int:
+        return self._values["defaultTimeout"]
+
+    @property
+    def navigation_timeout(self) -> int:
+        return self._values["navigationTimeout"]
+
+    @property
+    def routes(self) -> Dict[str, str]:
+        """Site page name -> path (relative to baseURL) for direct navigation."""
+        return self._values.get("routes", {})
+
+    def route_url(self, name: str) -> str:
+        if name not in self.routes:
+            raise ConfigError(f"Unknown route '{name}', expected one of: {', '.join(sorted(self.routes))}")
+        return urljoin(self.base_url, self.routes[name])
+
+    @property
+    def values(self) -> MappingProxyType:
+        return self._values
+
+    def get(self, key: str, default=None):
+        return self._values.get(key, default)
+
+    def __getitem__(self, key: str):
+        return self._values[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._values
+
+    def __repr__(self):
+        return f"Settings(environment={self.environment!r}, base_url={self.base_url!r})"
+
+
+def _coerce(key: str, value, source: str):
+    expected = FIELDS.get(key)
+    if expected is None or isinstance(value, expected) and not isinstance(value, bool):
+        return value
+    if expected is int and isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            pass
+    raise ConfigError(f"Setting '{key}' from {source} must be {expected.__name__}, got {value!r}")
+
+
+def _validate(environment: str, values: dict) -> None:
+    missing = [key for key in FIELDS if key not in values]
+    if missing:
+        raise ConfigError(f"Environment '{environment}' is missing settings: {', '.join(missing)}")
+    for key in URL_FIELDS:
+        if not str(values[key]).startswith(("http://", "https://")):
+            raise ConfigError(f"Setting '{key}' of environment '{environment}' is not an http(s) URL: {values[key]!r}")
+    for key in ("defaultTimeout", "navigationTimeout"):
+        if values[key] <= 0:
+            raise ConfigError(f"Setting '{key}' of environment '{environment}' must be positive, got {values[key]}")
+    routes = values.get("routes", {})
+    if not isinstance(routes, dict) or not all(isinstance(path, str) for path in routes.values()):
+        raise ConfigError(f"Setting 'routes' of environment '{environment}' must map page names to paths, got {routes!r}")
+
+
+def load_settings(environment: Optional[str] = None, overrides: Optional[Dict[str, object]] = None,
+                  config_path: Union[str, Path] = CONFIG_PATH) -> Settings:
+    """
+    Resolve the settings of one environment profile.
+
+    The environment comes from the argument, else TEST_ENV, else the file's defaultEnvironment. Values are
+    layered as: top-level defaults < environment profile < TEST_* environment variables < overrides.
+    """
+    with open(config_path, "r") as f:
+        config = json.load(f)
+
+    profiles = config.get("environments", {})
+    environment = environment or os.environ.get("TEST_ENV") or config.get("defaultEnvironment", DEFAULT_ENVIRONMENT)
+    if profiles and environment not in profiles:
+        raise ConfigError(f"Unknown environment '{environment}', expected one of: {', '.join(sorted(profiles))}")
+
+    values = {key: value for key, value in config.items() if key not in ("environments", "defaultEnvironment")}
+    values.update(profiles.get(environment, {}))
+
+    for key in FIELDS:
+        env_value = os.environ.get(env_var_name(key))
+        if env_value is not None:
+            values[key] = _coerce(key, env_value, env_var_name(key))
+    for key, value in (overrides or {}).items():
+        values[key] = _coerce(key, value, "overrides")
+
+    for key, value in values.items():
+        values[key] = _coerce(key, value, config_path)
+    _validate(environment, values)
+
+    logger.info(f"Loaded '{environment}' settings: baseURL={values['baseURL']}")
+    return Settings(environment, values)
+
+
+_settings: Optional[Settings] = None
+
+
+def configure(environment: Optional[str] = None, overrides: Optional[Dict[str, object]] = None) -> Settings:
+    """Load and install the settings shared by the current process; called once per worker at startup."""
+    global _settings
+    _settings = load_settings(environment, overrides)
+    return _settings
+
+
+def get_settings() -> Settings:
+    """Return the shared settings, loading the default environment on first use outside of pytest."""
+    if _settings is None:
+        return configure()
+    return _settings
+
+
+def load_run_profile(name: str, profiles_path: Union[str, Path] = PROFILES_PATH) -> dict:
+    """Return an execution profile (launch options and network rules) from profiles.json, on top of the default one."""
+    with open(profiles_path, "r") as f:
+        profiles = json.load(f)
+    if name not in profiles:
+        raise ConfigError(f"Unknown run profile '{name}', expected one of: {', '.join(sorted(profiles))}")
+
+    profile = dict(profiles.get("default", {}))
+    profile.update(profiles[name])
+    for key in ("chromiumArgs", "blockResourceTypes", "allowDomains", "denyDomains"):
+        if not isinstance(profile.get(key, []), list):
+            raise ConfigError(f"Run profile '{name}' setting '{key}' must be a list")
+    return profile
+
+
+def parse_overrides(pairs) -> Dict[str, str]:
+    overrides = {}
+    for pair in pairs or ():
+        key, separator, value = pair.partition("=")
+        if not separator or not key:
+            raise ConfigError(f"Config override must look like KEY=VALUE, got {pair!r}")
+        overrides[key.strip()] = value
+    return overrides
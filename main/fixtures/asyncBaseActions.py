@@ -0,0 +1,133 @@
+import asyncio
+import time
+from pathlib import Path
+from datetime import datetime
+from urllib.parse import urljoin
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from main.envi.settings import get_settings
+from main.fixtures.baseActions import BATCH_FILL_SCRIPT, batch_fields, fill_result, single_fields
+from main.utils.artifact_registry import artifacts
+from main.utils.step_timer import timed_step
+from main.utils.wait_budget import wait_budget
+
+
+class AsyncBaseActions:
+    """
+    BaseActions for the async Playwright API. Every action is a coroutine, so independent actions on
+    different pages or contexts can run concurrently with asyncio.gather.
+    """
+
+    def __init__(self, page, settings=None, waits=None):
+        self.page = page
+        self.settings = settings or get_settings()
+        self.waits = waits or wait_budget
+
+    async def _within_budget(self, action, target, operation):
+        """See BaseActions._within_budget; operation(timeout) returns an awaitable."""
+        key = self.waits.key(action, target)
+        budget = self.waits.budget(key)
+        started = time.perf_counter()
+        try:
+            result = await operation(budget)
+        except PlaywrightTimeoutError as e:
+            if budget is None:
+                raise
+            raise self.waits.exceeded(key, budget, e) from e
+        self.waits.observe(key, started)
+        return result
+
+    @timed_step
+    async def navigate_to(self, url):
+        # Relative paths resolve against the selected environment's baseURL; returns the main resource's response
+        url = urljoin(self.settings.base_url, url)
+        return await self._within_budget("navigate_to", url,
+                                         lambda budget: self.page.goto(url, timeout=budget or self.settings.navigation_timeout))
+
+    @timed_step
+    async def click_element(self, element):
+        await self._within_budget("click_element", element, lambda budget: element.click(timeout=budget))
+
+    @timed_step
+    async def fill_textfield(self, element, text):
+        await self._within_budget("fill_textfield", element, lambda budget: element.fill(text, timeout=budget))
+
+    @timed_step
+    async def select_option(self, element, text):
+        await self._within_budget("select_option", element, lambda budget: element.select_option(text, timeout=budget))
+
+    @timed_step(target_arg=None)
+    async def fill_fields(self, fields, fallbacks=None, typed=()):
+        """See BaseActions.fill_fields. Single fields stay sequential: fills on one page compete for focus."""
+        batch = batch_fields(fields, typed)
+        round_trips = 0
+        unresolved = set()
+        if batch:
+            unresolved = set(await self.page.evaluate(BATCH_FILL_SCRIPT, batch))
+            round_trips += 1
+
+        for locator, value, is_typed in single_fields(self.page, fields, fallbacks, typed, unresolved):
+            round_trips += await self._fill_one(locator, value, typed=is_typed)
+        return fill_result(fields, batch, unresolved, round_trips)
+
+    async def _fill_one(self, locator, value, typed=False):
+        """See BaseActions._fill_one."""
+        if isinstance(value, bool):
+            await locator.set_checked(value)
+            return 1
+        if typed:
+            await locator.fill("")
+            await locator.press_sequentially(value)
+            return 2
+        if await locator.evaluate("el => el.tagName") == "SELECT":
+            await locator.select_option(value)
+        else:
+            await locator.fill(value)
+        return 2
+
+    @timed_step
+    async def get_text(self, element):
+        return await element.text_content()
+
+    @timed_step
+    async def assert_element(self, element):
+        """Wait until the element is visible, failing once its budget (or the default timeout) runs out."""
+        await self._within_budget("assert_element", element, lambda budget: element.wait_for(state="visible", timeout=budget))
+        return True
+
+    async def new_tab(self):
+        return await self.page.context.new_page()
+
+    async def get_attribute_value(self, element, attribute):
+        return await element.get_attribute(attribute)
+
+    @timed_step
+    async def open_href_in_new_tab(self, element):
+        href = await element.get_attribute("href")
+        if href:
+            new_page = await self.new_tab()
+            await new_page.goto(href)
+            return new_page
+        return None
+
+    async def open_hrefs_in_new_tabs(self, *elements):
+        """Open the links of several elements in their own tabs at the same time; returns the pages (None for elements without href)."""
+        return await asyncio.gather(*(self.open_href_in_new_tab(element) for element in elements))
+
+    async def focus_specific_tab(self, indexOfTab):
+        pages = self.page.context.pages
+        if len(pages) > 1:
+            selected_page_tab = pages[indexOfTab]
+            await selected_page_tab.bring_to_front()
+            return selected_page_tab
+        else:
+            print("Tab not found!")
+            return None
+
+    @timed_step(target_arg=None)
+    async def take_screenshot(self, addedString="screenshot", full_page=True):
+        screenshots_dir = Path("reports/screenshots")
+        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+        filename = f"{addedString}_{timestamp}_result.png"
+
+        image = await self.page.screenshot(full_page=full_page)
+        return artifacts.store(image, screenshots_dir / filename, kind="screenshot", label=addedString)
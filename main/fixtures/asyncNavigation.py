@@ -0,0 +1,35 @@
+from main.fixtures.asyncBaseActions import AsyncBaseActions
+from main.fixtures.navigation import PREFETCH_SCRIPT, check_response, check_route, landmark, menu_link
+from main.envi.settings import get_settings
+from main.utils.step_timer import timed_step
+
+class asyncNavigationFunctions:
+    def __init__(self, page, logger, settings=None):
+        self.page = page
+        self.logger = logger
+        self.settings = settings or get_settings()
+        self.actions = AsyncBaseActions(page, self.settings)
+
+
+    @timed_step
+    async def navigate_to_other_page(self, sitepage, via="route", screenshot=False, prefetch=()):
+        """See navigationFunctions.navigate_to_other_page."""
+        self.logger.info(f"Navigating to {sitepage} page via {via}")
+        if via == "route":
+            check_route(self.settings, sitepage, self.logger)
+            response = await self.actions.navigate_to(self.settings.route_url(sitepage))
+            check_response(sitepage, response, self.logger)
+        elif via == "menu":
+            await self.actions.click_element(menu_link(self.page, sitepage, self.logger))
+        else:
+            raise ValueError(f"Unknown navigation mode: {via}, expected 'route' or 'menu'")
+        await self.actions.assert_element(landmark(self.page, sitepage, self.logger))
+
+        if prefetch:
+            await self.prefetch_pages(*prefetch)
+        if screenshot:
+            await self.actions.take_screenshot(f"navigated_to_{sitepage.lower()}")
+
+    async def prefetch_pages(self, *sitepages):
+        urls = [self.settings.route_url(sitepage) for sitepage in sitepages]
+        await self.page.evaluate(PREFETCH_SCRIPT, urls)
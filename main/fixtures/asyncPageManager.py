@@ -0,0 +1,16 @@
+import logging
+from main.functions.asyncDashboard import asyncDashboardFunctions
+from main.fixtures.asyncNavigation import asyncNavigationFunctions
+from main.envi.settings import get_settings
+
+
+class AsyncPageManager:
+    """PageManager for the async stack; one manager drives one page, several managers can run concurrently."""
+
+    def __init__(self, page, settings=None):
+        self.page = page
+        self.settings = settings or get_settings()
+        self.logger = logging.getLogger(__name__)
+
+        self.dashboard = asyncDashboardFunctions(page, self.logger, self.settings)
+        self.navigation = asyncNavigationFunctions(page, self.logger, self.settings)
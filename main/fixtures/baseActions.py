@@ -1,29 +1,177 @@
 from pathlib import Path
 import inspect
+import time
 from datetime import datetime
+from urllib.parse import urljoin
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from main.envi.settings import get_settings
+from main.utils.artifact_registry import artifacts
+from main.utils.step_timer import timed_step
+from main.utils.wait_budget import wait_budget
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Fills [selector, value] pairs in one round trip. A field is left to the caller (returned) unless its selector
+# matches exactly one visible, enabled input, textarea or select. Values are set through the native setter so
+# framework-controlled inputs notice, followed by the input and change events a real fill would fire.
+BATCH_FILL_SCRIPT = """(fields) => {
+    const unresolved = [];
+    const fire = (el, type) => el.dispatchEvent(new Event(type, { bubbles: true }));
+    for (const [selector, value] of fields) {
+        const matches = document.querySelectorAll(selector);
+        const el = matches[0];
+        if (matches.length !== 1 || !["INPUT", "TEXTAREA", "SELECT"].includes(el.tagName)
+                || el.disabled || el.readOnly || !el.getClientRects().length) {
+            unresolved.push(selector);
+            continue;
+        }
+        const checkable = el.type === "checkbox" || el.type === "radio";
+        if (checkable !== (typeof value === "boolean")) {
+            unresolved.push(selector);
+            continue;
+        }
+        el.focus();
+        if (checkable) {
+            if (el.checked !== value) el.click();
+        } else if (el.tagName === "SELECT") {
+            const option = Array.from(el.options).find(o => o.value === value || o.label === value || o.textContent.trim() === value);
+            if (!option) {
+                unresolved.push(selector);
+                continue;
+            }
+            el.value = option.value;
+            fire(el, "input");
+            fire(el, "change");
+        } else {
+            const proto = el.tagName === "TEXTAREA" ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+            Object.getOwnPropertyDescriptor(proto, "value").set.call(el, value);
+            fire(el, "input");
+            fire(el, "change");
+        }
+        el.blur();
+    }
+    return unresolved;
+}"""
+
+
+def batch_fields(fields, typed=()):
+    """[selector, value] pairs of the fields that BATCH_FILL_SCRIPT may fill: CSS targets that need no key presses."""
+    return [[target, value] for target, value in fields.items() if isinstance(target, str) and target not in typed]
+
+
+def single_fields(page, fields, fallbacks, typed, unresolved):
+    """(locator, value, typed) of the fields left to fill one by one: Locators, typed targets and unresolved selectors."""
+    fallbacks = fallbacks or {}
+    for target, value in fields.items():
+        if isinstance(target, str) and target not in typed and target not in unresolved:
+            continue
+        locator = fallbacks.get(target) or (page.locator(target) if isinstance(target, str) else target)
+        yield locator, value, target in typed
+
+
+def fill_result(fields, batch, unresolved, round_trips):
+    # Compared to filling field by field, one call each; when few fields batch, the evaluate can cost more than it saves
+    extra = round_trips - len(fields)
+    result = {
+        "fields": len(fields),
+        "batched": len(batch) - len(unresolved),
+        "round_trips": round_trips,
+        "round_trips_saved": max(0, -extra),
+    }
+    outcome = f"{result['round_trips_saved']} saved" if extra <= 0 else f"{extra} more than field by field"
+    logger.info(f"Filled {result['fields']} fields in {round_trips} round trips ({outcome})")
+    return result
 
 
 class BaseActions:
-    def __init__(self, page):
+    def __init__(self, page, settings=None, waits=None):
         self.page = page
-
+        self.settings = settings or get_settings()
+        self.waits = waits or wait_budget
+
+    def _within_budget(self, action, target, operation):
+        """Run operation(timeout) with the step's learned budget (None: default timeout) and record its latency."""
+        key = self.waits.key(action, target)
+        budget = self.waits.budget(key)
+        started = time.perf_counter()
+        try:
+            result = operation(budget)
+        except PlaywrightTimeoutError as e:
+            if budget is None:
+                raise
+            raise self.waits.exceeded(key, budget, e) from e
+        self.waits.observe(key, started)
+        return result
+
+    @timed_step
     def navigate_to(self, url):
-        self.page.goto(url)
+        # Relative paths resolve against the selected environment's baseURL; returns the main resource's response
+        url = urljoin(self.settings.base_url, url)
+        return self._within_budget("navigate_to", url,
+                                   lambda budget: self.page.goto(url, timeout=budget or self.settings.navigation_timeout))
 
+    @timed_step
     def click_element(self, element):
-        element.click()
+        self._within_budget("click_element", element, lambda budget: element.click(timeout=budget))
 
+    @timed_step
     def fill_textfield(self, element, text):
-        element.fill(text)
+        self._within_budget("fill_textfield", element, lambda budget: element.fill(text, timeout=budget))
 
+    @timed_step
     def select_option(self, element, text):
-        element.select_option(text)
+        self._within_budget("select_option", element, lambda budget: element.select_option(text, timeout=budget))
+
+    @timed_step(target_arg=None)
+    def fill_fields(self, fields, fallbacks=None, typed=()):
+        """
+        Fill several form fields with as few browser round trips as possible.
+
+        fields:    {target: value}; a target is a CSS selector or a Locator. Text goes into inputs and textareas,
+                   a select gets the option with that value or label, True/False checks or unchecks.
+        fallbacks: {selector: Locator} used when a selector does not resolve to a single fillable element.
+        typed:     targets that need real key presses (masks, autocompletes); they are typed one by one.
+
+        CSS targets are filled together in a single page.evaluate; Locators, typed and unresolved fields
+        are filled one by one with Playwright's actionability checks. Returns the round trips made and saved
+        compared to one call per field.
+        """
+        batch = batch_fields(fields, typed)
+        round_trips = 0
+        unresolved = set()
+        if batch:
+            unresolved = set(self.page.evaluate(BATCH_FILL_SCRIPT, batch))
+            round_trips += 1
+
+        for locator, value, is_typed in single_fields(self.page, fields, fallbacks, typed, unresolved):
+            round_trips += self._fill_one(locator, value, typed=is_typed)
+        return fill_result(fields, batch, unresolved, round_trips)
+
+    def _fill_one(self, locator, value, typed=False):
+        """Fill one field through its locator; returns the number of browser calls made."""
+        if isinstance(value, bool):
+            locator.set_checked(value)
+            return 1
+        if typed:
+            locator.fill("")
+            locator.press_sequentially(value)
+            return 2
+        if locator.evaluate("el => el.tagName") == "SELECT":
+            locator.select_option(value)
+        else:
+            locator.fill(value)
+        return 2
 
+    @timed_step
     def get_text(self, element):
         return element.text_content()
 
+    @timed_step
     def assert_element(self, element):
-        return element.is_visible()
+        """Wait until the element is visible, failing once its budget (or the default timeout) runs out."""
+        self._within_budget("assert_element", element, lambda budget: element.wait_for(state="visible", timeout=budget))
+        return True
 
     def new_tab(self):
         context = self.page.context
@@ -34,6 +182,7 @@ class BaseActions:
         href_value = element.get_attribute(attribute)
         return href_value
 
+    @timed_step
     def open_href_in_new_tab(self, element):
         href = element.get_attribute("href")
         if href:
@@ -52,14 +201,15 @@ class BaseActions:
             print("Tab not found!")
             return None
 
+    @timed_step
     def take_screenshot(self, addedString="screenshot", full_page=True):
         screenshots_dir = Path("reports/screenshots")
-        screenshots_dir.mkdir(parents=True, exist_ok=True)
         timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
         filename = f"{addedString}_{timestamp}_result.png"
 
-        screenshot_path = screenshots_dir / filename
-        self.page.screenshot(path=str(screenshot_path), full_page=full_page)
+        # Registered against the running test so the report attaches it; identical captures share one file
+        image = self.page.screenshot(full_page=full_page)
+        return artifacts.store(image, screenshots_dir / filename, kind="screenshot", label=addedString)
 
 
 
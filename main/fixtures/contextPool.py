@@ -0,0 +1,148 @@
+import os
+from pathlib import Path
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Clears the storage of the origin the page is on (local, session, IndexedDB and Cache Storage);
+# pages on about:blank have no storage to clear
+CLEAR_STORAGE_SCRIPT = """async () => {
+    try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}
+    try {
+        const databases = indexedDB.databases ? await indexedDB.databases() : [];
+        await Promise.all(databases.map(db => new Promise(resolve => {
+            const request = indexedDB.deleteDatabase(db.name);
+            request.onsuccess = request.onerror = request.onblocked = resolve;
+        })));
+    } catch (e) {}
+    try {
+        if (window.caches) await Promise.all((await caches.keys()).map(key => caches.delete(key)));
+    } catch (e) {}
+}"""
+
+
+class ContextPool:
+    """
+    Per-worker pool of pre-warmed browser contexts for the page fixture.
+
+    Isolation levels, from strictest to fastest:
+        fresh:    a brand-new context per test, closed afterwards (no state or HTTP cache is shared)
+        snapshot: a brand-new context per test, created from the storage_state saved after the first
+                  warm-up navigation (e.g. cookie consent already given)
+        reset:    contexts are reused; between tests the storage of the page's origin, cookies, permissions
+                  and routes are cleared, every tab is replaced by a new blank one (dropping session storage,
+                  page routes and history), then the snapshot cookies are restored. A context that still
+                  holds storage of another origin is discarded. The HTTP cache stays warm
+        shared:   contexts are reused as-is, tests must tolerate state left by earlier tests
+    A context used by a failed test is always discarded instead of being returned to the pool.
+    """
+
+    ISOLATION_LEVELS = ("fresh", "snapshot", "reset", "shared")
+
+    def __init__(self, browser, settings, isolation="fresh", size=1, context_options=None, snapshot_dir="reports/storage_state",
+                 context_setup=()):
+        if isolation not in self.ISOLATION_LEVELS:
+            raise ValueError(f"Unknown context isolation '{isolation}', expected one of {self.ISOLATION_LEVELS}")
+        self.browser = browser
+        self.settings = settings
+        self.isolation = isolation
+        self.size = max(1, size)
+        self.context_options = dict(context_options or {})
+        # Called with every new context, and again after a reset since resetting clears routes
+        self.context_setup = list(context_setup)
+        worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+        self.snapshot_path = Path(snapshot_dir) / f"{worker}.json"
+        self._snapshot = None
+        self._idle = []
+        self.created = 0
+        self.reused = 0
+
+    @property
+    def reuses_contexts(self):
+        return self.isolation in ("reset", "shared")
+
+    def _new_context(self):
+        options = dict(self.context_options)
+        if self.isolation in ("snapshot", "reset") and self._snapshot is None:
+            self._take_snapshot()
+        if self.isolation == "snapshot":
+            options["storage_state"] = str(self.snapshot_path)
+
+        context = self.browser.new_context(**options)
+        self.created += 1
+        for setup in self.context_setup:
+            setup(context)
+        page = context.new_page()
+        if self.reuses_contexts:
+            # Warm the HTTP cache once; later tests on this context load from it
+            page.goto(self.settings.base_url, timeout=self.settings.navigation_timeout)
+        return context, page
+
+    def _take_snapshot(self):
+        context = self.browser.new_context(**self.context_options)
+        try:
+            page = context.new_page()
+            page.goto(self.settings.base_url, timeout=self.settings.navigation_timeout)
+            self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            self._snapshot = context.storage_state(path=str(self.snapshot_path))
+            logger.info(f"Saved warm-up storage state to {self.snapshot_path}")
+        finally:
+            context.close()
+
+    def warm_up(self):
+        """Create contexts up front so the first tests do not pay for them."""
+        if self.reuses_contexts:
+            while len(self._idle) < self.size:
+                self._idle.append(self._new_context())
+
+    def acquire(self):
+        if self.reuses_contexts and self._idle:
+            self.reused += 1
+            return self._idle.pop()
+        return self._new_context()
+
+    def release(self, context, page, discard=False):
+        if not self.reuses_contexts or discard or len(self._idle) >= self.size:
+            context.close()
+            return
+
+        try:
+            if self.isolation == "reset":
+                page = self._reset(context, page)
+        except Exception as e:
+            logger.warning(f"Could not reset browser context, discarding it: {e}")
+            context.close()
+            return
+        self._idle.append((context, page))
+
+    def _reset(self, context, page):
+        """Clear the context's state and return the blank page that replaces `page`; raises when the state cannot all be cleared."""
+        for other_page in context.pages:
+            if other_page is not page:
+                other_page.close()
+        page.evaluate(CLEAR_STORAGE_SCRIPT)
+        if hasattr(context, "unroute_all"):
+            context.unroute_all()
+            for setup in self.context_setup:
+                setup(context)
+        context.clear_cookies()
+        context.clear_permissions()
+
+        # Only the current origin's storage can be cleared from the page; anything left belongs to other origins
+        leftovers = [origin["origin"] for origin in context.storage_state(indexed_db=True).get("origins", [])
+                     if origin.get("localStorage") or origin.get("indexedDB")]
+        if leftovers:
+            raise RuntimeError(f"storage of {', '.join(leftovers)} cannot be cleared")
+
+        # A new tab starts on about:blank without session storage, page routes or history
+        page.close()
+        page = context.new_page()
+        if self._snapshot and self._snapshot.get("cookies"):
+            context.add_cookies(self._snapshot["cookies"])
+        return page
+
+    def close(self):
+        for context, _ in self._idle:
+            context.close()
+        self._idle.clear()
+        logger.info(f"Context pool closed: {self.created} contexts created, {self.reused} reuses")
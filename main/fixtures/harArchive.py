@@ -0,0 +1,181 @@
+import argparse
+import hashlib
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+import logging
+from main.utils.json_journal import JsonJournal
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+HAR_DIR = PROJECT_ROOT / "main" / "resources" / "har"
+RECORD_OPTIONS = {"update": True, "update_content": "attach", "update_mode": "minimal"}
+
+
+class HarArchives:
+    """
+    Per-test HAR archives for offline runs.
+
+    record: the test's context records every request into <har_dir>/<test>.zip; the archive is written when the
+            context closes and listed in index.json with its nodeid, environment and recording time.
+    replay: the test's context is served from its archive through route_from_har. Requests missing from the
+            archive are handled by the unmatched rule:
+                fail:        aborted and listed in the report
+                fallback:    passed to the other route handlers (e.g. the network filter), then the network
+                passthrough: sent straight to the network, bypassing other route handlers
+    """
+
+    MODES = ("off", "record", "replay")
+    UNMATCHED_RULES = ("fail", "fallback", "passthrough")
+
+    def __init__(self, har_dir=HAR_DIR, mode="off", unmatched="fail"):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown HAR mode '{mode}', expected one of {self.MODES}")
+        if unmatched not in self.UNMATCHED_RULES:
+            raise ValueError(f"Unknown unmatched request rule '{unmatched}', expected one of {self.UNMATCHED_RULES}")
+        self.har_dir = Path(har_dir)
+        self.mode = mode
+        self.unmatched = unmatched
+        self.index = JsonJournal(self.har_dir / "index.json", compact_bytes=64 * 1024)
+        self.misses = []
+
+    @staticmethod
+    def archive_name(nodeid):
+        readable = re.sub(r"[^A-Za-z0-9_.-]+", "_", nodeid.split("::", 1)[-1])[:80]
+        return f"{readable}_{hashlib.sha1(nodeid.encode()).hexdigest()[:8]}.zip"
+
+    def archive_path(self, nodeid):
+        return self.har_dir / self.archive_name(nodeid)
+
+    def _unmatched_action(self, route):
+        """The route method that handles a request missing from the archive."""
+        self.misses.append(f"{route.request.method} {route.request.url}")
+        if self.unmatched == "fail":
+            return lambda: route.abort("blockedbyclient")
+        if self.unmatched == "fallback":
+            return route.fallback
+        return route.continue_
+
+    def _on_unmatched(self, route):
+        self._unmatched_action(route)()
+
+    async def _on_unmatched_async(self, route):
+        await self._unmatched_action(route)()
+
+    def _archive_to_attach(self, nodeid):
+        """The test's archive path, or None when the context runs against the network."""
+        path = self.archive_path(nodeid)
+        if self.mode == "record":
+            path.parent.mkdir(parents=True, exist_ok=True)
+            return path
+        if self.mode == "replay":
+            if path.exists():
+                return path
+            if self.unmatched == "fail":
+                raise FileNotFoundError(f"No HAR archive for {nodeid} at {path}, record it with --har-mode record")
+            logger.warning(f"No HAR archive for {nodeid}, running against the network")
+        return None
+
+    def attach(self, context, nodeid):
+        """Record or replay the traffic of one test on a context that has not navigated yet."""
+        self.misses = []
+        path = self._archive_to_attach(nodeid)
+        if path is None:
+            return
+        if self.mode == "record":
+            context.route_from_har(path, **RECORD_OPTIONS)
+        else:
+            # Registered first so it only sees what the archive could not serve
+            context.route("**/*", self._on_unmatched)
+            context.route_from_har(path, not_found="fallback")
+
+    async def attach_async(self, context, nodeid, reset_misses=True):
+        """
+        attach() for a context of the async API. A test can replay its archive on several contexts; keep
+        reset_misses for the first one only so the report lists the misses of all of them.
+        """
+        if reset_misses:
+            self.misses = []
+        path = self._archive_to_attach(nodeid)
+        if path is None:
+            return
+        if self.mode == "record":
+            await context.route_from_har(path, **RECORD_OPTIONS)
+        else:
+            await context.route("**/*", self._on_unmatched_async)
+            await context.route_from_har(path, not_found="fallback")
+
+    def recorded(self, nodeid, settings):
+        """Index an archive after its context closed; call only for tests that passed."""
+        self.index.append({self.archive_name(nodeid): {
+            "nodeid": nodeid,
+            "environment": settings.environment,
+            "baseURL": settings.base_url,
+            "recordedAt": time.time(),
+        }})
+
+    def discard(self, nodeid):
+        """Drop an archive recorded by a failed test, so it is not replayed later."""
+        self.archive_path(nodeid).unlink(missing_ok=True)
+
+    def summary(self):
+        rule = {"fail": "aborted", "fallback": "fell back", "passthrough": "passed through"}[self.unmatched]
+        lines = [f"HAR replay: {len(self.misses)} requests not in the archive ({rule})"]
+        lines.extend(self.misses[:50])
+        if len(self.misses) > 50:
+            lines.append(f"... and {len(self.misses) - 50} more")
+        return "\n".join(lines)
+
+    def stale(self, max_age_days=None, base_url=None):
+        """Return {archive name: reason} for indexed archives that are missing, too old or recorded against another site."""
+        stale = {}
+        if not self.har_dir.is_dir():
+            return stale
+        now = time.time()
+        for name, entry in self.index.read().items():
+            if not (self.har_dir / name).exists():
+                stale[name] = "missing"
+            elif max_age_days is not None and now - entry["recordedAt"] > max_age_days * 86400:
+                stale[name] = f"older than {max_age_days} days"
+            elif base_url is not None and entry["baseURL"] != base_url:
+                stale[name] = f"recorded against {entry['baseURL']}"
+        return stale
+
+
+def main(argv=None):
+    """List stale HAR archives and optionally re-record them: python -m main.fixtures.harArchive --max-age-days 30 --refresh"""
+    parser = argparse.ArgumentParser(description="Find and re-record stale HAR archives")
+    parser.add_argument("--har-dir", default=str(HAR_DIR))
+    parser.add_argument("--max-age-days", type=float, default=None, help="Archives recorded longer ago are stale")
+    parser.add_argument("--env", default=None, help="Archives recorded against another baseURL than this environment's are stale")
+    parser.add_argument("--refresh", action="store_true", help="Re-record the stale archives with pytest --har-mode record")
+    args = parser.parse_args(argv)
+
+    base_url = None
+    if args.env:
+        from main.envi.settings import load_settings
+        base_url = load_settings(args.env).base_url
+
+    archives = HarArchives(args.har_dir)
+    stale = archives.stale(args.max_age_days, base_url)
+    index = archives.index.read() if stale else {}
+    for name, reason in sorted(stale.items()):
+        print(f"{index[name]['nodeid']}: {reason}")
+    if not stale:
+        print("All HAR archives are up to date")
+        return 0
+    if not args.refresh:
+        return 0
+
+    nodeids = sorted({index[name]["nodeid"] for name in stale})
+    command = [sys.executable, "-m", "pytest", "--har-mode", "record", "--har-dir", args.har_dir, *nodeids]
+    if args.env:
+        command += ["--env", args.env]
+    return subprocess.call(command, cwd=PROJECT_ROOT)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,28 +1,93 @@
 from main.fixtures.baseActions import BaseActions
+from main.envi.settings import get_settings
+from main.utils.step_timer import timed_step
+
+# Adds <link rel="prefetch"> hints so the browser fetches likely next pages while the test works on this one
+PREFETCH_SCRIPT = """(urls) => {
+    for (const url of urls) {
+        if (document.head.querySelector(`link[rel="prefetch"][href="${url}"]`)) continue;
+        const link = document.createElement("link");
+        link.rel = "prefetch";
+        link.href = url;
+        document.head.appendChild(link);
+    }
+}"""
+
+def menu_link(page, sitepage, logger):
+    """Top-menu link of a site page; builds the locator only, so it works on sync and async pages alike."""
+    match(sitepage):
+        case "Home":
+            return page.locator("a:has-text('Home')")
+        case "About":
+            return page.get_by_role("link", name="About 3")
+        case "Services":
+            return page.locator("a:has-text('Services')")
+        case "Contact":
+            return page.locator("nav#top-menu-nav").locator("//ul[@id='top-menu']/li").get_by_role("link", name="Contact Us")
+    logger.error(f"Unknown page: {sitepage}")
+    raise ValueError(f"Unknown page: {sitepage}")
+
+def landmark(page, sitepage, logger):
+    """Element that shows a site page has loaded."""
+    match(sitepage):
+        case "Home":
+            return page.locator("text=Welcome to Home")
+        case "About":
+            return page.locator("text=About Us")
+        case "Services":
+            return page.locator("text=Our Services")
+        case "Contact":
+            # The menu's "Contact Us" link is on every page, the heading only on the Contact page
+            return page.get_by_role("heading", name="Contact Us")
+    logger.error(f"Unknown page: {sitepage}")
+    raise ValueError(f"Unknown page: {sitepage}")
+
+def check_route(settings, sitepage, logger):
+    if sitepage not in settings.routes:
+        logger.error(f"Unknown page: {sitepage}")
+        raise ValueError(f"Unknown page: {sitepage}")
+
+def check_response(sitepage, response, logger):
+    # A wrong route can land on an error page that still shows the site's menu
+    if response is not None and not response.ok:
+        logger.error(f"{sitepage} route {response.url} answered HTTP {response.status}")
+        raise AssertionError(f"{sitepage} route {response.url} answered HTTP {response.status}")
 
 class navigationFunctions:
-    def __init__(self, page, logger):
+    def __init__(self, page, logger, settings=None):
         self.page = page
         self.logger = logger
-        self.actions = BaseActions(page)
-
-
-    def navigate_to_other_page(self, sitepage):
-        self.logger.info(f"Navigating to {sitepage} page")
-        match(sitepage):
-            case "Home":
-                self.actions.click_element(self.page.locator("a:has-text('Home')"))
-                self.actions.assert_element(self.page.locator("text=Welcome to Home"))  
-            case "About":
-                self.actions.click_element(self.page.get_by_role("link", name="About 3"))
-                self.actions.assert_element(self.page.locator("text=About Us"))
-            case "Services":
-                self.actions.click_element(self.page.locator("a:has-text('Services')"))
-                self.actions.assert_element(self.page.locator("text=Our Services"))
-            case "Contact":
-                self.actions.click_element(self.page.locator("nav#top-menu-nav").locator("//ul[@id='top-menu']/li").get_by_role("link", name="Contact Us"))
-                self.actions.assert_element(self.page.locator("nav#top-menu-nav").locator("//ul[@id='top-menu']/li").get_by_role("link", name="Contact Us"))
-            case _:
-                self.logger.error(f"Unknown page: {sitepage}")
-                raise ValueError(f"Unknown page: {sitepage}")
-        self.actions.take_screenshot(f"navigated_to_{sitepage.lower()}")
\ No newline at end of file
+        self.settings = settings or get_settings()
+        self.actions = BaseActions(page, self.settings)
+
+
+    @timed_step
+    def navigate_to_other_page(self, sitepage, via="route", screenshot=False, prefetch=()):
+        """
+        Go to a site page and wait for it to load.
+
+        via:        "route" opens the page's URL from the environment's route table directly; "menu" clicks
+                    through the top menu, for tests about the navigation itself
+        screenshot: take a screenshot once the page has loaded
+        prefetch:   pages the test goes to next, fetched by the browser in the background
+        """
+        self.logger.info(f"Navigating to {sitepage} page via {via}")
+        if via == "route":
+            check_route(self.settings, sitepage, self.logger)
+            response = self.actions.navigate_to(self.settings.route_url(sitepage))
+            check_response(sitepage, response, self.logger)
+        elif via == "menu":
+            self.actions.click_element(menu_link(self.page, sitepage, self.logger))
+        else:
+            raise ValueError(f"Unknown navigation mode: {via}, expected 'route' or 'menu'")
+        self.actions.assert_element(landmark(self.page, sitepage, self.logger))
+
+        if prefetch:
+            self.prefetch_pages(*prefetch)
+        if screenshot:
+            self.actions.take_screenshot(f"navigated_to_{sitepage.lower()}")
+
+    def prefetch_pages(self, *sitepages):
+        """Hint the browser to fetch the given pages' routes now, so navigating to them later is served from cache."""
+        urls = [self.settings.route_url(sitepage) for sitepage in sitepages]
+        self.page.evaluate(PREFETCH_SCRIPT, urls)
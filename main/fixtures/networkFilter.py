@@ -0,0 +1,131 @@
+from collections import Counter
+from urllib.parse import urlparse
+from weakref import WeakSet
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _matches_domain(host, domains):
+    return any(host == domain or host.endswith("." + domain) for domain in domains)
+
+
+def size_key(url):
+    """URL without query string or fragment, so cache-busting parameters do not create new entries."""
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
+
+
+class NetworkFilter:
+    """
+    Aborts requests a functional test does not need, through a context-level route.
+
+    A request is blocked when its host is on the deny list, when an allow list is set and the host is
+    neither on it nor the site under test, or when its resource type (image, font, media, ...) is blocked.
+    Everything else falls through to other route handlers (e.g. HAR replay) or the network.
+
+    Counts are kept per test (see reset_stats/summary). Response sizes are only observed when the filter
+    blocks something or record_sizes is set (e.g. a run without blocking that collects sizes for later).
+    They are remembered per URL without its query string in known_sizes, so blocked requests whose size
+    was observed before count towards the bytes saved.
+    """
+
+    def __init__(self, first_party_url, block_resource_types=(), allow_domains=(), deny_domains=(), known_sizes=None,
+                 record_sizes=False):
+        self.first_party_host = urlparse(first_party_url).hostname or ""
+        self.block_resource_types = set(block_resource_types)
+        self.allow_domains = list(allow_domains)
+        self.deny_domains = list(deny_domains)
+        self.known_sizes = dict(known_sizes or {})
+        self.record_sizes = record_sizes
+        self.observed_sizes = {}
+        self._observed_contexts = WeakSet()
+        self.reset_stats()
+
+    @property
+    def blocks_anything(self):
+        return bool(self.block_resource_types or self.allow_domains or self.deny_domains)
+
+    def reset_stats(self):
+        self.blocked = Counter()
+        self.bytes_saved = 0
+        self.unknown_saved = 0
+        self.requests_loaded = 0
+        self.bytes_loaded = 0
+
+    def block_reason(self, url, resource_type):
+        host = urlparse(url).hostname or ""
+        if _matches_domain(host, self.deny_domains):
+            return "denied-domain"
+        if self.allow_domains and not (host == self.first_party_host or _matches_domain(host, self.allow_domains)):
+            return "third-party"
+        if resource_type in self.block_resource_types:
+            return resource_type
+        return None
+
+    def _should_block(self, request):
+        """Whether to abort the request, counted towards the savings if so."""
+        reason = self.block_reason(request.url, request.resource_type)
+        if reason is None:
+            return False
+
+        self.blocked[reason] += 1
+        size = self.known_sizes.get(size_key(request.url))
+        if size is None:
+            self.unknown_saved += 1
+        else:
+            self.bytes_saved += size
+        return True
+
+    def _handle_route(self, route):
+        if self._should_block(route.request):
+            route.abort("blockedbyclient")
+        else:
+            route.fallback()
+
+    async def _handle_route_async(self, route):
+        if self._should_block(route.request):
+            await route.abort("blockedbyclient")
+        else:
+            await route.fallback()
+
+    def _on_response(self, response):
+        length = response.headers.get("content-length")
+        if length and length.isdigit():
+            size = int(length)
+            self.requests_loaded += 1
+            self.bytes_loaded += size
+            self.observed_sizes[size_key(response.url)] = size
+            self.known_sizes[size_key(response.url)] = size
+
+    def observe(self, context):
+        """Record response sizes on a context without blocking anything."""
+        if context not in self._observed_contexts:
+            context.on("response", self._on_response)
+            self._observed_contexts.add(context)
+
+    def install(self, context):
+        """Route the context through the filter. Safe to call again after its routes were cleared."""
+        if self.blocks_anything or self.record_sizes:
+            self.observe(context)
+        if self.blocks_anything:
+            context.route("**/*", self._handle_route)
+
+    async def install_async(self, context):
+        """install() for a context of the async API."""
+        if self.blocks_anything or self.record_sizes:
+            self.observe(context)
+        if self.blocks_anything:
+            await context.route("**/*", self._handle_route_async)
+
+    def summary(self):
+        blocked_total = sum(self.blocked.values())
+        by_reason = ", ".join(f"{reason}: {count}" for reason, count in self.blocked.most_common())
+        text = f"Network: {blocked_total} requests blocked"
+        if by_reason:
+            text += f" ({by_reason})"
+        text += f", {self.bytes_saved / 1024:.1f} KB saved"
+        if self.unknown_saved:
+            text += f" (+{self.unknown_saved} requests of unknown size)"
+        text += f"; {self.requests_loaded} responses / {self.bytes_loaded / 1024:.1f} KB loaded"
+        return text
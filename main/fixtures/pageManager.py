@@ -1,11 +1,13 @@
 import logging
 from main.functions.dashboard import dashboardFunctions
 from main.fixtures.navigation import navigationFunctions
+from main.envi.settings import get_settings
 
 
 class PageManager:
-    def __init__(self, page):
+    def __init__(self, page, settings=None):
         self.page = page
+        self.settings = settings or get_settings()
         self.logger = logging.getLogger(__name__)
         if not self.logger.handlers:
             handler = logging.StreamHandler()
@@ -17,5 +19,5 @@ class PageManager:
             self.logger.addHandler(handler)
             self.logger.setLevel(logging.INFO)
 
-        self.dashboard = dashboardFunctions(page, self.logger)
-        self.navigation = navigationFunctions(page, self.logger)
\ No newline at end of file
+        self.dashboard = dashboardFunctions(page, self.logger, self.settings)
+        self.navigation = navigationFunctions(page, self.logger, self.settings)
\ No newline at end of file
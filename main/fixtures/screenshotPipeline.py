@@ -0,0 +1,140 @@
+import base64
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import logging
+
+try:
+    from PIL import Image
+except ImportError:  # WebP output and converting screenshots between formats need Pillow
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+EXTENSIONS = {"png": "png", "jpeg": "jpg", "webp": "webp"}
+FORMATS_BY_SUFFIX = {".png": "png", ".jpg": "jpeg", ".jpeg": "jpeg", ".webp": "webp"}
+
+
+class EncodedScreenshot:
+    def __init__(self, data, image_format, size):
+        self.data = data
+        self.image_format = image_format
+        self.size = size
+
+    @property
+    def mime_type(self):
+        return f"image/{self.image_format}"
+
+    @property
+    def extension(self):
+        return EXTENSIONS[self.image_format]
+
+
+class ScreenshotPipeline:
+    """
+    Report screenshots taken straight into memory and finished off the test's thread.
+
+    capture() grabs the page as PNG or JPEG bytes (Playwright encodes JPEG and applies the css scale itself).
+    submit() converts to WebP when requested, base64-encodes and writes the file to disk on a background
+    thread, so the work overlaps with fixture teardown. embed() collects the result for the HTML report,
+    leaving it out when it would exceed the per-test budget or this worker's share of the total budget;
+    the file on disk is always kept.
+    """
+
+    POLICIES = ("never", "on-failure", "always")
+    FORMATS = tuple(EXTENSIONS)
+
+    def __init__(self, policy="always", image_format="png", quality=80, scale="device", full_page=True,
+                 max_test_bytes=None, max_total_bytes=None, workers=2):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown screenshot policy '{policy}', expected one of {self.POLICIES}")
+        if image_format not in self.FORMATS:
+            raise ValueError(f"Unknown screenshot format '{image_format}', expected one of {self.FORMATS}")
+        if image_format == "webp" and Image is None:
+            logger.warning("WebP screenshots need Pillow, falling back to JPEG")
+            image_format = "jpeg"
+        self.policy = policy
+        self.image_format = image_format
+        self.quality = quality
+        self.scale = scale
+        self.full_page = full_page
+        self.max_test_bytes = max_test_bytes
+        if max_total_bytes is not None:
+            # Each xdist worker builds its part of the report, so each gets an equal share
+            max_total_bytes //= int(os.environ.get("PYTEST_XDIST_WORKER_COUNT", "1"))
+        self.max_total_bytes = max_total_bytes
+        self.embedded_bytes = 0
+        self.skipped = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="screenshots")
+
+    @property
+    def extension(self):
+        return EXTENSIONS[self.image_format]
+
+    def wants(self, failed):
+        return self.policy == "always" or (self.policy == "on-failure" and failed)
+
+    def _capture_options(self):
+        options = {"full_page": self.full_page, "scale": self.scale}
+        if self.image_format == "jpeg":
+            options.update(type="jpeg", quality=self.quality)
+        else:
+            # WebP is converted from a lossless capture
+            options["type"] = "png"
+        return options
+
+    def capture(self, page):
+        return page.screenshot(**self._capture_options())
+
+    async def capture_async(self, page):
+        """capture() for a page of the async API."""
+        return await page.screenshot(**self._capture_options())
+
+    def _encode(self, image, save_path, source_format):
+        image_format = source_format
+        if source_format != self.image_format and Image is not None:
+            # WebP from a lossless capture, or an image taken elsewhere (e.g. BaseActions.take_screenshot) in another format
+            with Image.open(io.BytesIO(image)) as source:
+                if self.image_format == "jpeg":
+                    source = source.convert("RGB")
+                output = io.BytesIO()
+                source.save(output, format=self.image_format.upper(), quality=self.quality)
+            image = output.getvalue()
+            image_format = self.image_format
+        if save_path is not None:
+            save_path = Path(save_path)
+            save_path.parent.mkdir(parents=True, exist_ok=True)
+            save_path.write_bytes(image)
+        return EncodedScreenshot(base64.b64encode(image).decode('utf-8'), image_format, len(image))
+
+    def submit(self, image, save_path=None, source_format=None):
+        """
+        Encode and persist in the background; returns a future for embed().
+        source_format is the format of image, by default the one capture() produces.
+        """
+        if source_format is None:
+            source_format = "jpeg" if self.image_format == "jpeg" else "png"
+        return self._executor.submit(self._encode, image, save_path, source_format)
+
+    def embed(self, future):
+        """Wait for an encoded screenshot; returns (screenshot or None, reason it was left out of the report)."""
+        try:
+            screenshot = future.result()
+        except Exception as e:
+            return None, f"Failed to encode screenshot: {e}"
+
+        if self.max_test_bytes is not None and screenshot.size > self.max_test_bytes:
+            self.skipped += 1
+            return None, f"Screenshot not embedded: {screenshot.size / 1024:.0f} KB is over the {self.max_test_bytes / 1024:.0f} KB per-test budget"
+        if self.max_total_bytes is not None and self.embedded_bytes + screenshot.size > self.max_total_bytes:
+            self.skipped += 1
+            return None, f"Screenshot not embedded: report budget of {self.max_total_bytes / 1024 / 1024:.1f} MB reached"
+        self.embedded_bytes += screenshot.size
+        return screenshot, None
+
+    def close(self):
+        """Wait for pending files to be written."""
+        self._executor.shutdown(wait=True)
+        if self.skipped:
+            logger.info(f"{self.skipped} screenshots were kept out of the report by the size budgets")
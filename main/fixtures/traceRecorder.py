@@ -0,0 +1,126 @@
+from datetime import datetime
+from pathlib import Path
+from weakref import WeakKeyDictionary
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TraceRecorder:
+    """
+    Playwright tracing with one tracing session per browser context and one chunk per test.
+
+    Modes:
+        off:               no tracing
+        on:                every test's chunk is saved
+        retain-on-failure: chunks are saved only for failed tests and reruns, others are dropped
+                           without being written
+    Screenshots and snapshots are fixed when a tracing session starts; a test asking for different ones
+    (see the trace marker) restarts the session on its context. After each save the oldest traces are
+    deleted until trace_dir holds at most max_files traces and max_bytes bytes.
+    """
+
+    MODES = ("off", "on", "retain-on-failure")
+    # Keyword arguments of the trace marker, passed on to start()
+    MARKER_OPTIONS = ("screenshots", "snapshots")
+
+    def __init__(self, trace_dir, mode="off", max_files=None, max_bytes=None, sources=True):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown trace mode '{mode}', expected one of {self.MODES}")
+        self.trace_dir = Path(trace_dir)
+        self.mode = mode
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.sources = sources
+        self._sessions = WeakKeyDictionary()
+
+    @property
+    def enabled(self):
+        return self.mode != "off"
+
+    @classmethod
+    def marker_options(cls, marker):
+        """start() options of a trace marker ({} without one); raises ValueError for arguments start() does not take."""
+        if marker is None:
+            return {}
+        unknown = sorted(set(marker.kwargs) - set(cls.MARKER_OPTIONS))
+        if marker.args or unknown:
+            given = [repr(arg) for arg in marker.args] + unknown
+            raise ValueError(f"@pytest.mark.trace does not take {', '.join(given)}; "
+                             f"use keyword arguments from {cls.MARKER_OPTIONS}")
+        return dict(marker.kwargs)
+
+    def start(self, context, title, screenshots=True, snapshots=True):
+        options = (screenshots, snapshots)
+        current = self._sessions.get(context)
+        if current != options:
+            if current is not None:
+                context.tracing.stop()
+            context.tracing.start(screenshots=screenshots, snapshots=snapshots, sources=self.sources)
+            self._sessions[context] = options
+        context.tracing.start_chunk(title=title)
+
+    async def start_async(self, context, title, screenshots=True, snapshots=True):
+        """start() for a context of the async API."""
+        options = (screenshots, snapshots)
+        current = self._sessions.get(context)
+        if current != options:
+            if current is not None:
+                await context.tracing.stop()
+            await context.tracing.start(screenshots=screenshots, snapshots=snapshots, sources=self.sources)
+            self._sessions[context] = options
+        await context.tracing.start_chunk(title=title)
+
+    def should_keep(self, failed, execution_count=1):
+        return self.mode == "on" or failed or execution_count > 1
+
+    def stop(self, context, name, keep):
+        """End the test's chunk; returns the saved trace path, or None when the chunk was dropped."""
+        if not keep:
+            context.tracing.stop_chunk()
+            return None
+
+        trace_file = self._trace_file(name)
+        context.tracing.stop_chunk(path=str(trace_file))
+        self._enforce_limits(keep_path=trace_file)
+        return trace_file
+
+    async def stop_async(self, context, name, keep):
+        """stop() for a context of the async API."""
+        if not keep:
+            await context.tracing.stop_chunk()
+            return None
+
+        trace_file = self._trace_file(name)
+        await context.tracing.stop_chunk(path=str(trace_file))
+        self._enforce_limits(keep_path=trace_file)
+        return trace_file
+
+    def _trace_file(self, name):
+        self.trace_dir.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return self.trace_dir / f"{name}_{timestamp}.zip"
+
+    def _enforce_limits(self, keep_path=None):
+        if self.max_files is None and self.max_bytes is None:
+            return
+        traces = []
+        for path in self.trace_dir.glob("*.zip"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:  # removed by another worker
+                continue
+            traces.append((stat.st_mtime, stat.st_size, path))
+        traces.sort()
+
+        count = len(traces)
+        total = sum(size for _, size, _ in traces)
+        for _, size, path in traces:
+            if (self.max_files is None or count <= self.max_files) and (self.max_bytes is None or total <= self.max_bytes):
+                break
+            if path == keep_path:
+                continue
+            path.unlink(missing_ok=True)
+            count -= 1
+            total -= size
+            logger.info(f"Deleted old trace {path.name} to stay within the trace limits")
@@ -0,0 +1,41 @@
+import asyncio
+from main.pages.dashboard_page import dashboardPage
+from main.fixtures.asyncBaseActions import AsyncBaseActions
+from main.functions.dashboard import form_fields
+from main.utils.step_timer import timed_step
+
+
+class asyncDashboardFunctions:
+    def __init__(self, page, logger, settings=None):
+        self.page = page
+        self.logger = logger
+        self.__dashboardLocators = dashboardPage(page)
+        self.actions = AsyncBaseActions(page, settings)
+
+    @timed_step
+    async def verify_dashboard(self):
+        self.logger.info("Verifying dashboard")
+        return await self.actions.assert_element(self.__dashboardLocators.home_banner_heading)
+
+    @timed_step(target_arg=None)
+    async def fill_form(self, name, email, contactnum, company, jobtitle, service, textareamsg):
+        self.logger.info("Start filling up form")
+        values, fallbacks = form_fields(self.__dashboardLocators, name, email, contactnum, company, jobtitle, service, textareamsg)
+        await self.actions.fill_fields(values, fallbacks=fallbacks)
+        await self.actions.take_screenshot(addedString="formfille")
+
+    @timed_step
+    async def click_button_get_in_touch(self):
+        await self.actions.click_element(self.__dashboardLocators.get_in_touch_button)
+
+    @timed_step
+    async def privacy_policy_link(self):
+        """Open the privacy notice in a new tab while the dashboard is verified; returns the new tab."""
+        self.logger.info("Opening privacy notice while verifying the dashboard")
+        privacy_page, _ = await asyncio.gather(
+            self.actions.open_href_in_new_tab(self.__dashboardLocators.privacy_policy_link),
+            self.verify_dashboard(),
+        )
+        self.logger.info("Set focus on main tab")
+        await self.actions.focus_specific_tab(0)
+        return privacy_page
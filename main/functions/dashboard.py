@@ -1,21 +1,44 @@
 from main.pages.dashboard_page import dashboardPage
 from main.fixtures.baseActions import BaseActions
+from main.utils.step_timer import timed_step
+
+
+def form_fields(locators, name, email, contactnum, company, jobtitle, service, textareamsg):
+    """The contact form as BaseActions.fill_fields arguments: ({target: value}, {selector: fallback Locator})."""
+    fields = {
+        locators.name_selector: (name, locators.name_textfield),
+        locators.email_address_selector: (email, locators.email_address_textfield),
+        locators.contact_num_selector: (contactnum, locators.contact_num_textfield),
+        locators.company_selector: (company, locators.company_textfield),
+        locators.job_title_selector: (jobtitle, locators.job_title_textfield),
+        locators.service_selector: (service, locators.service_select),
+        locators.message_selector: (textareamsg, locators.message_textfield),
+    }
+    values = {selector: value for selector, (value, _) in fields.items()}
+    values[locators.privacy_checkbox] = True
+    return values, {selector: locator for selector, (_, locator) in fields.items()}
 
 
 class dashboardFunctions:
-    def __init__(self, page, logger):
+    def __init__(self, page, logger, settings=None):
         self.page = page
         self.logger = logger
         self.__dashboardLocators = dashboardPage(page)
-        self.actions = BaseActions(page)
+        self.actions = BaseActions(page, settings)
 
+    @timed_step
     def verify_dashboard(self):
         self.logger.info("Verifying dashboard")
         self.actions.assert_element(self.__dashboardLocators.home_banner_heading)
 
-    def fill_form(self, name, email, contactnum, company, jobtitle, service, textareamsg):
+    @timed_step(target_arg=None)
+    def fill_form(self, name, email, contactnum, company, jobtitle, service, textareamsg, batched=False):
         self.logger.info("Start filling up form")
         # self.page.pause()
+        if batched:
+            self.__fill_form_batched(name, email, contactnum, company, jobtitle, service, textareamsg)
+            self.actions.take_screenshot(addedString="formfille")
+            return
         self.actions.fill_textfield(self.__dashboardLocators.name_textfield, name)
         self.actions.fill_textfield(self.__dashboardLocators.email_address_textfield, email)
         self.actions.fill_textfield(self.__dashboardLocators.contact_num_textfield, contactnum)
@@ -26,9 +49,16 @@ class dashboardFunctions:
         self.actions.click_element(self.__dashboardLocators.privacy_checkbox)
         self.actions.take_screenshot(addedString="formfille")
 
+    @timed_step
+    def __fill_form_batched(self, name, email, contactnum, company, jobtitle, service, textareamsg):
+        values, fallbacks = form_fields(self.__dashboardLocators, name, email, contactnum, company, jobtitle, service, textareamsg)
+        self.actions.fill_fields(values, fallbacks=fallbacks)
+
+    @timed_step
     def click_button_get_in_touch(self):
         self.actions.click_element(self.__dashboardLocators.get_in_touch_button)
 
+    @timed_step
     def privacy_policy_link(self):
         # self.page.pause()
         self.logger.info("Getting url")
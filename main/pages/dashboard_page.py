@@ -16,6 +16,14 @@ class dashboardPage:
         #get in touch but thug lif edition
         # self.get_in_touch_button = page.get_by_text("We value your privacy and we'").get_by_role("link", name="Privacy Notice").locator("//parent::span").locator("//parent::label").locator("//parent::li").locator("//parent::ul").locator("//parent::div").locator("//parent::div").locator("//parent::fieldset/following-sibling::div").locator("//div[@class='actions']")
         self.get_in_touch_button = page.get_by_role("button", name="GET IN TOUCH")
+        # CSS selectors for the batched form fill; a selector that does not resolve falls back to the locator above
+        self.name_selector = "input[placeholder='Name']"
+        self.email_address_selector = "input[placeholder='Email Address']"
+        self.contact_num_selector = "input[placeholder='Contact Number']"
+        self.company_selector = "input[placeholder='Company Name']"
+        self.job_title_selector = "input[placeholder='Job Title']"
+        self.service_selector = "select[name='service']"
+        self.message_selector = "[placeholder='Message']"
 
 
 
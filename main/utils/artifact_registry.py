@@ -0,0 +1,109 @@
+import base64
+import hashlib
+import mimetypes
+import os
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def current_nodeid() -> Optional[str]:
+    """Node id of the test pytest is running in this process, from PYTEST_CURRENT_TEST ("<nodeid> (<phase>)")."""
+    current = os.environ.get("PYTEST_CURRENT_TEST")
+    return current.rsplit(" ", 1)[0] if current else None
+
+
+class Artifact:
+    def __init__(self, path: Path, kind: str, label: str, sha256: str, content: bytes):
+        self.path = path
+        self.kind = kind
+        self.label = label
+        self.sha256 = sha256
+        self.content = content
+
+    @property
+    def mime_type(self) -> str:
+        return mimetypes.guess_type(self.path.name)[0] or "application/octet-stream"
+
+    def base64(self) -> str:
+        return base64.b64encode(self.content).decode('utf-8')
+
+
+class ArtifactRegistry:
+    """
+    Files produced while a test runs (screenshots, downloads, ...), recorded against the test's node id so
+    the report hook attaches exactly what the test produced.
+
+    Content is identified by SHA-256: storing bytes that were already written in this process reuses the
+    existing file, and an artifact registered twice for the same test is attached once.
+    """
+
+    def __init__(self):
+        self._by_test: Dict[str, List[Artifact]] = defaultdict(list)
+        self._paths_by_hash: Dict[str, Path] = {}
+
+    def store(self, content: bytes, file_path: Union[str, Path], kind: str = "file", label: Optional[str] = None,
+              nodeid: Optional[str] = None) -> Path:
+        """Write content to file_path, unless identical content was already written, and register it. Returns the path holding the content."""
+        sha256 = hashlib.sha256(content).hexdigest()
+        existing = self._paths_by_hash.get(sha256)
+        if existing is not None and existing.exists():
+            file_path = existing
+        else:
+            file_path = Path(file_path)
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            file_path.write_bytes(content)
+            self._paths_by_hash[sha256] = file_path
+        self._add(Artifact(file_path, kind, label or file_path.name, sha256, content), nodeid)
+        return file_path
+
+    def register(self, file_path: Union[str, Path], kind: str = "file", label: Optional[str] = None,
+                 nodeid: Optional[str] = None) -> Path:
+        """Register a file some other code already wrote."""
+        file_path = Path(file_path)
+        content = file_path.read_bytes()
+        sha256 = hashlib.sha256(content).hexdigest()
+        self._paths_by_hash.setdefault(sha256, file_path)
+        self._add(Artifact(file_path, kind, label or file_path.name, sha256, content), nodeid)
+        return file_path
+
+    def _add(self, artifact: Artifact, nodeid: Optional[str]) -> None:
+        nodeid = nodeid or current_nodeid()
+        if nodeid is None:
+            logger.debug(f"No test is running, {artifact.path} is not attached to a report")
+            return
+        artifacts = self._by_test[nodeid]
+        if all(existing.sha256 != artifact.sha256 for existing in artifacts):
+            artifacts.append(artifact)
+
+    def pop(self, nodeid: str) -> List[Artifact]:
+        """Return and forget the artifacts of a test."""
+        return self._by_test.pop(nodeid, [])
+
+    @staticmethod
+    def cleanup(directory: Union[str, Path], max_age_days: float) -> int:
+        """Delete files under directory older than max_age_days, and the folders left empty. Returns the number of files deleted."""
+        directory = Path(directory)
+        if not directory.is_dir():
+            return 0
+        cutoff = time.time() - max_age_days * 86400
+        deleted = 0
+        for path in sorted(directory.rglob("*"), key=lambda p: len(p.parts), reverse=True):
+            try:
+                if path.is_file() and path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    deleted += 1
+                elif path.is_dir() and not any(path.iterdir()):
+                    path.rmdir()
+            except OSError as e:
+                logger.warning(f"Could not clean up {path}: {str(e)}")
+        if deleted:
+            logger.info(f"Deleted {deleted} artifacts older than {max_age_days} days from {directory}")
+        return deleted
+
+
+artifacts = ArtifactRegistry()
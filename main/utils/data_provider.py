@@ -0,0 +1,162 @@
+import hashlib
+import os
+import pickle
+import pytest
+import tempfile
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence, Union
+import logging
+from main.utils.excel_handler import ExcelHandler
+from main.utils.json_handler import JsonHandler
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+CACHE_DIR = PROJECT_ROOT / ".data_provider_cache"
+CACHE_VERSION = 1
+
+
+def _resolve(source: Union[str, Path]) -> Path:
+    source = Path(source)
+    return source if source.is_absolute() else PROJECT_ROOT / source
+
+
+def _file_hash(file_path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _parse(file_path: Path, sheet_name: Optional[str], header_row: int, key: Optional[str]) -> dict:
+    """Parse a sheet or JSON file into the compact {'columns': [...], 'rows': [tuple, ...]} form that gets cached."""
+    if file_path.suffix.lower() == ".json":
+        data = JsonHandler.read_json(file_path)
+        if key is not None:
+            data = data[key]
+        if not isinstance(data, list):
+            raise ValueError(f"Expected a list of cases in {file_path}" + (f" under '{key}'" if key else ""))
+
+        if data and isinstance(data[0], dict):
+            columns = list(data[0].keys())
+            rows = [tuple(case.get(column) for column in columns) for case in data]
+        else:
+            columns = None
+            rows = [tuple(case) for case in data]
+        return {'columns': columns, 'rows': rows}
+
+    rows = ExcelHandler.iter_rows(file_path, sheet_name, header_row=header_row, skip_blank_rows=True)
+    first = next(rows, None)
+    if first is None:
+        return {'columns': [], 'rows': []}
+    columns = list(first.keys())
+    return {'columns': columns, 'rows': [tuple(first.values())] + [tuple(row.values()) for row in rows]}
+
+
+def load_cases(source: Union[str, Path], sheet_name: Optional[str] = None, header_row: int = 1,
+               key: Optional[str] = None, cache_dir: Union[str, Path] = CACHE_DIR) -> dict:
+    """
+    Return the parsed cases of a spreadsheet or JSON file, using a pickled cache shared across runs and xdist workers.
+
+    The cache entry remembers the file's mtime, size and SHA-256: a matching mtime and size is trusted
+    without reading the file, and a file that was only touched is recognized by its unchanged hash.
+    """
+    file_path = _resolve(source)
+    stat = file_path.stat()
+    cache_key = hashlib.sha1(f"{file_path.resolve()}|{sheet_name}|{header_row}|{key}".encode()).hexdigest()
+    cache_path = Path(cache_dir) / f"{cache_key}.pkl"
+
+    cached = None
+    try:
+        with open(cache_path, 'rb') as f:
+            cached = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        pass
+
+    data = None
+    if cached is not None and cached.get('version') == CACHE_VERSION:
+        if (cached['mtime_ns'], cached['size']) == (stat.st_mtime_ns, stat.st_size):
+            return cached['data']
+        content_hash = _file_hash(file_path)
+        if cached['hash'] == content_hash:
+            # Only touched: keep the parsed cases and refresh the stored mtime below
+            data = cached['data']
+    else:
+        content_hash = _file_hash(file_path)
+
+    if data is None:
+        data = _parse(file_path, sheet_name, header_row, key)
+        logger.info(f"Parsed {len(data['rows'])} cases from {file_path}")
+
+    entry = {
+        'version': CACHE_VERSION,
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'hash': content_hash,
+        'data': data,
+    }
+
+    temp_path = None
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=cache_path.parent, suffix=".tmp")
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, cache_path)
+        temp_path = None
+    # Caching is best effort: an unwritable directory or unpicklable cell values (PicklingError, TypeError,
+    # AttributeError depending on the value) leave the cases uncached, never fail collection
+    except Exception as e:
+        logger.warning(f"Could not cache test data from {file_path}: {str(e)}")
+    finally:
+        if temp_path is not None:
+            Path(temp_path).unlink(missing_ok=True)
+
+    return data
+
+
+def data_provider(source: Union[str, Path], argnames: Optional[Union[str, Sequence[str]]] = None,
+                  sheet_name: Optional[str] = None, header_row: int = 1, key: Optional[str] = None,
+                  id_column: Optional[str] = None, where: Optional[Callable[[dict], bool]] = None):
+    """
+    Parametrize a test from a spreadsheet (.xlsx) or JSON file.
+
+    argnames: a single name receives each case as a dict; several names ("name,email" or a list)
+              receive the matching columns. Defaults to every column, in file order.
+    key:      for JSON files, the top-level key holding the list of cases.
+    id_column: column used for the test ids.
+    where:    predicate on the case dict to select a subset of rows.
+
+        @data_provider("main/resources/dashboard_form_data.json", "form_data")
+        def test_form(pageManager, form_data): ...
+    """
+    data = load_cases(source, sheet_name=sheet_name, header_row=header_row, key=key)
+    columns: Optional[List[str]] = data['columns']
+    rows = data['rows']
+
+    if columns is None:
+        # Positional rows (a JSON list of lists) map straight onto the argument names
+        if argnames is None:
+            raise ValueError(f"argnames are required for positional cases in {source}")
+        return pytest.mark.parametrize(argnames, [row if len(row) != 1 else row[0] for row in rows])
+
+    cases = [dict(zip(columns, row)) for row in rows]
+    if where is not None:
+        cases = [case for case in cases if where(case)]
+    ids = [str(case[id_column]) for case in cases] if id_column else None
+
+    if argnames is None:
+        argnames = columns
+    names = [name.strip() for name in argnames.split(",")] if isinstance(argnames, str) else list(argnames)
+
+    if len(names) == 1 and names[0] not in columns:
+        return pytest.mark.parametrize(names[0], cases, ids=ids)
+
+    missing = [name for name in names if name not in columns]
+    if missing:
+        raise KeyError(f"Columns {missing} not found in {source}, available: {columns}")
+    values = [tuple(case[name] for name in names) for case in cases]
+    if len(names) == 1:
+        values = [value[0] for value in values]
+    return pytest.mark.parametrize(names, values, ids=ids)
@@ -0,0 +1,192 @@
+import heapq
+import json
+import os
+from collections import OrderedDict, defaultdict
+from pathlib import Path
+from statistics import median
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+import logging
+from xdist.scheduler import LoadScopeScheduling
+from main.utils.json_journal import atomic_write_json, file_lock
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+DURATIONS_PATH = PROJECT_ROOT / "reports" / "test_durations.json"
+# Written by the first xdist worker at collection, read by the controller's scheduler, which only sees test ids
+GROUPED_MODULES_PATH = PROJECT_ROOT / "reports" / "module_scoped_modules.json"
+
+# Rough resident memory of one worker with its browser, used to cap the worker count
+WORKER_MEMORY_BYTES = 800 * 1024 * 1024
+
+
+class DurationHistory:
+    """
+    Per-test durations (setup + call + teardown, seconds) from earlier runs, used to predict run time.
+    New measurements are blended with the stored ones (exponential average) so one slow run does not
+    dominate; tests never seen before are estimated at the median of the known ones.
+    """
+
+    def __init__(self, path: Union[str, Path] = DURATIONS_PATH, smoothing: float = 0.5, default: float = 1.0):
+        self.path = Path(path)
+        self.smoothing = smoothing
+        self.default = default
+        self.known = self._read()
+        self._fallback = median(self.known.values()) if self.known else default
+        self.measured: Dict[str, float] = defaultdict(float)
+
+    def _read(self) -> Dict[str, float]:
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def estimate(self, nodeid: str) -> float:
+        return self.known.get(nodeid, self._fallback)
+
+    def add(self, nodeid: str, duration: float) -> None:
+        self.measured[nodeid] += duration
+
+    def save(self) -> None:
+        if not self.measured:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with file_lock(self.path):
+            durations = self._read()
+            for nodeid, duration in self.measured.items():
+                previous = durations.get(nodeid)
+                durations[nodeid] = round(duration if previous is None
+                                          else self.smoothing * duration + (1 - self.smoothing) * previous, 4)
+            atomic_write_json(self.path, durations, indent=None)
+
+
+def scope_of(nodeid: str, grouped_modules: Iterable[str] = ()) -> str:
+    """
+    Tests of one class stay together (they share class-scoped setup), and so do all tests of a module in
+    grouped_modules (they share module-scoped fixtures, set up once per worker); other module-level tests
+    are scheduled alone.
+    """
+    parts = nodeid.split("::")
+    if parts[0] in grouped_modules:
+        return parts[0]
+    if len(parts) > 2:
+        return "::".join(parts[:2])
+    return nodeid
+
+
+def modules_with_module_fixtures(items) -> List[str]:
+    """Modules of the collected items that use a module-scoped fixture."""
+    modules = set()
+    for item in items:
+        fixture_info = getattr(item, "_fixtureinfo", None)
+        if fixture_info is None:
+            continue
+        if any(fixturedefs[-1].scope == "module" for fixturedefs in fixture_info.name2fixturedefs.values()):
+            modules.add(item.nodeid.split("::")[0])
+    return sorted(modules)
+
+
+def save_grouped_modules(items, path: Union[str, Path] = GROUPED_MODULES_PATH) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_json(path, modules_with_module_fixtures(items))
+
+
+def predict_makespan(costs: Iterable[float], workers: int) -> Tuple[float, List[float]]:
+    """Simulate longest-first dispatch: each unit goes to the worker that frees up first."""
+    loads = [0.0] * max(1, workers)
+    heapq.heapify(loads)
+    for cost in sorted(costs, reverse=True):
+        heapq.heappush(loads, heapq.heappop(loads) + cost)
+    return max(loads), sorted(loads, reverse=True)
+
+
+def auto_num_workers(memory_per_worker: int = WORKER_MEMORY_BYTES) -> int:
+    """Workers for -n auto: one per usable core, but no more than available memory can hold."""
+    try:
+        cores = len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS/Windows
+        cores = os.cpu_count() or 1
+
+    available = None
+    try:
+        with open("/proc/meminfo", 'r') as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    available = int(line.split()[1]) * 1024
+                    break
+    except OSError:
+        pass
+    if available is None:
+        return max(1, cores)
+    return max(1, min(cores, available // memory_per_worker))
+
+
+class DurationScheduling(LoadScopeScheduling):
+    """
+    xdist scheduler that hands out work longest-first using the durations of earlier runs.
+
+    Work units are classes, modules using module-scoped fixtures or single tests (see scope_of). The modules
+    come from grouped_modules_path, written by a worker during collection (see save_grouped_modules). Units
+    are queued by predicted duration, longest first, and each worker pulls the next unit as it runs low, which
+    approximates longest-processing-time scheduling while still adapting to tests that run slower than predicted.
+    """
+
+    def __init__(self, config, log=None, durations: Optional[DurationHistory] = None,
+                 grouped_modules_path: Union[str, Path] = GROUPED_MODULES_PATH):
+        super().__init__(config, log)
+        self.durations = durations or DurationHistory()
+        self.grouped_modules_path = Path(grouped_modules_path)
+        self.grouped_modules = frozenset()
+        self.predicted_makespan = None
+        self.predicted_loads = []
+
+    def _split_scope(self, nodeid: str) -> str:
+        return scope_of(nodeid, self.grouped_modules)
+
+    def schedule(self) -> None:
+        assert self.collection_is_completed
+
+        if self.collection is not None:
+            for node in self.nodes:
+                self._reschedule(node)
+            return
+
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+
+        self.collection = list(next(iter(self.registered_collections.values())))
+        if not self.collection:
+            return
+        # Every worker has finished collecting by now, so the list is this run's
+        try:
+            with open(self.grouped_modules_path, 'r') as f:
+                self.grouped_modules = frozenset(json.load(f))
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.grouped_modules = frozenset()
+
+        units: Dict[str, Dict[str, bool]] = OrderedDict()
+        for nodeid in self.collection:
+            units.setdefault(self._split_scope(nodeid), {})[nodeid] = False
+        costs = {scope: sum(self.durations.estimate(nodeid) for nodeid in nodeids) for scope, nodeids in units.items()}
+        for scope in sorted(units, key=lambda scope: -costs[scope]):
+            self.workqueue[scope] = units[scope]
+
+        self.predicted_makespan, self.predicted_loads = predict_makespan(costs.values(), min(len(self.nodes), len(units)))
+        self.log(f"Predicted makespan {self.predicted_makespan:.1f}s for {len(units)} work units")
+
+        extra_nodes = len(self.nodes) - len(self.workqueue)
+        for _ in range(max(0, extra_nodes)):
+            unused_node, _ = self.assigned_work.popitem()
+            unused_node.shutdown()
+
+        for node in self.nodes:
+            self._assign_work_unit(node)
+        for node in self.nodes:
+            self._reschedule(node)
+
+        if not self.workqueue:
+            for node in self.nodes:
+                node.shutdown()
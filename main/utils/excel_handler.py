@@ -1,4 +1,6 @@
 import openpyxl
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, Sequence, Union
 
 class ExcelHandler:
     @staticmethod
@@ -11,6 +13,65 @@ class ExcelHandler:
         wb.close()
         return data
 
+    @staticmethod
+    def iter_rows(file_path, sheet_name=None, header_row: Optional[int] = None,
+                  columns: Optional[Sequence[Union[str, int]]] = None,
+                  min_row: Optional[int] = None, max_row: Optional[int] = None,
+                  where: Optional[Callable] = None, skip_blank_rows: bool = False) -> Iterator[Union[list, dict]]:
+        """
+        Stream rows from a sheet in openpyxl read-only mode, so memory stays flat however large the sheet is.
+
+        header_row: 1-based row holding column names; rows after it are yielded as dicts keyed by those names.
+        columns:    project to these columns, by header name when header_row is set, otherwise by 0-based index.
+        min_row / max_row: 1-based, inclusive sheet rows to read (data starts after header_row by default).
+        where:      predicate called with each (projected) row; rows for which it is falsy are skipped.
+        """
+        wb = openpyxl.load_workbook(file_path, read_only=True)
+        try:
+            sheet = wb[sheet_name] if sheet_name else wb.active
+
+            headers = None
+            if header_row is not None:
+                header_values = next(sheet.iter_rows(min_row=header_row, max_row=header_row, values_only=True), ())
+                headers = [str(value) if value is not None else f"column_{index}" for index, value in enumerate(header_values)]
+                if min_row is None or min_row <= header_row:
+                    min_row = header_row + 1
+
+            indexes = None
+            if columns is not None:
+                if headers is not None:
+                    missing = [column for column in columns if column not in headers]
+                    if missing:
+                        raise KeyError(f"Columns {missing} not found in header row {header_row} of {file_path}")
+                    indexes = [headers.index(column) for column in columns]
+                else:
+                    indexes = list(columns)
+
+            # Only cells up to the right-most projected column need to be parsed
+            max_col = max(indexes) + 1 if indexes else None
+
+            for values in sheet.iter_rows(min_row=min_row, max_row=max_row, max_col=max_col, values_only=True):
+                if skip_blank_rows and all(value is None for value in values):
+                    continue
+
+                if indexes is not None:
+                    values = [values[index] if index < len(values) else None for index in indexes]
+                    names = list(columns) if headers is not None else None
+                else:
+                    values = list(values)
+                    names = headers
+
+                if names is not None:
+                    values = values + [None] * (len(names) - len(values))
+                    row = dict(zip(names, values))
+                else:
+                    row = values
+
+                if where is None or where(row):
+                    yield row
+        finally:
+            wb.close()
+
     @staticmethod
     def write_excel(file_path, data, sheet_name=None):
         wb = openpyxl.Workbook()
@@ -21,3 +82,92 @@ class ExcelHandler:
             sheet.append(row)
         wb.save(file_path)
         wb.close()
+
+    @staticmethod
+    def write_excel_stream(file_path, rows: Iterable[Sequence], sheet_name=None, headers: Optional[Sequence] = None) -> int:
+        """Write rows from any iterable or generator with flat memory use. Returns the number of data rows written."""
+        with ExcelStreamWriter(file_path) as writer:
+            return writer.write_rows(rows, sheet_name=sheet_name or "Sheet", headers=headers)
+
+
+class ExcelStreamWriter:
+    """
+    Incremental workbook writer built on openpyxl write-only mode.
+
+    Rows are serialized to the sheet's temporary XML as soon as they are appended, so memory stays flat
+    regardless of row count; the .xlsx file itself is assembled when the writer is closed. Sheets are
+    created on first use, and rows can be fed one at a time (e.g. from report hooks during a session):
+
+        with ExcelStreamWriter("reports/results.xlsx") as writer:
+            writer.add_sheet("results", headers=["test", "outcome"])
+            writer.write_row(["test_smoke1", "passed"], sheet_name="results")
+    """
+
+    def __init__(self, file_path: Union[str, Path]):
+        self.file_path = Path(file_path)
+        self.rows_written = 0
+        self._wb = openpyxl.Workbook(write_only=True)
+        self._sheets = {}
+        self._closed = False
+
+    def add_sheet(self, sheet_name: str, headers: Optional[Sequence] = None):
+        if self._closed:
+            raise ValueError(f"Writer for {self.file_path} is already closed")
+        if sheet_name in self._sheets:
+            raise ValueError(f"Sheet '{sheet_name}' already exists in {self.file_path}")
+        sheet = self._wb.create_sheet(title=sheet_name)
+        if headers:
+            sheet.append(list(headers))
+        self._sheets[sheet_name] = sheet
+        return sheet
+
+    def _free_sheet_name(self) -> str:
+        sheet_name, number = "Sheet", 0
+        while sheet_name in self._sheets:
+            number += 1
+            sheet_name = f"Sheet{number}"
+        return sheet_name
+
+    def _sheet(self, sheet_name: Optional[str]):
+        if self._closed:
+            raise ValueError(f"Writer for {self.file_path} is already closed")
+        if sheet_name is None:
+            if not self._sheets:
+                return self.add_sheet("Sheet")
+            return next(iter(self._sheets.values()))
+        return self._sheets.get(sheet_name) or self.add_sheet(sheet_name)
+
+    def write_row(self, row: Sequence, sheet_name: Optional[str] = None) -> None:
+        self._sheet(sheet_name).append(list(row))
+        self.rows_written += 1
+
+    def write_rows(self, rows: Iterable[Sequence], sheet_name: Optional[str] = None, headers: Optional[Sequence] = None) -> int:
+        if headers is not None:
+            # Headers start a new sheet; unnamed ones get the next free "Sheet", "Sheet1", ... name
+            sheet = self.add_sheet(sheet_name or self._free_sheet_name(), headers=headers)
+        else:
+            sheet = self._sheet(sheet_name)
+        count = 0
+        for row in rows:
+            sheet.append(list(row))
+            count += 1
+        self.rows_written += count
+        return count
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        if not self._sheets:
+            # An xlsx file needs at least one sheet
+            self.add_sheet("Sheet")
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        self._wb.save(self.file_path)
+        self._wb.close()
+        self._closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
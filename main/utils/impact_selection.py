@@ -0,0 +1,185 @@
+import ast
+import json
+import subprocess
+import sys
+from collections import defaultdict
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Union
+import logging
+from main.utils.json_journal import atomic_write_json, file_lock
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+IMPACT_MAP_PATH = PROJECT_ROOT / "reports" / "impact_map.json"
+MAIN_DIR = PROJECT_ROOT / "main"
+
+# Changes that can affect any test; the full suite runs when one of these changed
+FULL_RUN_FILES = ("conftest.py", "pytest.ini", "requirements.txt")
+FULL_RUN_DIRS = ("main/envi/",)
+
+
+def changed_files(since: str, root: Union[str, Path] = PROJECT_ROOT) -> Set[str]:
+    """Files changed since a git ref, plus uncommitted and untracked ones, relative to root. Raises ValueError for an unknown ref."""
+    root = Path(root)
+
+    def git(*args):
+        result = subprocess.run(["git", *args], cwd=root, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise ValueError(f"git {' '.join(args)} failed: {result.stderr.strip()}")
+        return result.stdout
+
+    toplevel = Path(git("rev-parse", "--show-toplevel").strip())
+    names = git("diff", "--name-only", since).splitlines() + git("ls-files", "--others", "--exclude-standard").splitlines()
+    files = set()
+    for name in names:
+        path = (toplevel / name).resolve()
+        try:
+            files.add(path.relative_to(root.resolve()).as_posix())
+        except ValueError:  # outside the project
+            continue
+    return files
+
+
+@lru_cache(maxsize=None)
+def _module_file(module: str) -> Optional[Path]:
+    parts = module.split(".")
+    candidate = PROJECT_ROOT.joinpath(*parts)
+    for path in (candidate.with_suffix(".py"), candidate / "__init__.py"):
+        if path.is_file():
+            return path
+    return None
+
+
+@lru_cache(maxsize=None)
+def _direct_imports(file_path: Path) -> frozenset:
+    try:
+        tree = ast.parse(file_path.read_text(), filename=str(file_path))
+    except (OSError, SyntaxError):
+        return frozenset()
+    modules = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            modules.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+            modules.add(node.module)
+            # "from main.utils import pdf_assert" imports a module, not a name
+            modules.update(f"{node.module}.{alias.name}" for alias in node.names)
+    files = set()
+    for module in modules:
+        if module == "main" or module.startswith("main."):
+            path = _module_file(module)
+            if path is not None:
+                files.add(path)
+    return frozenset(files)
+
+
+@lru_cache(maxsize=None)
+def import_closure(file_path: Path) -> frozenset:
+    """Project files (relative posix paths) a module imports, directly or through other main.* modules."""
+    seen = set()
+    pending = [Path(file_path).resolve()]
+    while pending:
+        path = pending.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+        pending.extend(_direct_imports(path))
+    return frozenset(path.relative_to(PROJECT_ROOT).as_posix() for path in seen if path.is_relative_to(PROJECT_ROOT))
+
+
+class CoverageRecorder:
+    """
+    Records which files under main/ each test executes, at file granularity, with sys.setprofile.
+
+    Only Python function calls are seen, which is enough to tell which modules a test goes through. Maps
+    are saved per process and merged into the impact map file under a lock.
+    """
+
+    def __init__(self, path: Union[str, Path] = IMPACT_MAP_PATH):
+        self.path = Path(path)
+        self.coverage: Dict[str, Set[str]] = defaultdict(set)
+        self._current: Optional[Set[str]] = None
+        self._main_prefix = str(MAIN_DIR) + "/"
+
+    def _profile(self, frame, event, arg):
+        if event == "call":
+            filename = frame.f_code.co_filename
+            if filename.startswith(self._main_prefix):
+                self._current.add(filename)
+
+    def start(self, nodeid: str) -> None:
+        self._current = self.coverage[nodeid]
+        sys.setprofile(self._profile)
+
+    def stop(self) -> None:
+        sys.setprofile(None)
+        self._current = None
+
+    def save(self) -> None:
+        if not self.coverage:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with file_lock(self.path):
+            impact_map = load_impact_map(self.path)
+            for nodeid, files in self.coverage.items():
+                impact_map[nodeid] = sorted(Path(file).relative_to(PROJECT_ROOT).as_posix() for file in files)
+            atomic_write_json(self.path, impact_map, indent=None)
+        logger.info(f"Recorded the files used by {len(self.coverage)} tests in {self.path}")
+
+
+def load_impact_map(path: Union[str, Path] = IMPACT_MAP_PATH) -> Dict[str, List[str]]:
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def needs_full_run(changed: Iterable[str]) -> Optional[str]:
+    """The changed file that makes impact selection unsafe, if any."""
+    for name in changed:
+        if Path(name).name in FULL_RUN_FILES or name.startswith(FULL_RUN_DIRS):
+            return name
+    return None
+
+
+def is_affected(test_file: Path, nodeid: str, changed: Set[str], impact_map: Dict[str, List[str]],
+                uses_shared_fixtures: bool) -> bool:
+    """
+    Whether a test may be affected by the changed files.
+
+    A test is affected when its own module, a main.* module it imports (directly or not) or a file it executed
+    when its coverage was recorded changed, or when a changed data file is named in its source. A test
+    without recorded coverage that uses fixtures from the root conftest (which imports most of main/) is
+    affected by any change under main/.
+    """
+    test_file = Path(test_file).resolve()
+    relative = test_file.relative_to(PROJECT_ROOT).as_posix()
+    if relative in changed:
+        return True
+    dependencies = set(import_closure(test_file))
+    recorded = impact_map.get(nodeid)
+    if recorded is not None:
+        dependencies.update(recorded)
+    if dependencies & changed:
+        return True
+
+    changed_data = [name for name in changed if not name.endswith(".py")]
+    if changed_data:
+        source = _source(test_file)
+        if any(name in source for name in changed_data):
+            return True
+
+    if recorded is None and uses_shared_fixtures:
+        return any(name.startswith("main/") for name in changed)
+    return False
+
+
+@lru_cache(maxsize=None)
+def _source(file_path: Path) -> str:
+    try:
+        return file_path.read_text()
+    except OSError:
+        return ""
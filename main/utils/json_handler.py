@@ -1,4 +1,5 @@
 import json
+from main.utils.json_journal import atomic_write_json, file_lock
 
 class JsonHandler:
     @staticmethod
@@ -11,15 +12,17 @@ class JsonHandler:
         """
         Add new_data to the existing JSON file without removing current data.
         new_data should be a dict.
+        The update holds a file lock and replaces the file atomically, so concurrent writers
+        (e.g. xdist workers) do not lose each other's keys. For frequent appends use JsonJournal.
         """
-        try:
-            with open(file_path, 'r') as f:
-                data = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            data = {}
-        data.update(new_data)
-        with open(file_path, 'w') as f:
-            json.dump(data, f, indent=4)
+        with file_lock(file_path):
+            try:
+                with open(file_path, 'r') as f:
+                    data = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                data = {}
+            data.update(new_data)
+            atomic_write_json(file_path, data)
 
     @staticmethod
     def overwrite_json(file_path, new_data):
@@ -27,5 +30,5 @@ class JsonHandler:
         Clear all data from the JSON file and write new_data.
         new_data should be a dict.
         """
-        with open(file_path, 'w') as f:
-            json.dump(new_data, f, indent=4)
+        with file_lock(file_path):
+            atomic_write_json(file_path, new_data)
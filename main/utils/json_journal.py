@@ -0,0 +1,192 @@
+import json
+import os
+import secrets
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, Union
+import logging
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+
+
+@contextmanager
+def file_lock(path: Union[str, Path], shared: bool = False):
+    """
+    Hold an inter-process lock on <path>.lock for the duration of the block.
+    Shared locks allow concurrent readers where the platform supports it (POSIX); on Windows every lock is exclusive.
+    """
+    lock_path = f"{path}.lock"
+    with open(lock_path, 'a+b') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _create_temp_file(file_path: Path):
+    """
+    Create a unique temporary file next to file_path; returns (fd, path). Unlike mkstemp's owner-only 0600, it gets
+    the mode open() gives new files (0666 less the umask), applied by the OS without reading or changing the umask.
+    """
+    for _ in range(100):
+        temp_path = os.path.join(file_path.parent, f".{file_path.name}.{secrets.token_hex(4)}.tmp")
+        try:
+            return os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o666), temp_path
+        except FileExistsError:
+            continue
+    raise FileExistsError(f"No usable temporary file name next to {file_path}")
+
+
+def atomic_write_json(file_path: Union[str, Path], data, indent: Optional[int] = 4) -> None:
+    """
+    Write JSON to a temporary file next to file_path, fsync it and move it into place, so readers never see a partial file.
+    The file keeps its permissions, or gets the ones open() would give a new file.
+    """
+    file_path = Path(file_path)
+    try:
+        mode = file_path.stat().st_mode & 0o7777
+    except FileNotFoundError:
+        mode = None
+    fd, temp_path = _create_temp_file(file_path)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+        if mode is not None:
+            os.chmod(temp_path, mode)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+class JsonJournal:
+    """
+    Append-only JSON store that is safe to write from many processes at once (e.g. xdist workers).
+
+    append() adds one line-delimited JSON record to <path>.journal under a file lock, which costs the size of
+    the record instead of the size of the file. read() returns the merged view: the snapshot at <path> with
+    every journal record applied in order with dict.update, the same result repeated JsonHandler.append_json
+    calls would produce. New journal lines are read incrementally. Once the journal grows past compact_bytes
+    (or on compact()), the merged view is written back to <path> with an atomic replace and the journal is emptied.
+
+    A record cut short by a crash is ignored, and re-applying journal records that were already compacted
+    is harmless, so the store stays consistent if a writer dies at any point.
+    """
+
+    def __init__(self, path: Union[str, Path], compact_bytes: Optional[int] = 1024 * 1024, fsync: bool = False):
+        self.path = Path(path)
+        self.journal_path = Path(f"{self.path}.journal")
+        self.compact_bytes = compact_bytes
+        self.fsync = fsync
+        self._view = None
+        self._snapshot_stamp = None
+        self._journal_offset = 0
+
+    def append(self, new_data: dict) -> None:
+        if not isinstance(new_data, dict):
+            raise TypeError(f"Journal records must be dicts, got {type(new_data).__name__}")
+        record = (json.dumps(new_data, separators=(',', ':')) + "\n").encode('utf-8')
+
+        with file_lock(self.path):
+            # O_APPEND keeps each record contiguous at the end of the file
+            fd = os.open(self.journal_path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                journal_size = os.fstat(fd).st_size
+                if journal_size and os.lseek(fd, -1, os.SEEK_END) >= 0 and os.read(fd, 1) != b"\n":
+                    # A writer died mid-record; start on a fresh line so this record stays readable
+                    record = b"\n" + record
+                os.write(fd, record)
+                if self.fsync:
+                    os.fsync(fd)
+                journal_size += len(record)
+            finally:
+                os.close(fd)
+
+            if self.compact_bytes and journal_size >= self.compact_bytes:
+                self._compact_locked()
+
+    def read(self) -> dict:
+        with file_lock(self.path, shared=True):
+            self._refresh()
+            return dict(self._view)
+
+    def compact(self) -> dict:
+        with file_lock(self.path):
+            return self._compact_locked()
+
+    def _compact_locked(self) -> dict:
+        self._refresh()
+        atomic_write_json(self.path, self._view)
+        # Truncate only after the snapshot is safely in place
+        with open(self.journal_path, 'wb') as journal:
+            if self.fsync:
+                os.fsync(journal.fileno())
+        self._snapshot_stamp = self._stamp(self.path)
+        self._journal_offset = 0
+        logger.debug(f"Compacted JSON journal into {self.path}")
+        return dict(self._view)
+
+    @staticmethod
+    def _stamp(path: Path):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _refresh(self) -> None:
+        """Bring the in-memory view up to date, reloading fully only if the snapshot or journal was rewritten."""
+        stamp = self._stamp(self.path)
+        try:
+            journal_size = self.journal_path.stat().st_size
+        except FileNotFoundError:
+            journal_size = 0
+
+        if self._view is None or stamp != self._snapshot_stamp or journal_size < self._journal_offset:
+            try:
+                with open(self.path, 'r') as f:
+                    self._view = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._view = {}
+            self._snapshot_stamp = stamp
+            self._journal_offset = 0
+
+        if journal_size == self._journal_offset:
+            return
+
+        with open(self.journal_path, 'rb') as journal:
+            journal.seek(self._journal_offset)
+            chunk = journal.read(journal_size - self._journal_offset)
+
+        # Only consume complete lines; a trailing partial line is re-read once it is finished
+        complete = chunk[:chunk.rfind(b"\n") + 1]
+        for line in complete.splitlines():
+            if not line.strip():
+                continue
+            try:
+                self._view.update(json.loads(line))
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping corrupt record in {self.journal_path}")
+        self._journal_offset += len(complete)
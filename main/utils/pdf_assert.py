@@ -1,9 +1,13 @@
-import PyPDF2
+import bisect
 import os
 import re
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import Iterator, List, Optional, Tuple, Union
 import logging
+from main.utils.pdf_cache import CachedPDF, PDFDocumentCache, document_cache
+from main.utils.pdf_index import PDFTextIndex
+from main.utils.pdf_text_store import PDFTextStore, default_store
+from main.utils.text_matcher import MultiPatternMatcher
 
 logger = logging.getLogger(__name__)
 
@@ -11,45 +15,130 @@ class PDFAssert:
     """
     Utility class for PDF file assertions and content validation.
     Provides methods to extract, search, and validate PDF content.
+    Parsed documents are shared between calls through PDFAssert.cache.
     """
 
-    @staticmethod
-    def extract_text(pdf_path: Union[str, Path]) -> str:
-        pdf_path = Path(pdf_path)
+    cache: PDFDocumentCache = document_cache
+
+    # Opt-in multi-process extraction for large documents, see extract_text()
+    parallel_extraction: bool = False
+    parallel_workers: Optional[int] = None
+    parallel_min_pages: int = 64
 
+    # Extracted text persisted by content hash and shared across runs and xdist workers, None disables it
+    text_store: Optional[PDFTextStore] = default_store()
+
+    @staticmethod
+    def _open(pdf_path: Path) -> CachedPDF:
         if not pdf_path.exists():
             raise FileNotFoundError(f"PDF file not found: {pdf_path}")
+        document = PDFAssert.cache.get(pdf_path)
+        if PDFAssert.text_store is not None and not document.store_checked:
+            PDFAssert._sync_with_store(document, PDFAssert.text_store)
+        return document
 
+    @staticmethod
+    def _sync_with_store(document: CachedPDF, store: PDFTextStore) -> None:
+        document.store_checked = True
         try:
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text_content = ""
+            content_hash = store.content_hash(document.path)
+            entry = store.load(content_hash)
+            if entry is not None:
+                document.load_pages(entry['pages'], entry['metadata'])
+                logger.info(f"Loaded extracted text for PDF {document.path} from store")
+                return
+
+            # First sight of this content: saved once calls have extracted every page anyway (see _save_to_store),
+            # so calls that stop at an early page keep parsing only what they need
+            document.store_pending = content_hash
+        except Exception as e:
+            logger.warning(f"PDF text store not used for {document.path}: {str(e)}")
+
+    @staticmethod
+    def _save_to_store(document: CachedPDF) -> None:
+        """Save the document's text under its pending content hash once every page is cached."""
+        if document.store_pending is None or PDFAssert.text_store is None or not document.complete:
+            return
+        content_hash, document.store_pending = document.store_pending, None
+        try:
+            pages = [document.page_text(page_index) for page_index in range(document.page_count)]
+            PDFAssert.text_store.save(content_hash, pages, document.metadata)
+        except Exception as e:
+            logger.warning(f"Could not save extracted text of PDF {document.path} to the store: {str(e)}")
+
+    @staticmethod
+    def _extract_all(document: CachedPDF, parallel: Optional[bool] = None, workers: Optional[int] = None) -> List[str]:
+        pages = document.extract_all(PDFAssert._extraction_workers(document, parallel, workers))
+        PDFAssert._save_to_store(document)
+        return pages
+
+    @staticmethod
+    def invalidate_cache(pdf_path: Optional[Union[str, Path]] = None) -> None:
+        PDFAssert.cache.invalidate(pdf_path)
+
+    @staticmethod
+    def cache_stats() -> dict:
+        return PDFAssert.cache.stats()
 
-                for page_num in range(len(pdf_reader.pages)):
-                    page = pdf_reader.pages[page_num]
-                    text_content += page.extract_text() + "\n"
+    @staticmethod
+    def extract_text(pdf_path: Union[str, Path], parallel: Optional[bool] = None, workers: Optional[int] = None) -> str:
+        """
+        Extract the text of all pages. When parallel extraction is enabled (per call, or for every call
+        through PDFAssert.parallel_extraction) and the document has at least PDFAssert.parallel_min_pages
+        pages, pages are extracted across a pool of worker processes. Smaller documents stay serial
+        because process start-up and pickling cost more than they save.
+        """
+        pdf_path = Path(pdf_path)
+        document = PDFAssert._open(pdf_path)
 
-                logger.info(f"Successfully extracted text from PDF: {pdf_path}")
-                return text_content.strip()
+        try:
+            text_content = "\n".join(PDFAssert._extract_all(document, parallel, workers))
+
+            logger.info(f"Successfully extracted text from PDF: {pdf_path}")
+            return text_content.strip()
 
         except Exception as e:
             logger.error(f"Failed to extract text from PDF {pdf_path}: {str(e)}")
             raise Exception(f"Unable to read PDF file: {str(e)}")
 
     @staticmethod
-    def get_page_count(pdf_path: Union[str, Path]) -> int:
+    def _extraction_workers(document: CachedPDF, parallel: Optional[bool], workers: Optional[int]) -> int:
+        if parallel is None:
+            parallel = PDFAssert.parallel_extraction
+        if not parallel or document.page_count < PDFAssert.parallel_min_pages:
+            return 1
+        return workers or PDFAssert.parallel_workers or os.cpu_count() or 1
 
+    @staticmethod
+    def iter_pages(pdf_path: Union[str, Path], keep_text: bool = True) -> Iterator[Tuple[int, str]]:
+        """
+        Lazily yield (page_number, text) for each page, extracting one page at a time.
+        Callers that stop iterating early never pay for the remaining pages. With keep_text=False,
+        pages that are not cached yet are not added to the cache, so memory stays at about one page.
+        """
         pdf_path = Path(pdf_path)
+        document = PDFAssert._open(pdf_path)
+
+        for page_index in range(document.page_count):
+            try:
+                page_text = document.page_text(page_index, keep=keep_text)
+            except Exception as e:
+                logger.error(f"Failed to extract text from page {page_index + 1} of PDF {pdf_path}: {str(e)}")
+                raise Exception(f"Unable to read PDF page: {str(e)}")
+            # Before the yield: callers that find what they need on the last page stop iterating there
+            PDFAssert._save_to_store(document)
+            yield page_index + 1, page_text
 
-        if not pdf_path.exists():
-            raise FileNotFoundError(f"PDF file not found: {pdf_path}")
+    @staticmethod
+    def get_page_count(pdf_path: Union[str, Path]) -> int:
+
+        pdf_path = Path(pdf_path)
+        document = PDFAssert._open(pdf_path)
 
         try:
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                page_count = len(pdf_reader.pages)
-                logger.info(f"PDF {pdf_path} has {page_count} pages")
-                return page_count
+            page_count = document.page_count
+            logger.info(f"PDF {pdf_path} has {page_count} pages")
+            return page_count
 
         except Exception as e:
             logger.error(f"Failed to get page count from PDF {pdf_path}: {str(e)}")
@@ -59,22 +148,17 @@ class PDFAssert:
     def extract_text_from_page(pdf_path: Union[str, Path], page_number: int) -> str:
 
         pdf_path = Path(pdf_path)
-
-        if not pdf_path.exists():
-            raise FileNotFoundError(f"PDF file not found: {pdf_path}")
+        document = PDFAssert._open(pdf_path)
 
         try:
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
+            if page_number < 1 or page_number > document.page_count:
+                raise ValueError(f"Invalid page number {page_number}. PDF has {document.page_count} pages.")
 
-                if page_number < 1 or page_number > len(pdf_reader.pages):
-                    raise ValueError(f"Invalid page number {page_number}. PDF has {len(pdf_reader.pages)} pages.")
+            text_content = document.page_text(page_number - 1)  # Convert to 0-based index
+            PDFAssert._save_to_store(document)
 
-                page = pdf_reader.pages[page_number - 1]  # Convert to 0-based index
-                text_content = page.extract_text()
-
-                logger.info(f"Successfully extracted text from page {page_number} of PDF: {pdf_path}")
-                return text_content.strip()
+            logger.info(f"Successfully extracted text from page {page_number} of PDF: {pdf_path}")
+            return text_content.strip()
 
         except Exception as e:
             logger.error(f"Failed to extract text from page {page_number} of PDF {pdf_path}: {str(e)}")
@@ -82,14 +166,10 @@ class PDFAssert:
 
     @staticmethod
     def assert_text_exists(pdf_path: Union[str, Path], expected_text: str, case_sensitive: bool = True) -> bool:
-        content = PDFAssert.extract_text(pdf_path)
+        page_number = PDFAssert._find_first_page(pdf_path, expected_text, case_sensitive)
 
-        if not case_sensitive:
-            content = content.lower()
-            expected_text = expected_text.lower()
-
-        if expected_text in content:
-            logger.info(f"Text '{expected_text}' found in PDF: {pdf_path}")
+        if page_number is not None:
+            logger.info(f"Text '{expected_text}' found on page {page_number} of PDF: {pdf_path}")
             return True
         else:
             error_msg = f"Text '{expected_text}' not found in PDF: {pdf_path}"
@@ -98,27 +178,53 @@ class PDFAssert:
 
     @staticmethod
     def assert_text_not_exists(pdf_path: Union[str, Path], unexpected_text: str, case_sensitive: bool = True) -> bool:
-        content = PDFAssert.extract_text(pdf_path)
-
-        if not case_sensitive:
-            content = content.lower()
-            unexpected_text = unexpected_text.lower()
+        page_number = PDFAssert._find_first_page(pdf_path, unexpected_text, case_sensitive)
 
-        if unexpected_text not in content:
+        if page_number is None:
             logger.info(f"Text '{unexpected_text}' correctly not found in PDF: {pdf_path}")
             return True
         else:
-            error_msg = f"Unexpected text '{unexpected_text}' found in PDF: {pdf_path}"
+            error_msg = f"Unexpected text '{unexpected_text}' found on page {page_number} of PDF: {pdf_path}"
             logger.error(error_msg)
             raise AssertionError(error_msg)
 
     @staticmethod
-    def assert_regex_pattern(pdf_path: Union[str, Path], pattern: str, flags: int = 0) -> List[str]:
-        content = PDFAssert.extract_text(pdf_path)
-        matches = re.findall(pattern, content, flags)
+    def _find_first_page(pdf_path: Union[str, Path], text: str, case_sensitive: bool = True) -> Optional[int]:
+        """Return the page number on which the first occurrence of text ends, or None if it does not occur."""
+        if not case_sensitive:
+            text = text.lower()
+        if not text:
+            return 1
+
+        matcher = MultiPatternMatcher([text])
+        for page_number, page_text in PDFAssert.iter_pages(pdf_path):
+            if not case_sensitive:
+                page_text = page_text.lower()
+            for _ in matcher.feed(("\n" if page_number > 1 else "") + page_text):
+                return page_number
+        return None
+
+    @staticmethod
+    def assert_regex_pattern(pdf_path: Union[str, Path], pattern: str, flags: int = 0, max_matches: Optional[int] = None) -> List[str]:
+        """
+        Collect matches of pattern page by page; matches do not span page breaks.
+        With max_matches set, scanning stops as soon as that many matches have been found.
+        """
+        regex = re.compile(pattern, flags)
+        matches = []
+        pages = []
+
+        for page_number, page_text in PDFAssert.iter_pages(pdf_path):
+            page_matches = regex.findall(page_text)
+            if page_matches:
+                matches.extend(page_matches)
+                pages.append(page_number)
+            if max_matches is not None and len(matches) >= max_matches:
+                matches = matches[:max_matches]
+                break
 
         if matches:
-            logger.info(f"Regex pattern '{pattern}' found {len(matches)} matches in PDF: {pdf_path}")
+            logger.info(f"Regex pattern '{pattern}' found {len(matches)} matches on pages {pages} in PDF: {pdf_path}")
             return matches
         else:
             error_msg = f"Regex pattern '{pattern}' not found in PDF: {pdf_path}"
@@ -156,59 +262,243 @@ class PDFAssert:
     @staticmethod
     def get_metadata(pdf_path: Union[str, Path]) -> dict:
         pdf_path = Path(pdf_path)
-
-        if not pdf_path.exists():
-            raise FileNotFoundError(f"PDF file not found: {pdf_path}")
+        document = PDFAssert._open(pdf_path)
 
         try:
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                metadata = {}
+            metadata = document.metadata
+            metadata['page_count'] = document.page_count
+            metadata['file_size'] = pdf_path.stat().st_size
 
-                if pdf_reader.metadata:
-                    for key, value in pdf_reader.metadata.items():
-                        # Remove the leading slash from metadata keys
-                        clean_key = key.lstrip('/')
-                        metadata[clean_key] = value
-
-                metadata['page_count'] = len(pdf_reader.pages)
-                metadata['file_size'] = pdf_path.stat().st_size
-
-                logger.info(f"Successfully extracted metadata from PDF: {pdf_path}")
-                return metadata
+            logger.info(f"Successfully extracted metadata from PDF: {pdf_path}")
+            return metadata
 
         except Exception as e:
             logger.error(f"Failed to extract metadata from PDF {pdf_path}: {str(e)}")
             raise Exception(f"Unable to read PDF metadata: {str(e)}")
 
     @staticmethod
-    def search_text_with_context(pdf_path: Union[str, Path], search_text: str, context_chars: int = 50, case_sensitive: bool = True) -> List[dict]:
-        content = PDFAssert.extract_text(pdf_path)
-        search_content = content if case_sensitive else content.lower()
+    def search_text_with_context(pdf_path: Union[str, Path], search_text: str, context_chars: int = 50,
+                                 case_sensitive: bool = True, max_matches: Optional[int] = None) -> List[dict]:
+        """
+        Find occurrences of search_text while streaming pages, keeping only a context-sized window in memory.
+
+        'position' and the context bounds are offsets into the text of all pages joined by newlines,
+        'page' and 'page_position' locate the match inside its page. With max_matches set, pages after
+        the last needed match are never extracted.
+        """
         search_term = search_text if case_sensitive else search_text.lower()
-
+        term_length = max(len(search_term), 1)
         matches = []
-        start_pos = 0
-
-        while True:
-            pos = search_content.find(search_term, start_pos)
-            if pos == -1:
+        page_starts = []
+
+        window = ""
+        search_window = ""
+        window_start = 0
+        stream_end = 0
+        next_search = 0
+
+        def collect(final: bool) -> bool:
+            nonlocal next_search
+            while True:
+                pos = search_window.find(search_term, next_search - window_start)
+                if pos == -1:
+                    next_search = max(next_search, stream_end - term_length + 1)
+                    return False
+
+                pos += window_start
+                if not final and pos + len(search_text) + context_chars > stream_end:
+                    # The trailing context is not streamed in yet, finish this match on the next page
+                    next_search = pos
+                    return False
+
+                context_start = max(0, pos - context_chars)
+                context_end = min(stream_end, pos + len(search_text) + context_chars)
+                page_index = bisect.bisect_right(page_starts, pos) - 1
+
+                matches.append({
+                    'position': pos,
+                    'page': page_index + 1,
+                    'page_position': pos - page_starts[page_index],
+                    'matched_text': window[pos - window_start:pos - window_start + len(search_text)],
+                    'context': window[context_start - window_start:context_end - window_start],
+                    'context_start': context_start,
+                    'context_end': context_end
+                })
+                next_search = pos + 1
+                if max_matches is not None and len(matches) >= max_matches:
+                    return True
+
+        finished = False
+        for page_number, page_text in PDFAssert.iter_pages(pdf_path):
+            separator = "\n" if page_number > 1 else ""
+            page_starts.append(stream_end + len(separator))
+            chunk = separator + page_text
+
+            window += chunk
+            search_window += chunk if case_sensitive else chunk.lower()
+            stream_end += len(chunk)
+
+            if collect(final=False):
+                finished = True
                 break
 
-            # Calculate context boundaries
-            context_start = max(0, pos - context_chars)
-            context_end = min(len(content), pos + len(search_text) + context_chars)
+            # Drop everything that can no longer be part of a match or its leading context
+            keep_from = max(window_start, next_search - context_chars)
+            window = window[keep_from - window_start:]
+            search_window = search_window[keep_from - window_start:]
+            window_start = keep_from
 
-            match_info = {
-                'position': pos,
-                'matched_text': content[pos:pos + len(search_text)],
-                'context': content[context_start:context_end],
-                'context_start': context_start,
-                'context_end': context_end
+        if not finished:
+            collect(final=True)
+
+        logger.info(f"Found {len(matches)} occurrences of '{search_text}' in PDF: {pdf_path}")
+        return matches
+
+    @staticmethod
+    def get_index(pdf_path: Union[str, Path]) -> PDFTextIndex:
+        """Return the positional search index of a PDF, building it on first use and caching it with the document."""
+        pdf_path = Path(pdf_path)
+        document = PDFAssert._open(pdf_path)
+
+        if document.index is None:
+            try:
+                document.index = PDFTextIndex(PDFAssert._extract_all(document))
+            except Exception as e:
+                logger.error(f"Failed to index PDF {pdf_path}: {str(e)}")
+                raise Exception(f"Unable to read PDF file: {str(e)}")
+            logger.info(f"Indexed {document.index.token_count} tokens of PDF: {pdf_path}")
+        return document.index
+
+    @staticmethod
+    def search_indexed(pdf_path: Union[str, Path], search_text: str, context_chars: int = 50,
+                       case_sensitive: bool = True, max_matches: Optional[int] = None) -> List[dict]:
+        """
+        Whole-word term or phrase search through the document's index. Meant for suites that run many
+        searches against the same large document: the first call builds the index, later calls only
+        look up postings. Results also give the 'line' on the page.
+        """
+        matches = PDFAssert.get_index(pdf_path).search(search_text, context_chars, case_sensitive, max_matches)
+        logger.info(f"Found {len(matches)} indexed occurrences of '{search_text}' in PDF: {pdf_path}")
+        return matches
+
+    @staticmethod
+    def check_expectations(pdf_path: Union[str, Path], expectations: List[dict]) -> dict:
+        """
+        Evaluate many expectations against a PDF in a single pass over its pages.
+
+        Each expectation is a dict with a "type" of:
+            "present" / "absent": {"text": ..., "case_sensitive": True}
+            "on_page":            {"text": ..., "page": 2, "case_sensitive": True}
+            "regex":              {"pattern": ..., "flags": 0, "page": None}
+        Literal checks see the same text as extract_text(), so they also match across page breaks.
+        Regex checks are applied page by page and do not match across page breaks.
+
+        Returns a report dict with an overall "passed" flag and one result per expectation.
+        """
+        pdf_path = Path(pdf_path)
+        PDFAssert._open(pdf_path)
+
+        literal_checks = {True: [], False: []}
+        regex_checks = []
+        for position, expectation in enumerate(expectations):
+            check_type = expectation.get('type')
+            if check_type in ('present', 'absent', 'on_page'):
+                if check_type == 'on_page' and 'page' not in expectation:
+                    raise ValueError(f"Expectation #{position} of type 'on_page' needs a 'page' number")
+                case_sensitive = expectation.get('case_sensitive', True)
+                literal_checks[case_sensitive].append(position)
+            elif check_type == 'regex':
+                regex_checks.append((position, re.compile(expectation['pattern'], expectation.get('flags', 0))))
+            else:
+                raise ValueError(f"Unknown expectation type {check_type!r} in expectation #{position}")
+
+        matchers = {}
+        for case_sensitive, positions in literal_checks.items():
+            if positions:
+                patterns = [expectations[position]['text'] for position in positions]
+                if not case_sensitive:
+                    patterns = [pattern.lower() for pattern in patterns]
+                matchers[case_sensitive] = (MultiPatternMatcher(patterns), positions)
+
+        found_pages = {position: set() for position in range(len(expectations))}
+        found_counts = {position: 0 for position in range(len(expectations))}
+        regex_matches = {position: [] for position, _ in regex_checks}
+        stream_offsets = {case_sensitive: 0 for case_sensitive in matchers}
+
+        for page_number, page_text in PDFAssert.iter_pages(pdf_path):
+            separator = "\n" if page_number > 1 else ""
+
+            for case_sensitive, (matcher, positions) in matchers.items():
+                text = page_text if case_sensitive else page_text.lower()
+                page_start = stream_offsets[case_sensitive] + len(separator)
+                for pattern_index, start in matcher.feed(separator + text):
+                    position = positions[pattern_index]
+                    found_counts[position] += 1
+                    if start >= page_start:
+                        found_pages[position].add(page_number)
+                stream_offsets[case_sensitive] += len(separator) + len(text)
+
+            for position, regex in regex_checks:
+                expected_page = expectations[position].get('page')
+                if expected_page is None or expected_page == page_number:
+                    page_matches = regex.findall(page_text)
+                    if page_matches:
+                        regex_matches[position].extend(page_matches)
+                        found_pages[position].add(page_number)
+                        found_counts[position] += len(page_matches)
+
+        results = []
+        for position, expectation in enumerate(expectations):
+            check_type = expectation['type']
+            pages = sorted(found_pages[position])
+            count = found_counts[position]
+            label = expectation.get('text', expectation.get('pattern'))
+
+            if check_type in ('present', 'absent') and not label:
+                # An empty string is contained in any text, mirroring the `in` operator
+                count = max(count, 1)
+
+            if check_type == 'present':
+                passed = count > 0
+                message = f"Text '{label}' {'found' if passed else 'not found'}"
+            elif check_type == 'absent':
+                passed = count == 0
+                message = f"Text '{label}' {'correctly not found' if passed else 'unexpectedly found'}"
+            elif check_type == 'on_page':
+                passed = not label or expectation['page'] in pages
+                message = f"Text '{label}' {'found' if passed else 'not found'} on page {expectation['page']}"
+            else:
+                passed = count > 0
+                message = f"Regex pattern '{label}' {'found %d matches' % count if passed else 'not found'}"
+
+            result = {
+                'expectation': expectation,
+                'passed': passed,
+                'count': count,
+                'pages': pages,
+                'message': message,
             }
+            if check_type == 'regex':
+                result['matches'] = regex_matches[position]
+            results.append(result)
+
+        report = {
+            'pdf': str(pdf_path),
+            'passed': all(result['passed'] for result in results),
+            'results': results,
+        }
+        logger.info(f"Evaluated {len(results)} expectations against PDF {pdf_path}: "
+                    f"{sum(result['passed'] for result in results)} passed")
+        return report
 
-            matches.append(match_info)
-            start_pos = pos + 1
+    @staticmethod
+    def assert_expectations(pdf_path: Union[str, Path], expectations: List[dict]) -> dict:
+        report = PDFAssert.check_expectations(pdf_path, expectations)
 
-        logger.info(f"Found {len(matches)} occurrences of '{search_text}' in PDF: {pdf_path}")
-        return matches
\ No newline at end of file
+        if report['passed']:
+            return report
+        else:
+            failures = [result['message'] for result in report['results'] if not result['passed']]
+            error_msg = f"{len(failures)} of {len(report['results'])} expectations failed for PDF: {pdf_path}\n  - " + "\n  - ".join(failures)
+            logger.error(error_msg)
+            raise AssertionError(error_msg)
@@ -0,0 +1,252 @@
+import PyPDF2
+import atexit
+import io
+import itertools
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_workers = 0
+_executor_lock = threading.Lock()
+
+
+_extraction_ids = itertools.count()
+
+# In a worker process: (extraction id, reader) of the extraction it last worked on, so the several
+# chunks of one extract_all() call that a worker receives parse the file once
+_worker_reader: Optional[tuple] = None
+
+
+def _extract_page_range(pdf_path: str, extraction_id: int, page_indexes: List[int]) -> List[str]:
+    # Runs in a worker process, so it parses its own reader instead of pickling one across.
+    global _worker_reader
+    if _worker_reader is None or _worker_reader[0] != extraction_id:
+        _worker_reader = None  # let the previous document go before parsing the next one
+        with open(pdf_path, 'rb') as file:
+            _worker_reader = (extraction_id, PyPDF2.PdfReader(io.BytesIO(file.read())))
+    reader = _worker_reader[1]
+    return [reader.pages[page_index].extract_text() for page_index in page_indexes]
+
+
+def _get_executor(workers: int) -> ProcessPoolExecutor:
+    """Return a process pool of the requested size, reused across documents to avoid start-up cost."""
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is None or _executor_workers != workers:
+            if _executor is not None:
+                _executor.shutdown(wait=True)
+            _executor = ProcessPoolExecutor(max_workers=workers)
+            _executor_workers = workers
+        return _executor
+
+
+def shutdown_executor() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
+
+
+atexit.register(shutdown_executor)
+
+
+class CachedPDF:
+    """
+    A parsed PDF document held by PDFDocumentCache.
+    The reader is built on first use and page text is extracted lazily, one page at a time.
+    """
+
+    def __init__(self, pdf_path: Path, key: tuple):
+        self.path = pdf_path
+        self.key = key
+        self._reader = None
+        self._pages: Optional[List[Optional[str]]] = None
+        self._missing = 0
+        self._metadata: Optional[dict] = None
+        self._lock = threading.Lock()
+        self.store_checked = False
+        # Content hash to save under once every page has been extracted, set on a text store miss
+        self.store_pending: Optional[str] = None
+        # Optional search index, built on demand by PDFAssert.get_index()
+        self.index = None
+
+    def load_pages(self, pages: List[str], metadata: dict) -> None:
+        """Fill the document from previously extracted text, so the PDF never has to be parsed."""
+        self._pages = list(pages)
+        self._missing = 0
+        self._metadata = dict(metadata)
+
+    @property
+    def reader(self) -> PyPDF2.PdfReader:
+        if self._reader is None:
+            # PdfReader resolves objects lazily from its stream, so keep the bytes in
+            # memory rather than holding a file handle open for the life of the entry.
+            self._reader = PyPDF2.PdfReader(io.BytesIO(self.path.read_bytes()))
+            logger.debug(f"Parsed PDF into cache: {self.path}")
+        return self._reader
+
+    @property
+    def page_count(self) -> int:
+        if self._pages is None:
+            self._pages = [None] * len(self.reader.pages)
+            self._missing = len(self._pages)
+        return len(self._pages)
+
+    @property
+    def complete(self) -> bool:
+        """Whether the text of every page is cached."""
+        return self._pages is not None and self._missing == 0
+
+    def page_text(self, page_index: int, keep: bool = True) -> str:
+        """
+        Return the raw extracted text of a 0-based page, extracting it on first access.
+        With keep=False a page that is not cached yet is extracted without being stored.
+        """
+        if page_index < 0 or page_index >= self.page_count:
+            raise IndexError(f"Page index {page_index} out of range for {self.page_count} pages")
+
+        text = self._pages[page_index]
+        if text is None:
+            with self._lock:
+                text = self._pages[page_index]
+                if text is None:
+                    text = self.reader.pages[page_index].extract_text()
+                    if keep:
+                        self._pages[page_index] = text
+                        self._missing -= 1
+        return text
+
+    def extract_all(self, workers: int = 1) -> List[str]:
+        """
+        Extract every page not cached yet and return the text of all pages in page order.
+        With workers > 1 the missing pages are split into contiguous ranges across a process pool, each
+        worker parsing the document once for all its ranges; the result is identical to extracting serially.
+        """
+        missing = [page_index for page_index in range(self.page_count) if self._pages[page_index] is None]
+
+        if workers > 1 and len(missing) > 1:
+            workers = min(workers, len(missing))
+            # A few ranges per worker keeps the pool busy when some pages are much heavier than others
+            chunk_size = max(1, -(-len(missing) // (workers * 4)))
+            chunks = [missing[start:start + chunk_size] for start in range(0, len(missing), chunk_size)]
+
+            executor = _get_executor(workers)
+            results = executor.map(_extract_page_range, [str(self.path)] * len(chunks),
+                                   [next(_extraction_ids)] * len(chunks), chunks)
+            for chunk, texts in zip(chunks, results):
+                with self._lock:
+                    for page_index, text in zip(chunk, texts):
+                        if self._pages[page_index] is None:
+                            self._pages[page_index] = text
+                            self._missing -= 1
+            logger.debug(f"Extracted {len(missing)} pages of {self.path} with {workers} worker processes")
+
+        return [self.page_text(page_index) for page_index in range(self.page_count)]
+
+    @property
+    def metadata(self) -> dict:
+        if self._metadata is None:
+            metadata = {}
+            if self.reader.metadata:
+                for key, value in self.reader.metadata.items():
+                    # Remove the leading slash from metadata keys
+                    metadata[key.lstrip('/')] = value
+            self._metadata = metadata
+        return dict(self._metadata)
+
+    @property
+    def estimated_size(self) -> int:
+        # The reader's object graph is roughly proportional to the file size,
+        # extracted text is counted as it is filled in.
+        size = self.key[2] if self._reader is not None else 0
+        if self._pages:
+            size += sum(len(text) for text in self._pages if text is not None)
+        if self.index is not None:
+            size += self.index.estimated_size
+        return size
+
+
+class PDFDocumentCache:
+    """
+    Bounded LRU cache of parsed PDF documents keyed by resolved path, mtime and size.
+    Entries are evicted least recently used first once either max_entries or max_bytes is exceeded.
+    """
+
+    def __init__(self, max_entries: int = 32, max_bytes: int = 256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, CachedPDF]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _make_key(pdf_path: Path) -> tuple:
+        stat = pdf_path.stat()
+        return (str(pdf_path.resolve()), stat.st_mtime_ns, stat.st_size)
+
+    def get(self, pdf_path: Union[str, Path]) -> CachedPDF:
+        pdf_path = Path(pdf_path)
+        key = self._make_key(pdf_path)
+
+        with self._lock:
+            document = self._entries.get(key[0])
+            if document is not None and document.key == key:
+                self._entries.move_to_end(key[0])
+                self.hits += 1
+                self._evict()
+                return document
+
+            if document is not None:
+                logger.info(f"PDF changed on disk, dropping cached copy: {pdf_path}")
+
+            self.misses += 1
+            document = CachedPDF(pdf_path, key)
+            self._entries[key[0]] = document
+            self._evict()
+            return document
+
+    def invalidate(self, pdf_path: Optional[Union[str, Path]] = None) -> None:
+        """Drop one document from the cache, or everything when no path is given."""
+        with self._lock:
+            if pdf_path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(str(Path(pdf_path).resolve()), None)
+
+    def _evict(self) -> None:
+        # The most recently used entry is never evicted, even if it alone is over budget.
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries or self.total_size > self.max_bytes
+        ):
+            path, _ = self._entries.popitem(last=False)
+            self.evictions += 1
+            logger.debug(f"Evicted PDF from cache: {path}")
+
+    @property
+    def total_size(self) -> int:
+        return sum(document.estimated_size for document in self._entries.values())
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'estimated_bytes': self.total_size,
+            }
+
+    def reset_stats(self) -> None:
+        self.hits = self.misses = self.evictions = 0
+
+
+document_cache = PDFDocumentCache()
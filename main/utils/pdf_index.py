@@ -0,0 +1,124 @@
+import bisect
+import re
+from array import array
+from typing import Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+class PDFTextIndex:
+    """
+    Positional inverted index over the text of a PDF.
+
+    Every token is normalized to lower case and recorded with its global offset, page and line, so term
+    and phrase lookups only touch the postings of the query's rarest token instead of scanning the text.
+    Matches are whole-word: "port" finds "port" but not "important".
+    """
+
+    def __init__(self, pages: List[str]):
+        self.text = "\n".join(pages)
+        self.page_starts: List[int] = []
+        self._term_ids: Dict[str, int] = {}
+        self._postings: List[array] = []
+        self._token_terms = array('I')
+        self._token_starts = array('I')
+        self._token_ends = array('I')
+        self._token_pages = array('I')
+        self._token_lines = array('I')
+
+        offset = 0
+        for page_number, page_text in enumerate(pages, 1):
+            self.page_starts.append(offset)
+            line = 1
+            last_position = 0
+            for token in TOKEN_PATTERN.finditer(page_text):
+                line += page_text.count("\n", last_position, token.start())
+                last_position = token.start()
+
+                term = token.group().lower()
+                term_id = self._term_ids.get(term)
+                if term_id is None:
+                    term_id = self._term_ids[term] = len(self._postings)
+                    self._postings.append(array('I'))
+
+                self._postings[term_id].append(len(self._token_terms))
+                self._token_terms.append(term_id)
+                self._token_starts.append(offset + token.start())
+                self._token_ends.append(offset + token.end())
+                self._token_pages.append(page_number)
+                self._token_lines.append(line)
+            offset += len(page_text) + 1
+
+        logger.debug(f"Indexed {len(self._token_terms)} tokens, {len(self._term_ids)} distinct terms")
+
+    @property
+    def token_count(self) -> int:
+        return len(self._token_terms)
+
+    @property
+    def estimated_size(self) -> int:
+        return len(self.text) + self.token_count * 6 * self._token_terms.itemsize
+
+    def search(self, search_text: str, context_chars: int = 50, case_sensitive: bool = True,
+               max_matches: Optional[int] = None) -> List[dict]:
+        """
+        Find whole-word occurrences of a term or phrase. Results carry the same keys as
+        PDFAssert.search_text_with_context plus the 1-based 'line' within the page.
+        """
+        query_tokens = list(TOKEN_PATTERN.finditer(search_text))
+        if not query_tokens:
+            return []
+
+        term_ids = []
+        for token in query_tokens:
+            term_id = self._term_ids.get(token.group().lower())
+            if term_id is None:
+                return []
+            term_ids.append(term_id)
+
+        # Characters before the first and after the last query token must also match around the hit
+        prefix_length = query_tokens[0].start()
+        suffix_length = len(search_text) - query_tokens[-1].end()
+        expected = search_text if case_sensitive else search_text.lower()
+
+        # Drive the lookup from the rarest token of the phrase
+        anchor = min(range(len(term_ids)), key=lambda position: len(self._postings[term_ids[position]]))
+        token_total = len(self._token_terms)
+
+        matches = []
+        for anchor_token in self._postings[term_ids[anchor]]:
+            first_token = anchor_token - anchor
+            last_token = first_token + len(term_ids) - 1
+            if first_token < 0 or last_token >= token_total:
+                continue
+            if any(self._token_terms[first_token + position] != term_id for position, term_id in enumerate(term_ids)):
+                continue
+
+            pos = self._token_starts[first_token] - prefix_length
+            end = self._token_ends[last_token] + suffix_length
+            if pos < 0 or end > len(self.text):
+                continue
+            matched_text = self.text[pos:end]
+            if (matched_text if case_sensitive else matched_text.lower()) != expected:
+                continue
+
+            page_index = bisect.bisect_right(self.page_starts, pos) - 1
+            context_start = max(0, pos - context_chars)
+            context_end = min(len(self.text), end + context_chars)
+            matches.append({
+                'position': pos,
+                'page': page_index + 1,
+                'page_position': pos - self.page_starts[page_index],
+                'line': self._token_lines[first_token],
+                'matched_text': matched_text,
+                'context': self.text[context_start:context_end],
+                'context_start': context_start,
+                'context_end': context_end
+            })
+            if max_matches is not None and len(matches) >= max_matches:
+                break
+
+        return matches
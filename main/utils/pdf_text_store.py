@@ -0,0 +1,102 @@
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import List, Optional, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_STORE_DIR = PROJECT_ROOT / ".pdf_text_store"
+FORMAT_VERSION = 1
+
+
+class PDFTextStore:
+    """
+    Disk-backed store of extracted PDF page text and metadata, keyed by the SHA-256 of the file content.
+
+    Entries are written to a temporary file and moved into place with os.replace, so concurrent readers
+    (e.g. several xdist workers) only ever see complete entries. A changed document hashes to a new key,
+    so stale text is never served.
+    """
+
+    def __init__(self, root: Union[str, Path] = DEFAULT_STORE_DIR):
+        self.root = Path(root)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def content_hash(pdf_path: Union[str, Path]) -> str:
+        digest = hashlib.sha256()
+        with open(pdf_path, 'rb') as file:
+            for block in iter(lambda: file.read(1024 * 1024), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _entry_path(self, content_hash: str) -> Path:
+        return self.root / f"{content_hash}.json"
+
+    def load(self, content_hash: str) -> Optional[dict]:
+        try:
+            with open(self._entry_path(content_hash), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable PDF text store entry {content_hash}: {str(e)}")
+            self.misses += 1
+            return None
+
+        if entry.get('version') != FORMAT_VERSION or entry.get('hash') != content_hash:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry
+
+    def save(self, content_hash: str, pages: List[str], metadata: dict) -> None:
+        entry = {
+            'version': FORMAT_VERSION,
+            'hash': content_hash,
+            'pages': pages,
+            # Metadata values are PyPDF2 objects, store their text form
+            'metadata': {key: str(value) for key, value in metadata.items()},
+        }
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.root, prefix=f".{content_hash[:16]}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self._entry_path(content_hash))
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+
+        logger.debug(f"Stored extracted text for PDF content {content_hash}")
+
+    def clear(self) -> None:
+        if self.root.exists():
+            for entry_path in self.root.glob("*.json"):
+                entry_path.unlink(missing_ok=True)
+
+
+def default_store() -> Optional[PDFTextStore]:
+    """
+    Build the store used by PDFAssert. PDF_TEXT_STORE overrides the directory,
+    setting it to an empty value, "0" or "off" disables the store.
+    """
+    location = os.environ.get("PDF_TEXT_STORE")
+    if location is None:
+        return PDFTextStore()
+    if location.strip().lower() in ("", "0", "off", "false", "none"):
+        return None
+    return PDFTextStore(location)
@@ -0,0 +1,163 @@
+import ast
+import functools
+import inspect
+import json
+import math
+import re
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+import logging
+from main.utils.artifact_registry import current_nodeid
+
+logger = logging.getLogger(__name__)
+
+_LOCATOR_SELECTOR = re.compile(r" selector=(.*)>$")
+
+
+def describe_target(target) -> str:
+    """Short description of what a step acts on: the selector of a Locator, or the value itself."""
+    if isinstance(target, str):
+        return target
+    match = _LOCATOR_SELECTOR.search(repr(target))
+    if match:
+        try:
+            return ast.literal_eval(match.group(1))
+        except (ValueError, SyntaxError):
+            return match.group(1)
+    return type(target).__name__
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    # Nearest-rank percentile
+    index = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+class StepTimer:
+    """
+    Records the duration (time.perf_counter), target and outcome of every step decorated with timed_step.
+
+    Disabled by default: a decorated call then costs one attribute check. Records are kept per process;
+    save() writes them as JSON so the xdist controller can merge every worker's file with load_all().
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.records: List[dict] = []
+
+    def record(self, step: str, target: Optional[str], duration: float, outcome: str) -> None:
+        self.records.append({
+            "test": current_nodeid(),
+            "step": step,
+            "target": target,
+            "duration_ms": round(duration * 1000, 3),
+            "outcome": outcome,
+        })
+
+    def save(self, file_path: Union[str, Path]) -> None:
+        file_path = Path(file_path)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(file_path, 'w') as f:
+            json.dump(self.records, f)
+
+    @staticmethod
+    def load_all(directory: Union[str, Path]) -> List[dict]:
+        records = []
+        for file_path in sorted(Path(directory).glob("*.json")):
+            with open(file_path, 'r') as f:
+                records.extend(json.load(f))
+        return records
+
+    @staticmethod
+    def summarize(records: List[dict], top: int = 15) -> Dict[str, List[dict]]:
+        """p50/p95/max tables (ms) of the slowest steps and targets by p95, and of the tests with the most step time."""
+        def table(key: Callable[[dict], Optional[str]], sort_by: str = "p95_ms"):
+            groups = defaultdict(list)
+            failures = defaultdict(int)
+            for record in records:
+                name = key(record)
+                if name is None:
+                    continue
+                groups[name].append(record["duration_ms"])
+                failures[name] += record["outcome"] != "passed"
+            rows = []
+            for name, durations in groups.items():
+                durations.sort()
+                rows.append({
+                    "name": name,
+                    "count": len(durations),
+                    "failures": failures[name],
+                    "p50_ms": _percentile(durations, 0.50),
+                    "p95_ms": _percentile(durations, 0.95),
+                    "max_ms": durations[-1],
+                    "total_ms": round(sum(durations), 3),
+                })
+            rows.sort(key=lambda row: row[sort_by], reverse=True)
+            return rows[:top]
+
+        return {
+            "steps": table(lambda record: record["step"]),
+            "targets": table(lambda record: f"{record['step']} {record['target']}" if record["target"] else None),
+            "tests": table(lambda record: record["test"], sort_by="total_ms"),
+        }
+
+
+step_timer = StepTimer()
+
+
+def timed_step(func=None, *, name: Optional[str] = None, target_arg: Optional[int] = 0):
+    """
+    Time a method, or a coroutine method, with the session's step timer when it is enabled.
+
+    name:       step name, defaults to Class.method
+    target_arg: index of the positional argument (after self) describing what the step acts on, or None
+    """
+    def decorate(func):
+        step = name or func.__qualname__
+
+        def record(args, start, outcome):
+            duration = time.perf_counter() - start
+            target = describe_target(args[target_arg]) if target_arg is not None and len(args) > target_arg else None
+            step_timer.record(step, target, duration, outcome)
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(self, *args, **kwargs):
+                if not step_timer.enabled:
+                    return await func(self, *args, **kwargs)
+                outcome = "failed"
+                start = time.perf_counter()
+                try:
+                    result = await func(self, *args, **kwargs)
+                    outcome = "passed"
+                    return result
+                finally:
+                    record(args, start, outcome)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            if not step_timer.enabled:
+                return func(self, *args, **kwargs)
+            outcome = "failed"
+            start = time.perf_counter()
+            try:
+                result = func(self, *args, **kwargs)
+                outcome = "passed"
+                return result
+            finally:
+                record(args, start, outcome)
+
+        return wrapper
+
+    return decorate(func) if func is not None else decorate
+
+
+def format_table(title: str, rows: List[dict]) -> List[str]:
+    lines = [title, f"{'p50 ms':>10} {'p95 ms':>10} {'max ms':>10} {'count':>6} {'fail':>5}  name"]
+    for row in rows:
+        lines.append(f"{row['p50_ms']:>10.1f} {row['p95_ms']:>10.1f} {row['max_ms']:>10.1f} {row['count']:>6} {row['failures']:>5}  {row['name']}")
+    return lines
@@ -0,0 +1,61 @@
+import re
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+
+class MultiPatternMatcher:
+    """
+    Finds every occurrence of many literal patterns in one scan of the text.
+
+    Candidate start positions come from a single compiled lookahead alternation, so the scan runs
+    inside the regex engine instead of a Python loop per character. Patterns that share a start
+    position (e.g. "Report" and "Report Date") are all reported, overlapping matches included.
+
+    The matcher can be fed a document in chunks (one PDF page at a time) through feed(); matches that
+    straddle two chunks are found because the tail of the previous chunk is carried over.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = list(patterns)
+        literals = sorted({pattern for pattern in self.patterns if pattern}, key=len, reverse=True)
+
+        self._by_first_char: Dict[str, List[Tuple[str, List[int]]]] = {}
+        for literal in literals:
+            indexes = [index for index, pattern in enumerate(self.patterns) if pattern == literal]
+            self._by_first_char.setdefault(literal[0], []).append((literal, indexes))
+
+        self._regex = re.compile("(?=(?:%s))" % "|".join(re.escape(literal) for literal in literals)) if literals else None
+        self._max_length = len(literals[0]) if literals else 0
+        self.reset()
+
+    def reset(self) -> None:
+        self._tail = ""
+        self._offset = 0
+
+    def find_all(self, text: str, start: int = 0) -> Iterator[Tuple[int, int]]:
+        """Yield (pattern_index, start_position) for every occurrence in text, in position order."""
+        if self._regex is None:
+            return
+        for candidate in self._regex.finditer(text, start):
+            position = candidate.start()
+            for literal, indexes in self._by_first_char.get(text[position], ()):
+                if text.startswith(literal, position):
+                    for index in indexes:
+                        yield index, position
+
+    def feed(self, chunk: str) -> Iterator[Tuple[int, int]]:
+        """
+        Scan the next chunk of a stream and yield (pattern_index, global_start) for each new match.
+        Global positions are offsets into the concatenation of every chunk fed since reset().
+        """
+        buffer = self._tail + chunk
+        buffer_start = self._offset - len(self._tail)
+        tail_length = len(self._tail)
+
+        for index, position in self.find_all(buffer):
+            # Matches that end inside the carried tail were already reported by the previous feed.
+            if position + len(self.patterns[index]) > tail_length:
+                yield index, buffer_start + position
+
+        self._offset += len(chunk)
+        keep = max(self._max_length - 1, 0)
+        self._tail = buffer[-keep:] if keep else ""
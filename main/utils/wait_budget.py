@@ -0,0 +1,116 @@
+import json
+import math
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+import logging
+from main.utils.json_journal import atomic_write_json, file_lock
+from main.utils.step_timer import describe_target
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+HISTORY_PATH = PROJECT_ROOT / "reports" / "latency_history.json"
+
+
+class BudgetExceeded(AssertionError):
+    pass
+
+
+class WaitBudget:
+    """
+    Per-step timeouts learned from the latency each step showed in earlier runs.
+
+    Successful durations are kept per step key ("<action> <locator>"); once a key has min_samples samples its
+    budget is p99 x factor, clamped to [min_ms, max_ms]. Steps without enough history get no budget and
+    fall back to the page's default timeout. Each process records new samples in memory and save() merges
+    them into the history file under a file lock, keeping the latest `window` samples per key.
+    """
+
+    def __init__(self, path: Union[str, Path] = HISTORY_PATH, factor: float = 3.0, min_ms: int = 1000,
+                 max_ms: Optional[int] = None, min_samples: int = 5, window: int = 100):
+        self.path = Path(path)
+        self.factor = factor
+        self.min_ms = min_ms
+        self.max_ms = max_ms
+        self.min_samples = min_samples
+        self.window = window
+        self.enabled = False
+        self._history: Dict[str, List[float]] = {}
+        self._new_samples: Dict[str, List[float]] = defaultdict(list)
+        self._budgets: Dict[str, Optional[int]] = {}
+
+    def enable(self, factor: Optional[float] = None, min_ms: Optional[int] = None, max_ms: Optional[int] = None) -> None:
+        """Turn budgets on for this process and load the history recorded so far."""
+        if factor is not None:
+            self.factor = factor
+        if min_ms is not None:
+            self.min_ms = min_ms
+        if max_ms is not None:
+            self.max_ms = max_ms
+        self.enabled = True
+        self._history = self._read()
+        self._budgets.clear()
+
+    def _read(self) -> Dict[str, List[float]]:
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    @staticmethod
+    def key(action: str, target) -> str:
+        return f"{action} {describe_target(target)}"
+
+    def p99(self, key: str) -> Optional[float]:
+        samples = self._history.get(key)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[max(0, math.ceil(0.99 * len(ordered)) - 1)]
+
+    def budget(self, key: str) -> Optional[int]:
+        """Timeout in ms for the step, or None to use the default timeout."""
+        if not self.enabled:
+            return None
+        if key not in self._budgets:
+            p99 = self.p99(key)
+            if p99 is None:
+                self._budgets[key] = None
+            else:
+                budget = max(self.min_ms, int(p99 * self.factor))
+                self._budgets[key] = min(budget, self.max_ms) if self.max_ms else budget
+        return self._budgets[key]
+
+    def observe(self, key: str, started: float) -> None:
+        """Record a successful step that started at time.perf_counter() value `started`."""
+        if self.enabled:
+            self._new_samples[key].append(round((time.perf_counter() - started) * 1000, 1))
+
+    def exceeded(self, key: str, budget: Optional[int], error: Exception) -> Exception:
+        """The error to raise when a step timed out: explains the learned budget, or the original error without one."""
+        if budget is None:
+            return error
+        samples = self._history.get(key, [])
+        return BudgetExceeded(
+            f"'{key}' did not finish within its learned budget of {budget} ms "
+            f"(p99 {self.p99(key):.0f} ms x {self.factor} over {len(samples)} earlier runs): {error}"
+        )
+
+    def save(self) -> None:
+        """Merge this process's samples into the history file."""
+        if not self._new_samples:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with file_lock(self.path):
+            history = self._read()
+            for key, samples in self._new_samples.items():
+                history[key] = (history.get(key, []) + samples)[-self.window:]
+            atomic_write_json(self.path, history, indent=None)
+        logger.info(f"Saved latency samples for {len(self._new_samples)} steps to {self.path}")
+        self._new_samples.clear()
+
+
+wait_budget = WaitBudget()
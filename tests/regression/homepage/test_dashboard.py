@@ -1,4 +1,5 @@
 import pytest
+from main.utils.data_provider import data_provider
 
 
 @pytest.mark.practice
@@ -14,42 +15,14 @@ def test_verify_dashboard_s(pageManager):
     pageManager.dashboard.click_button_get_in_touch
 
 @pytest.mark.practice
-@pytest.mark.parametrize(
-    "name,email,phone,org,role,department,message",
-    [
-        ("Jane Doe", "janedoe@gmail.com", "09187777776", "doers.org", "quality assurance", "Data", "ultra long message"),
-        ("John Smith", "johnsmith@example.com", "09998887766", "testers.com", "developer", "Cloud", "short message")
-    ]
-)
+@data_provider("main/resources/dashboard_form_data.json", "name,email,phone,org,role,department,message", id_column="name")
 def test_verify_dashboard_parameterize(pageManager, name, email, phone, org, role, department, message):
     pageManager.dashboard.verify_dashboard()
     pageManager.dashboard.fill_form(name, email, phone, org, role, department, message)
     pageManager.dashboard.click_button_get_in_touch()
 
 
-@pytest.mark.parametrize(
-    "form_data",
-    [
-        {
-            "name": "Jane Doe",
-            "email": "janedoe@gmail.com",
-            "phone": "09187777776",
-            "org": "doers.org",
-            "role": "quality assurance",
-            "department": "Data",
-            "message": "ultra long message"
-        },
-        {
-            "name": "John Smith",
-            "email": "johnsmith@example.com",
-            "phone": "09998887766",
-            "org": "testers.com",
-            "role": "developer",
-            "department": "Cloud",
-            "message": "short message"
-        }
-    ]
-)
+@data_provider("main/resources/dashboard_form_data.json", "form_data", id_column="name")
 def test_verify_dashboard_parameterize_2(pageManager, form_data):
     pageManager.dashboard.verify_dashboard()
     pageManager.dashboard.fill_form(
@@ -59,6 +32,7 @@ def test_verify_dashboard_parameterize_2(pageManager, form_data):
         form_data["org"],
         form_data["role"],
         form_data["department"],
-        form_data["message"]
+        form_data["message"],
+        batched=True
     )
     pageManager.dashboard.click_button_get_in_touch()
\ No newline at end of file
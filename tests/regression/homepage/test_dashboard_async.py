@@ -0,0 +1,21 @@
+import asyncio
+import pytest
+from main.fixtures.asyncPageManager import AsyncPageManager
+
+
+@pytest.mark.practice
+@pytest.mark.asyncio(loop_scope="session")
+async def test_verify_dashboard_privacy_notice_async(asyncPageManager):
+    privacy_page = await asyncPageManager.dashboard.privacy_policy_link()
+    assert privacy_page is not None
+
+
+@pytest.mark.practice
+@pytest.mark.asyncio(loop_scope="session")
+async def test_fill_forms_concurrently(async_page_factory, settings):
+    pages = await asyncio.gather(async_page_factory(), async_page_factory())
+    first, second = (AsyncPageManager(page, settings) for page in pages)
+    await asyncio.gather(
+        first.dashboard.fill_form("Jane Doe", "janedoe@gmail.com", "09187777776", "doers.org", "quality assurance", "Data", "ultra long message"),
+        second.dashboard.fill_form("John Smith", "johnsmith@example.com", "09998887766", "testers.com", "developer", "Cloud", "short message"),
+    )
@@ -0,0 +1,251 @@
+from types import SimpleNamespace
+import pytest
+
+
+def _awaitable(method):
+    """The async API version of a recording method: same call, awaited."""
+    async def wrapper(self, *args, **kwargs):
+        return method(self, *args, **kwargs)
+    return wrapper
+
+
+class Request:
+    def __init__(self, url, resource_type="document", method="GET"):
+        self.url = url
+        self.resource_type = resource_type
+        self.method = method
+
+
+class Route:
+    """Route stand-in; outcome is how the handler finished it."""
+
+    def __init__(self, url, resource_type="document", method="GET"):
+        self.request = Request(url, resource_type, method)
+        self.outcome = None
+
+    def fallback(self):
+        self.outcome = "fallback"
+
+    def continue_(self):
+        self.outcome = "continue"
+
+    def abort(self, error_code="failed"):
+        self.outcome = error_code
+
+
+class AsyncRoute(Route):
+    fallback = _awaitable(Route.fallback)
+    continue_ = _awaitable(Route.continue_)
+    abort = _awaitable(Route.abort)
+
+
+class Response:
+    def __init__(self, url, status=200):
+        self.url = url
+        self.status = status
+        self.ok = 200 <= status < 300
+
+
+class Locator:
+    """Locator stand-in that records the Playwright calls made on it; evaluate returns the element's tag."""
+
+    def __init__(self, calls, selector, tag="INPUT"):
+        self.calls = calls
+        self.selector = selector
+        self.tag = tag
+
+    def locator(self, selector):
+        return type(self)(self.calls, f"{self.selector} >> {selector}")
+
+    def get_by_role(self, role, name):
+        return type(self)(self.calls, f"{self.selector} >> role={role}[name={name}]")
+
+    def click(self, timeout=None):
+        self.calls.append(("click", self.selector))
+
+    def wait_for(self, state="visible", timeout=None):
+        self.calls.append(("wait_for", self.selector))
+
+    def evaluate(self, script):
+        self.calls.append(("evaluate", self.selector))
+        return self.tag
+
+    def fill(self, value, timeout=None):
+        self.calls.append(("fill", self.selector, value))
+
+    def select_option(self, value, timeout=None):
+        self.calls.append(("select_option", self.selector, value))
+
+    def set_checked(self, value, timeout=None):
+        self.calls.append(("set_checked", self.selector, value))
+
+    def press_sequentially(self, value, timeout=None):
+        self.calls.append(("press_sequentially", self.selector, value))
+
+
+class AsyncLocator(Locator):
+    click = _awaitable(Locator.click)
+    wait_for = _awaitable(Locator.wait_for)
+    evaluate = _awaitable(Locator.evaluate)
+    fill = _awaitable(Locator.fill)
+    select_option = _awaitable(Locator.select_option)
+    set_checked = _awaitable(Locator.set_checked)
+    press_sequentially = _awaitable(Locator.press_sequentially)
+
+
+class Page:
+    """
+    Page stand-in. Calls are recorded in its context's list, or its own without a context; page.evaluate
+    returns evaluate_result and goto answers with the given status.
+    """
+
+    locator_class = Locator
+
+    def __init__(self, context=None, status=200, evaluate_result=None):
+        self.context = context
+        self.calls = context.calls if context is not None else []
+        self.status = status
+        self.evaluate_result = evaluate_result
+        self.visited = []
+        self.closed = False
+
+    def goto(self, url, timeout=None):
+        self.calls.append(("goto", url))
+        self.visited.append(url)
+        return Response(url, self.status)
+
+    def evaluate(self, script, arg=None):
+        self.calls.append(("evaluate", script, arg))
+        return self.evaluate_result
+
+    def locator(self, selector):
+        return self.locator_class(self.calls, selector)
+
+    def get_by_role(self, role, name):
+        return self.locator_class(self.calls, f"role={role}[name={name}]")
+
+    def close(self):
+        self.closed = True
+        if self.context is not None:
+            self.context.pages.remove(self)
+
+
+class AsyncPage(Page):
+    locator_class = AsyncLocator
+    goto = _awaitable(Page.goto)
+    evaluate = _awaitable(Page.evaluate)
+    close = _awaitable(Page.close)
+
+
+class Tracing:
+    """Records the tracing calls a context receives; saved chunks are written as small files."""
+
+    def __init__(self, calls):
+        self.calls = calls
+
+    def start(self, **options):
+        self.calls.append(("start", options["screenshots"], options["snapshots"]))
+
+    def stop(self):
+        self.calls.append(("stop",))
+
+    def start_chunk(self, title=None):
+        self.calls.append(("start_chunk", title))
+
+    def stop_chunk(self, path=None):
+        self.calls.append(("stop_chunk", path is not None))
+        if path:
+            with open(path, "wb") as f:
+                f.write(b"x" * 100)
+
+
+class AsyncTracing(Tracing):
+    start = _awaitable(Tracing.start)
+    stop = _awaitable(Tracing.stop)
+    start_chunk = _awaitable(Tracing.start_chunk)
+    stop_chunk = _awaitable(Tracing.stop_chunk)
+
+
+class Context:
+    """Browser context stand-in; leftover_origins are the origins its storage_state reports localStorage for."""
+
+    page_class = Page
+    tracing_class = Tracing
+
+    def __init__(self, leftover_origins=()):
+        self.pages = []
+        self.calls = []
+        self.listeners = []
+        self.routes = []
+        self.closed = False
+        self.leftover_origins = list(leftover_origins)
+        self.tracing = self.tracing_class(self.calls)
+
+    def new_page(self):
+        page = self.page_class(self)
+        self.pages.append(page)
+        return page
+
+    def on(self, event, handler):
+        self.listeners.append(event)
+
+    def route(self, pattern, handler):
+        self.calls.append(("route", pattern))
+        self.routes.append((pattern, handler))
+
+    def route_from_har(self, path, **options):
+        self.calls.append(("route_from_har", path.name, options))
+
+    def unroute_all(self):
+        self.calls.append(("unroute_all",))
+
+    def clear_cookies(self):
+        self.calls.append(("clear_cookies",))
+
+    def clear_permissions(self):
+        self.calls.append(("clear_permissions",))
+
+    def add_cookies(self, cookies):
+        self.calls.append(("add_cookies",))
+
+    def storage_state(self, path=None, indexed_db=False):
+        return {"cookies": [], "origins": [{"origin": origin, "localStorage": [{"name": "k", "value": "v"}]}
+                                           for origin in self.leftover_origins]}
+
+    def close(self):
+        self.closed = True
+
+
+class AsyncContext(Context):
+    page_class = AsyncPage
+    tracing_class = AsyncTracing
+    new_page = _awaitable(Context.new_page)
+    route = _awaitable(Context.route)
+    route_from_har = _awaitable(Context.route_from_har)
+    unroute_all = _awaitable(Context.unroute_all)
+    clear_cookies = _awaitable(Context.clear_cookies)
+    clear_permissions = _awaitable(Context.clear_permissions)
+    add_cookies = _awaitable(Context.add_cookies)
+    storage_state = _awaitable(Context.storage_state)
+    close = _awaitable(Context.close)
+
+
+class Browser:
+    def __init__(self, leftover_origins=()):
+        self.contexts = []
+        self.leftover_origins = leftover_origins
+
+    def new_context(self, **options):
+        context = Context(self.leftover_origins)
+        self.contexts.append(context)
+        return context
+
+
+@pytest.fixture
+def fakes():
+    """Recording stand-ins for the Playwright objects, for tests that run without a browser."""
+    return SimpleNamespace(
+        Request=Request, Route=Route, AsyncRoute=AsyncRoute, Response=Response,
+        Locator=Locator, AsyncLocator=AsyncLocator, Page=Page, AsyncPage=AsyncPage,
+        Tracing=Tracing, AsyncTracing=AsyncTracing, Context=Context, AsyncContext=AsyncContext, Browser=Browser,
+    )
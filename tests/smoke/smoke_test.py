@@ -14,8 +14,8 @@ def test_smoke2(pageManager):
 
 def test_smoke3(pageManager):
     # pageManager.page.pause()
-    pageManager.navigation.navigate_to_other_page("About")
-    pageManager.navigation.navigate_to_other_page("Contact")
+    pageManager.navigation.navigate_to_other_page("About", via="menu", screenshot=True)
+    pageManager.navigation.navigate_to_other_page("Contact", via="menu", screenshot=True)
 
 def test_smoke4(pageManager):
     pageManager.dashboard.verify_dashboard()
@@ -0,0 +1,36 @@
+import os
+import time
+from main.utils.artifact_registry import ArtifactRegistry, current_nodeid
+
+
+def test_artifacts_are_attached_to_their_test_once(tmp_path):
+    registry = ArtifactRegistry()
+    first = registry.store(b"same image", tmp_path / "first_result.png", kind="screenshot", nodeid="tests/a.py::test_a")
+    again = registry.store(b"same image", tmp_path / "again_result.png", kind="screenshot", nodeid="tests/a.py::test_a")
+    other = registry.store(b"same image", tmp_path / "other_result.png", kind="screenshot", nodeid="tests/a.py::test_b")
+
+    assert first == again == other
+    assert not (tmp_path / "again_result.png").exists()
+    assert [artifact.path for artifact in registry.pop("tests/a.py::test_a")] == [first]
+    assert registry.pop("tests/a.py::test_a") == []
+    assert registry.pop("tests/a.py::test_b")[0].mime_type == "image/png"
+
+
+def test_registers_against_the_running_test(tmp_path):
+    registry = ArtifactRegistry()
+    registry.store(b"log", tmp_path / "run.log")
+    assert [artifact.label for artifact in registry.pop(current_nodeid())] == ["run.log"]
+
+
+def test_cleanup_removes_only_expired_files(tmp_path):
+    old_file = tmp_path / "test_old" / "old_result.png"
+    new_file = tmp_path / "test_new" / "new_result.png"
+    for path in (old_file, new_file):
+        path.parent.mkdir()
+        path.write_bytes(b"png")
+    ten_days_ago = time.time() - 10 * 86400
+    os.utime(old_file, (ten_days_ago, ten_days_ago))
+
+    assert ArtifactRegistry.cleanup(tmp_path, max_age_days=7) == 1
+    assert not old_file.parent.exists()
+    assert new_file.exists()
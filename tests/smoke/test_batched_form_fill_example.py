@@ -0,0 +1,63 @@
+import asyncio
+from main.envi.settings import load_settings
+from main.fixtures.asyncBaseActions import AsyncBaseActions
+from main.fixtures.baseActions import BATCH_FILL_SCRIPT, BaseActions
+
+
+def test_css_fields_are_filled_in_one_round_trip(fakes):
+    page = fakes.Page(evaluate_result=[])
+    actions = BaseActions(page, load_settings("local"))
+    checkbox = fakes.Locator(page.calls, "privacy")
+
+    result = actions.fill_fields({"#name": "Jane", "#email": "jane@example.com", "#service": "Data", checkbox: True})
+
+    assert page.calls == [
+        ("evaluate", BATCH_FILL_SCRIPT, [["#name", "Jane"], ["#email", "jane@example.com"], ["#service", "Data"]]),
+        ("set_checked", "privacy", True),
+    ]
+    assert result == {"fields": 4, "batched": 3, "round_trips": 2, "round_trips_saved": 2}
+
+
+def test_unresolved_and_typed_fields_fall_back_to_locators(fakes):
+    page = fakes.Page(evaluate_result=["select[name='service']"])
+    actions = BaseActions(page, load_settings("local"))
+    service = fakes.Locator(page.calls, "service", tag="SELECT")
+
+    result = actions.fill_fields(
+        {"#name": "Jane", "select[name='service']": "Data", "#phone": "0918"},
+        fallbacks={"select[name='service']": service},
+        typed={"#phone"},
+    )
+
+    assert page.calls == [
+        ("evaluate", BATCH_FILL_SCRIPT, [["#name", "Jane"], ["select[name='service']", "Data"]]),
+        ("evaluate", "service"), ("select_option", "service", "Data"),
+        ("fill", "#phone", ""), ("press_sequentially", "#phone", "0918"),
+    ]
+    assert result["batched"] == 1
+    assert result["round_trips"] == 5
+
+
+def test_nothing_is_saved_when_no_field_batches(fakes):
+    page = fakes.Page(evaluate_result=["#name", "#email"])
+    actions = BaseActions(page, load_settings("local"))
+
+    result = actions.fill_fields({"#name": "Jane", "#email": "jane@example.com"})
+
+    assert result == {"fields": 2, "batched": 0, "round_trips": 5, "round_trips_saved": 0}
+
+
+def test_async_fill_makes_the_same_calls_as_sync(fakes):
+    fields = {"#name": "Jane", "select[name='service']": "Data", "#phone": "0918"}
+    sync_page = fakes.Page(evaluate_result=["select[name='service']"])
+    async_page = fakes.AsyncPage(evaluate_result=["select[name='service']"])
+
+    sync_result = BaseActions(sync_page, load_settings("local")).fill_fields(
+        fields, fallbacks={"select[name='service']": fakes.Locator(sync_page.calls, "service", tag="SELECT")},
+        typed={"#phone"})
+    async_result = asyncio.run(AsyncBaseActions(async_page, load_settings("local")).fill_fields(
+        fields, fallbacks={"select[name='service']": fakes.AsyncLocator(async_page.calls, "service", tag="SELECT")},
+        typed={"#phone"}))
+
+    assert async_page.calls == sync_page.calls
+    assert async_result == sync_result
@@ -0,0 +1,66 @@
+import pytest
+from main.envi.settings import load_settings
+from main.fixtures.contextPool import CLEAR_STORAGE_SCRIPT, ContextPool
+
+
+@pytest.fixture
+def settings():
+    return load_settings("local")
+
+
+def test_fresh_isolation_gives_every_test_a_new_context(fakes, settings):
+    browser = fakes.Browser()
+    setups = []
+    pool = ContextPool(browser, settings, isolation="fresh", context_setup=[setups.append])
+    pool.warm_up()
+    assert browser.contexts == []
+
+    first, page = pool.acquire()
+    pool.release(first, page)
+    second, _ = pool.acquire()
+    assert first is not second and first.closed
+    assert setups == [first, second]
+
+
+def test_reset_isolation_clears_state_and_replaces_the_tab(fakes, settings):
+    browser = fakes.Browser()
+    setups = []
+    pool = ContextPool(browser, settings, isolation="reset", context_setup=[setups.append])
+    pool.warm_up()
+    context, page = pool.acquire()
+    assert page.visited == [settings.base_url]
+
+    popup = context.new_page()
+    pool.release(context, page)
+    assert popup.closed and page.closed
+    assert context.calls == [
+        ("goto", settings.base_url), ("evaluate", CLEAR_STORAGE_SCRIPT, None),
+        ("unroute_all",), ("clear_cookies",), ("clear_permissions",),
+    ]
+    # Routes are installed again after unroute_all
+    assert setups == [context, context]
+
+    reused, blank_page = pool.acquire()
+    assert reused is context and not context.closed
+    assert blank_page is not page and blank_page.visited == []
+    assert pool.reused == 2
+
+
+def test_reset_discards_contexts_with_storage_of_other_origins(fakes, settings):
+    pool = ContextPool(fakes.Browser(leftover_origins=["https://tracker.example"]), settings, isolation="reset")
+    context, page = pool.acquire()
+    pool.release(context, page)
+    assert context.closed
+    assert pool.acquire()[0] is not context
+
+
+def test_shared_isolation_reuses_contexts_as_is(fakes, settings):
+    pool = ContextPool(fakes.Browser(), settings, isolation="shared")
+    context, page = pool.acquire()
+    pool.release(context, page)
+    assert pool.acquire() == (context, page)
+    assert context.calls == [("goto", settings.base_url)]
+
+    # Failed tests never hand their context back
+    pool.release(context, page, discard=True)
+    assert context.closed
@@ -0,0 +1,39 @@
+import os
+from main.utils import data_provider as data_provider_module
+from main.utils.data_provider import data_provider, load_cases
+from main.utils.excel_handler import ExcelHandler
+
+
+@data_provider("main/resources/dashboard_form_data.json", "name,email", id_column="name")
+def test_data_provider_maps_columns(name, email):
+    assert "@" in email
+    assert name
+
+
+def test_load_cases_reuses_cache_until_content_changes(tmp_path):
+    file_path = tmp_path / "cases.xlsx"
+    cache_dir = tmp_path / "cache"
+    ExcelHandler.write_excel(file_path, [["name", "department"], ["Jane Doe", "Data"]])
+
+    first = load_cases(file_path, cache_dir=cache_dir)
+    assert first == {'columns': ["name", "department"], 'rows': [("Jane Doe", "Data")]}
+    assert len(list(cache_dir.glob("*.pkl"))) == 1
+
+    # A touched but unchanged file is served from the cache
+    stat = file_path.stat()
+    os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert load_cases(file_path, cache_dir=cache_dir) == first
+
+    ExcelHandler.write_excel(file_path, [["name", "department"], ["John Smith", "Cloud"]])
+    assert load_cases(file_path, cache_dir=cache_dir)['rows'] == [("John Smith", "Cloud")]
+
+
+def test_unpicklable_cases_are_returned_uncached(tmp_path, monkeypatch):
+    file_path = tmp_path / "cases.json"
+    file_path.write_text("[]")
+    cache_dir = tmp_path / "cache"
+    unpicklable = {'columns': ["check"], 'rows': [(lambda: None,)]}
+    monkeypatch.setattr(data_provider_module, "_parse", lambda *args: unpicklable)
+
+    assert load_cases(file_path, cache_dir=cache_dir) is unpicklable
+    assert list(cache_dir.iterdir()) == []
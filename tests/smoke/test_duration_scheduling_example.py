@@ -0,0 +1,62 @@
+import json
+import os
+import pytest
+from types import SimpleNamespace
+from main.utils.duration_scheduling import (DurationHistory, auto_num_workers, modules_with_module_fixtures,
+                                            predict_makespan, scope_of)
+
+
+def test_classes_stay_together_and_functions_are_scheduled_alone():
+    assert scope_of("tests/smoke/test_pdf.py::TestPDFAssertions::test_page_count") == "tests/smoke/test_pdf.py::TestPDFAssertions"
+    assert scope_of("tests/regression/test_dashboard.py::test_form[Jane]") == "tests/regression/test_dashboard.py::test_form[Jane]"
+
+
+def test_modules_with_module_scoped_fixtures_stay_together():
+    grouped = {"tests/regression/test_shared.py"}
+    assert scope_of("tests/regression/test_shared.py::test_one", grouped) == "tests/regression/test_shared.py"
+    assert scope_of("tests/regression/test_shared.py::TestForm::test_two", grouped) == "tests/regression/test_shared.py"
+    assert scope_of("tests/regression/test_dashboard.py::test_form", grouped) == "tests/regression/test_dashboard.py::test_form"
+
+
+def test_modules_using_module_scoped_fixtures_are_found():
+    def item(nodeid, *scopes):
+        fixturedefs = {f"fixture_{index}": [SimpleNamespace(scope=scope)] for index, scope in enumerate(scopes)}
+        return SimpleNamespace(nodeid=nodeid, _fixtureinfo=SimpleNamespace(name2fixturedefs=fixturedefs))
+
+    items = [
+        item("tests/test_shared.py::test_one", "function", "module"),
+        item("tests/test_shared.py::test_two"),
+        item("tests/test_alone.py::TestForm::test_three", "class", "session"),
+    ]
+    assert modules_with_module_fixtures(items) == ["tests/test_shared.py"]
+
+
+def test_longest_first_prediction():
+    makespan, loads = predict_makespan([1, 7, 2, 3, 5], workers=2)
+    assert makespan == 9
+    assert loads == [9, 9]
+    assert predict_makespan([4, 4], workers=5)[0] == 4
+
+
+def test_durations_are_blended_and_unknown_tests_estimated(tmp_path):
+    path = tmp_path / "test_durations.json"
+    path.write_text(json.dumps({"a.py::test_slow": 10.0, "a.py::test_fast": 1.0, "a.py::test_mid": 3.0}))
+
+    history = DurationHistory(path)
+    assert history.estimate("a.py::test_new") == 3.0
+    history.add("a.py::test_slow", 0.5)
+    history.add("a.py::test_slow", 1.5)
+    history.add("a.py::test_new", 2.0)
+    history.save()
+
+    assert json.loads(path.read_text()) == {
+        "a.py::test_slow": 6.0, "a.py::test_fast": 1.0, "a.py::test_mid": 3.0, "a.py::test_new": 2.0,
+    }
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/meminfo"), reason="available memory is read from /proc/meminfo")
+def test_auto_num_workers_is_capped_by_memory(monkeypatch):
+    monkeypatch.setattr(os, "sched_getaffinity", lambda pid: set(range(64)), raising=False)
+    assert auto_num_workers(memory_per_worker=1) == 64
+    # No machine has room for one worker this size; there is still always one
+    assert auto_num_workers(memory_per_worker=2 ** 60) == 1
@@ -0,0 +1,57 @@
+import pytest
+from main.utils.excel_handler import ExcelHandler, ExcelStreamWriter
+
+
+class TestExcelHandler:
+
+    @pytest.fixture
+    def users_workbook(self, tmp_path):
+        file_path = tmp_path / "users.xlsx"
+        ExcelHandler.write_excel(file_path, [
+            ["name", "email", "department", "active"],
+            ["Jane Doe", "janedoe@gmail.com", "Data", True],
+            ["John Smith", "johnsmith@example.com", "Cloud", False],
+            ["Juan Cruz", "juancruz@example.com", "Data", True],
+        ], sheet_name="users")
+        return file_path
+
+    def test_iter_rows_maps_headers(self, users_workbook):
+        rows = list(ExcelHandler.iter_rows(users_workbook, "users", header_row=1))
+        assert len(rows) == 3
+        assert rows[0] == {"name": "Jane Doe", "email": "janedoe@gmail.com", "department": "Data", "active": True}
+
+    def test_iter_rows_projects_and_filters(self, users_workbook):
+        rows = ExcelHandler.iter_rows(
+            users_workbook, "users", header_row=1,
+            columns=["name", "department"], where=lambda row: row["department"] == "Data"
+        )
+        assert list(rows) == [{"name": "Jane Doe", "department": "Data"}, {"name": "Juan Cruz", "department": "Data"}]
+
+    def test_iter_rows_without_header(self, users_workbook):
+        rows = list(ExcelHandler.iter_rows(users_workbook, "users", columns=[0], min_row=2, max_row=3))
+        assert rows == [["Jane Doe"], ["John Smith"]]
+
+    def test_stream_writer_writes_generated_rows(self, tmp_path):
+        file_path = tmp_path / "results.xlsx"
+
+        with ExcelStreamWriter(file_path) as writer:
+            writer.add_sheet("results", headers=["test", "outcome"])
+            writer.write_rows(([f"test_{index}", "passed"] for index in range(1000)), sheet_name="results")
+            writer.write_row(["total", 1000], sheet_name="summary")
+
+        results = ExcelHandler.read_excel(file_path, "results")
+        assert len(results) == 1001
+        assert results[1] == ["test_0", "passed"]
+        assert ExcelHandler.read_excel(file_path, "summary") == [["total", 1000]]
+
+    def test_stream_writer_keeps_headers_and_rows_on_one_unnamed_sheet(self, tmp_path):
+        file_path = tmp_path / "results.xlsx"
+
+        with ExcelStreamWriter(file_path) as writer:
+            writer.add_sheet("results", headers=["test", "outcome"])
+            writer.write_rows([["a", 1]], headers=["name", "value"])
+            writer.write_rows([["b", 2]], headers=["name", "value"])
+
+        assert ExcelHandler.read_excel(file_path, "results") == [["test", "outcome"]]
+        assert ExcelHandler.read_excel(file_path, "Sheet") == [["name", "value"], ["a", 1]]
+        assert ExcelHandler.read_excel(file_path, "Sheet1") == [["name", "value"], ["b", 2]]
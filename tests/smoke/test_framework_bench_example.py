@@ -0,0 +1,32 @@
+from urllib.error import HTTPError
+from urllib.request import urlopen
+import pytest
+from benchmarks import standin_site
+from benchmarks.framework_overhead_bench import compare, measure
+
+
+def test_standin_site_serves_the_dashboard_form_and_routes():
+    server, base_url = standin_site.start(port=0)
+    try:
+        with urlopen(base_url) as response:
+            dashboard = response.read().decode()
+        assert "Fast forward to the future" in dashboard
+        assert "select name=\"service\"" in dashboard and "GET IN TOUCH" in dashboard
+        with urlopen(base_url + "services/") as response:
+            assert "Our Services" in response.read().decode()
+        with pytest.raises(HTTPError):
+            urlopen(base_url + "careers/")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_regressions_beyond_threshold_and_noise_are_reported():
+    result = measure(lambda: sum(range(1000)), reset=lambda: None, repeat=3)
+    assert result["cold_samples"] == 3 and result["warm_ms"] >= 0
+
+    baselines = {"json_io": {"cold_ms": 10.0, "warm_ms": 4.0, "peak_kib": 100.0}}
+    assert compare({"json_io": {"cold_ms": 11.0, "cold_samples": 1, "warm_ms": 5.0, "peak_kib": 120.0}}, baselines, 0.25) == []
+    regressions = compare({"json_io": {"cold_ms": 30.0, "cold_samples": 10, "warm_ms": 9.0, "peak_kib": 100.0},
+                           "new_case": {"cold_ms": 1.0, "warm_ms": 1.0, "peak_kib": 1.0}}, baselines, 0.25)
+    assert [regression.split(":")[0] for regression in regressions] == ["json_io cold_ms", "json_io warm_ms"]
@@ -0,0 +1,58 @@
+import asyncio
+import time
+from main.envi.settings import load_settings
+from main.fixtures.harArchive import HarArchives
+
+
+def test_archive_names_are_unique_per_test():
+    first = HarArchives.archive_name("tests/smoke/smoke_test.py::test_dashboard[case-1]")
+    second = HarArchives.archive_name("tests/regression/test_other.py::test_dashboard[case-1]")
+    assert first != second
+    assert first.startswith("test_dashboard_case-1_") and first.endswith(".zip")
+
+
+def test_stale_archives_are_reported(tmp_path):
+    archives = HarArchives(tmp_path, mode="record")
+    local = load_settings("local")
+    prod = load_settings("prod")
+
+    for nodeid in ("tests/a.py::test_fresh", "tests/a.py::test_other_site", "tests/a.py::test_deleted"):
+        archives.archive_path(nodeid).write_bytes(b"zip")
+        archives.recorded(nodeid, local)
+    archives.recorded("tests/a.py::test_old", prod)
+    archives.archive_path("tests/a.py::test_old").write_bytes(b"zip")
+    archives.index.append({HarArchives.archive_name("tests/a.py::test_old"): {
+        "nodeid": "tests/a.py::test_old", "environment": "local", "baseURL": local.base_url,
+        "recordedAt": time.time() - 40 * 86400,
+    }})
+    archives.discard("tests/a.py::test_deleted")
+
+    stale = archives.stale(max_age_days=30, base_url=local.base_url)
+    assert stale == {
+        HarArchives.archive_name("tests/a.py::test_deleted"): "missing",
+        HarArchives.archive_name("tests/a.py::test_old"): "older than 30 days",
+    }
+    assert archives.stale(base_url=prod.base_url)[HarArchives.archive_name("tests/a.py::test_fresh")] \
+        == f"recorded against {local.base_url}"
+
+
+def test_async_contexts_replay_and_share_the_misses(fakes, tmp_path):
+    archives = HarArchives(tmp_path, mode="replay")
+    nodeid = "tests/a.py::test_async"
+    archives.archive_path(nodeid).write_bytes(b"zip")
+    first, second = fakes.AsyncContext(), fakes.AsyncContext()
+    missing_url = "https://stratpoint.com/missing.js"
+
+    async def run():
+        await archives.attach_async(first, nodeid)
+        [(_, handler)] = first.routes
+        await handler(fakes.AsyncRoute(missing_url))
+        await archives.attach_async(second, nodeid, reset_misses=False)
+        route = fakes.AsyncRoute(missing_url)
+        [(_, handler)] = second.routes
+        await handler(route)
+        return route
+
+    assert asyncio.run(run()).outcome == "blockedbyclient"
+    assert second.calls == [("route", "**/*"), ("route_from_har", HarArchives.archive_name(nodeid), {"not_found": "fallback"})]
+    assert archives.misses == [f"GET {missing_url}"] * 2
@@ -0,0 +1,39 @@
+from pathlib import Path
+from main.utils.impact_selection import PROJECT_ROOT, CoverageRecorder, import_closure, is_affected, load_impact_map, needs_full_run
+
+DASHBOARD_TEST = PROJECT_ROOT / "tests" / "regression" / "homepage" / "test_dashboard_async.py"
+PDF_TEST = PROJECT_ROOT / "tests" / "smoke" / "test_pdf_assertions_example.py"
+
+
+def test_import_closure_follows_main_modules():
+    closure = import_closure(DASHBOARD_TEST)
+    assert "main/functions/asyncDashboard.py" in closure
+    # Reached only through asyncDashboard -> asyncBaseActions
+    assert "main/fixtures/baseActions.py" in closure
+    assert "conftest.py" not in closure
+
+
+def test_selection_by_imports_recorded_coverage_and_config_changes():
+    assert not is_affected(PDF_TEST, "pdf", {"main/pages/dashboard_page.py"}, {}, uses_shared_fixtures=False)
+    assert is_affected(PDF_TEST, "pdf", {"main/utils/pdf_assert.py"}, {}, uses_shared_fixtures=False)
+    # Without recorded coverage, conftest fixture users depend on all of main/
+    assert is_affected(PDF_TEST, "pdf", {"main/pages/dashboard_page.py"}, {}, uses_shared_fixtures=True)
+    assert not is_affected(PDF_TEST, "pdf", {"main/pages/dashboard_page.py"}, {"pdf": ["main/utils/pdf_assert.py"]},
+                           uses_shared_fixtures=True)
+
+    assert needs_full_run({"main/pages/dashboard_page.py", "pytest.ini"}) == "pytest.ini"
+    assert needs_full_run({"main/envi/urls.json"}) == "main/envi/urls.json"
+    assert needs_full_run({"main/pages/dashboard_page.py"}) is None
+
+
+def test_recorded_coverage_is_merged_into_the_map(tmp_path):
+    path = tmp_path / "impact_map.json"
+    recorder = CoverageRecorder(path)
+    recorder.start("a.py::test_one")
+    try:
+        import_closure.__wrapped__(Path(DASHBOARD_TEST))
+    finally:
+        recorder.stop()
+    recorder.save()
+
+    assert "main/utils/impact_selection.py" in load_impact_map(path)["a.py::test_one"]
@@ -0,0 +1,60 @@
+import json
+from concurrent.futures import ProcessPoolExecutor
+from main.utils.json_handler import JsonHandler
+from main.utils.json_journal import JsonJournal
+
+
+def _record_many(file_path, worker, count):
+    journal = JsonJournal(file_path, compact_bytes=2048)
+    for index in range(count):
+        journal.append({f"{worker}_{index}": index})
+
+
+def test_journal_merges_appends_from_many_processes(tmp_path):
+    file_path = tmp_path / "runtime_data.json"
+    JsonHandler.overwrite_json(file_path, {"existing": True})
+
+    with ProcessPoolExecutor(max_workers=3) as executor:
+        list(executor.map(_record_many, [file_path] * 3, ["gw0", "gw1", "gw2"], [200] * 3))
+
+    journal = JsonJournal(file_path)
+    data = journal.read()
+    assert data["existing"] is True
+    assert len(data) == 1 + 3 * 200
+    assert data["gw2_199"] == 199
+
+    journal.compact()
+    assert JsonHandler.read_json(file_path) == data
+    assert journal.journal_path.read_bytes() == b""
+
+
+def test_journal_ignores_torn_record(tmp_path):
+    file_path = tmp_path / "runtime_data.json"
+    journal = JsonJournal(file_path)
+    journal.append({"first": 1})
+    with open(journal.journal_path, "ab") as f:
+        f.write(b'{"half": ')
+
+    journal.append({"second": 2})
+    assert JsonJournal(file_path).read() == {"first": 1, "second": 2}
+
+
+def test_append_json_keeps_existing_keys(tmp_path):
+    file_path = tmp_path / "data.json"
+    JsonHandler.append_json(file_path, {"a": 1})
+    JsonHandler.append_json(file_path, {"b": 2})
+    assert json.loads(file_path.read_text()) == {"a": 1, "b": 2}
+
+
+def test_atomic_writes_keep_file_permissions(tmp_path):
+    new_file = tmp_path / "new.json"
+    JsonHandler.overwrite_json(new_file, {"a": 1})
+    opened_file = tmp_path / "opened.json"
+    opened_file.write_text("{}")
+    assert new_file.stat().st_mode & 0o777 == opened_file.stat().st_mode & 0o777
+
+    shared_file = tmp_path / "shared.json"
+    shared_file.write_text("{}")
+    shared_file.chmod(0o664)
+    JsonHandler.append_json(shared_file, {"b": 2})
+    assert shared_file.stat().st_mode & 0o777 == 0o664
@@ -0,0 +1,67 @@
+import asyncio
+import logging
+import pytest
+from main.envi.settings import ConfigError, load_settings
+from main.fixtures.asyncNavigation import asyncNavigationFunctions
+from main.fixtures.navigation import PREFETCH_SCRIPT, navigationFunctions
+
+
+def test_routes_resolve_against_the_environment_base_url():
+    settings = load_settings("local")
+    assert settings.route_url("About") == "http://localhost:8080/about-us/"
+    with pytest.raises(ConfigError, match="Unknown route 'Careers'"):
+        settings.route_url("Careers")
+    with pytest.raises(ConfigError, match="routes"):
+        load_settings("local", {"routes": "/about-us/"})
+
+
+def test_route_navigation_skips_the_menu_and_prefetches(fakes):
+    page = fakes.Page()
+    navigation = navigationFunctions(page, logging.getLogger(__name__), load_settings("local"))
+
+    navigation.navigate_to_other_page("Services", prefetch=("Contact",))
+    assert page.calls == [
+        ("goto", "http://localhost:8080/services/"),
+        ("wait_for", "text=Our Services"),
+        ("evaluate", PREFETCH_SCRIPT, ["http://localhost:8080/contact-us/"]),
+    ]
+
+    page.calls.clear()
+    navigation.navigate_to_other_page("Services", via="menu")
+    assert page.calls == [("click", "a:has-text('Services')"), ("wait_for", "text=Our Services")]
+
+    with pytest.raises(ValueError, match="Unknown page: Careers"):
+        navigation.navigate_to_other_page("Careers")
+
+
+def test_route_navigation_fails_on_an_error_response(fakes):
+    page = fakes.Page()
+    navigation = navigationFunctions(page, logging.getLogger(__name__), load_settings("local"))
+
+    # The Contact landmark is the page's own heading, not the menu link every page shows
+    navigation.navigate_to_other_page("Contact")
+    assert page.calls == [
+        ("goto", "http://localhost:8080/contact-us/"),
+        ("wait_for", "role=heading[name=Contact Us]"),
+    ]
+
+    page = fakes.Page(status=404)
+    navigation = navigationFunctions(page, logging.getLogger(__name__), load_settings("local"))
+    with pytest.raises(AssertionError, match="Contact route http://localhost:8080/contact-us/ answered HTTP 404"):
+        navigation.navigate_to_other_page("Contact")
+    assert page.calls == [("goto", "http://localhost:8080/contact-us/")]
+
+
+def test_async_route_navigation_shares_the_locators_and_checks(fakes):
+    page = fakes.AsyncPage()
+    navigation = asyncNavigationFunctions(page, logging.getLogger(__name__), load_settings("local"))
+    asyncio.run(navigation.navigate_to_other_page("Contact"))
+    assert page.calls == [
+        ("goto", "http://localhost:8080/contact-us/"),
+        ("wait_for", "role=heading[name=Contact Us]"),
+    ]
+
+    page = fakes.AsyncPage(status=500)
+    navigation = asyncNavigationFunctions(page, logging.getLogger(__name__), load_settings("local"))
+    with pytest.raises(AssertionError, match="answered HTTP 500"):
+        asyncio.run(navigation.navigate_to_other_page("Contact"))
@@ -0,0 +1,69 @@
+import asyncio
+import json
+import pytest
+from main.envi.settings import ConfigError, load_run_profile
+from main.fixtures.networkFilter import NetworkFilter
+
+
+def test_run_profiles_extend_the_default_profile(tmp_path):
+    fast = load_run_profile("fast")
+    assert fast["headless"] and "image" in fast["blockResourceTypes"]
+    assert load_run_profile("default")["blockResourceTypes"] == []
+
+    profiles_path = tmp_path / "profiles.json"
+    profiles_path.write_text(json.dumps({
+        "default": {"headless": False, "denyDomains": []},
+        "ci": {"headless": True},
+        "broken": {"denyDomains": "hotjar.com"},
+    }))
+    assert load_run_profile("ci", profiles_path) == {"headless": True, "denyDomains": []}
+    with pytest.raises(ConfigError, match="must be a list"):
+        load_run_profile("broken", profiles_path)
+    with pytest.raises(ConfigError, match="Unknown run profile 'nightly'"):
+        load_run_profile("nightly", profiles_path)
+
+
+def test_routes_are_blocked_by_domain_and_resource_type(fakes):
+    network_filter = NetworkFilter("https://stratpoint.com/", block_resource_types=["image"],
+                                   allow_domains=["cdn.example.com"], deny_domains=["hotjar.com"],
+                                   known_sizes={"https://stratpoint.com/logo.png": 2048})
+
+    assert network_filter.block_reason("https://static.hotjar.com/c.js", "script") == "denied-domain"
+    assert network_filter.block_reason("https://tracker.example.net/t.js", "script") == "third-party"
+    assert network_filter.block_reason("https://cdn.example.com/app.js", "script") is None
+
+    routes = [fakes.Route("https://stratpoint.com/logo.png?v=123", "image"), fakes.Route("https://stratpoint.com/"),
+              fakes.Route("https://cdn.example.com/hero.jpg", "image")]
+    for route in routes:
+        network_filter._handle_route(route)
+    assert [route.outcome for route in routes] == ["blockedbyclient", "fallback", "blockedbyclient"]
+    # The size was learned without the cache-busting query string
+    assert (network_filter.bytes_saved, network_filter.unknown_saved) == (2048, 1)
+    assert "2 requests blocked (image: 2)" in network_filter.summary()
+
+
+def test_sizes_are_only_observed_when_blocking_or_opted_in(fakes):
+    context = fakes.Context()
+    NetworkFilter("https://stratpoint.com/").install(context)
+    assert context.listeners == [] and context.routes == []
+
+    NetworkFilter("https://stratpoint.com/", record_sizes=True).install(context)
+    assert context.listeners == ["response"] and context.routes == []
+
+    context = fakes.Context()
+    NetworkFilter("https://stratpoint.com/", block_resource_types=["font"]).install(context)
+    assert context.listeners == ["response"] and context.calls == [("route", "**/*")]
+
+
+def test_async_contexts_are_routed_through_the_filter(fakes):
+    network_filter = NetworkFilter("https://stratpoint.com/", block_resource_types=["image"])
+    context = fakes.AsyncContext()
+    asyncio.run(network_filter.install_async(context))
+    assert context.listeners == ["response"]
+    [(pattern, handler)] = context.routes
+
+    routes = [fakes.AsyncRoute("https://stratpoint.com/logo.png", "image"), fakes.AsyncRoute("https://stratpoint.com/")]
+    for route in routes:
+        asyncio.run(handler(route))
+    assert [route.outcome for route in routes] == ["blockedbyclient", "fallback"]
+    assert network_filter.blocked["image"] == 1
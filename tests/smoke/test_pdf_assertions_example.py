@@ -1,6 +1,8 @@
 import pytest
+import PyPDF2
 from pathlib import Path
 from main.utils.pdf_assert import PDFAssert
+from main.utils.pdf_text_store import PDFTextStore
 import re
 
 class TestPDFAssertions:
@@ -59,3 +61,135 @@ class TestPDFAssertions:
         assert len(full_text) > 0, "PDF appears to be empty"
         print(f"PDF contains {len(full_text)} characters")
 
+
+    @pytest.mark.pdf_verification
+    def test_pdf_cache_reuses_parsed_document(self):
+        pdf_path = "main/resources/sample_report.pdf"
+
+        PDFAssert.invalidate_cache(pdf_path)
+        PDFAssert.cache.reset_stats()
+        PDFAssert.assert_text_exists(pdf_path, "Quality Assurance")
+        PDFAssert.assert_page_count(pdf_path, expected_pages=11)
+        PDFAssert.get_metadata(pdf_path)
+
+        stats = PDFAssert.cache_stats()
+        assert stats['misses'] == 1
+        assert stats['hits'] == 2
+
+    @pytest.mark.pdf_verification
+    def test_pdf_multiple_expectations(self):
+        pdf_path = "main/resources/sample_report.pdf"
+
+        report = PDFAssert.assert_expectations(pdf_path, [
+            {"type": "present", "text": "Quality Assurance"},
+            {"type": "present", "text": "quality assurance", "case_sensitive": False},
+            {"type": "absent", "text": "Error"},
+            {"type": "absent", "text": "CONFIDENTIAL"},
+            {"type": "on_page", "text": "Title Page", "page": 1},
+            {"type": "on_page", "text": "Summary", "page": 2},
+            {"type": "regex", "pattern": r"\d{4}-\d{2}-\d{2}"},
+        ])
+        assert report['passed']
+
+        report = PDFAssert.check_expectations(pdf_path, [
+            {"type": "present", "text": "Quality Assurance"},
+            {"type": "on_page", "text": "Title Page", "page": 2},
+        ])
+        assert not report['passed']
+        assert [result['passed'] for result in report['results']] == [True, False]
+
+    @pytest.mark.pdf_verification
+    def test_pdf_streamed_search_reports_pages(self):
+        pdf_path = "main/resources/sample_report.pdf"
+
+        pages = [page_number for page_number, _ in PDFAssert.iter_pages(pdf_path)]
+        assert pages == list(range(1, PDFAssert.get_page_count(pdf_path) + 1))
+
+        matches = PDFAssert.search_text_with_context(pdf_path, "Summary", context_chars=10, max_matches=1)
+        assert len(matches) == 1
+        assert matches[0]['page'] == 2
+        assert matches[0]['matched_text'] == "Summary"
+
+        dates = PDFAssert.assert_regex_pattern(pdf_path, r"\d{4}-\d{2}-\d{2}", max_matches=1)
+        assert len(dates) == 1
+
+    @pytest.mark.pdf_verification
+    def test_pdf_parallel_extraction_matches_serial(self):
+        pdf_path = "main/resources/sample_report.pdf"
+
+        PDFAssert.invalidate_cache(pdf_path)
+        serial_text = PDFAssert.extract_text(pdf_path, parallel=False)
+        PDFAssert.invalidate_cache(pdf_path)
+        with pytest.MonkeyPatch.context() as patch:
+            patch.setattr(PDFAssert, "parallel_min_pages", 1)
+            parallel_text = PDFAssert.extract_text(pdf_path, parallel=True, workers=2)
+
+        assert parallel_text == serial_text
+
+    @pytest.mark.pdf_verification
+    def test_pdf_text_store_skips_parsing_on_reuse(self, tmp_path):
+        pdf_path = "main/resources/sample_report.pdf"
+        store = PDFTextStore(tmp_path)
+
+        with pytest.MonkeyPatch.context() as patch:
+            patch.setattr(PDFAssert, "text_store", store)
+            PDFAssert.invalidate_cache(pdf_path)
+            expected_text = PDFAssert.extract_text(pdf_path)
+            assert store.misses == 1
+
+            PDFAssert.invalidate_cache(pdf_path)
+            assert PDFAssert.extract_text(pdf_path) == expected_text
+            assert PDFAssert.get_metadata(pdf_path)['page_count'] == 11
+            assert store.hits == 1
+
+    @pytest.mark.pdf_verification
+    def test_pdf_text_store_miss_keeps_early_exit(self, tmp_path):
+        pdf_path = "main/resources/sample_report.pdf"
+        store = PDFTextStore(tmp_path)
+        first_page_line = PyPDF2.PdfReader(pdf_path).pages[0].extract_text().strip().splitlines()[0]
+
+        with pytest.MonkeyPatch.context() as patch:
+            patch.setattr(PDFAssert, "text_store", store)
+            PDFAssert.invalidate_cache(pdf_path)
+            assert PDFAssert.assert_text_exists(pdf_path, first_page_line)
+
+            document = PDFAssert.cache.get(pdf_path)
+            assert sum(text is not None for text in document._pages) == 1
+            assert list(tmp_path.glob("*.json")) == []
+
+            # A full extraction saves the entry for later runs
+            PDFAssert.extract_text(pdf_path)
+            assert len(list(tmp_path.glob("*.json"))) == 1
+
+    @pytest.mark.pdf_verification
+    def test_pdf_text_store_filled_by_assertions_alone(self, tmp_path):
+        pdf_path = "main/resources/sample_report.pdf"
+        store = PDFTextStore(tmp_path)
+        last_page_line = "Details for section 11"
+
+        with pytest.MonkeyPatch.context() as patch:
+            patch.setattr(PDFAssert, "text_store", store)
+            PDFAssert.invalidate_cache(pdf_path)
+            assert PDFAssert.assert_text_exists(pdf_path, last_page_line)
+            assert len(list(tmp_path.glob("*.json"))) == 1
+
+            # A later run (fresh document cache) answers from the store without parsing the PDF
+            PDFAssert.invalidate_cache(pdf_path)
+            def no_parsing(*args, **kwargs):
+                raise AssertionError("PDF parsed despite a stored entry")
+            patch.setattr(PyPDF2, "PdfReader", no_parsing)
+            assert PDFAssert.assert_text_exists(pdf_path, last_page_line)
+            assert PDFAssert.assert_text_not_exists(pdf_path, "CONFIDENTIAL")
+        PDFAssert.invalidate_cache(pdf_path)
+
+    @pytest.mark.pdf_verification
+    def test_pdf_indexed_search(self):
+        pdf_path = "main/resources/sample_report.pdf"
+
+        matches = PDFAssert.search_indexed(pdf_path, "quality assurance", context_chars=20, case_sensitive=False)
+        assert len(matches) > 0
+        for match in matches:
+            assert match['matched_text'].lower() == "quality assurance"
+            print(f"Found on page {match['page']}, line {match['line']}: {match['context']}")
+
+        assert PDFAssert.search_indexed(pdf_path, "CONFIDENTIAL") == []
@@ -0,0 +1,58 @@
+import base64
+from main.fixtures.screenshotPipeline import ScreenshotPipeline
+
+
+class _StaticPage:
+    """Stands in for a Playwright page: returns fixed bytes and remembers the screenshot options."""
+
+    def __init__(self, image):
+        self.image = image
+        self.options = None
+
+    def screenshot(self, **options):
+        self.options = options
+        return self.image
+
+
+def test_capture_policy_and_background_persistence(tmp_path):
+    assert not ScreenshotPipeline(policy="never").wants(failed=True)
+    assert ScreenshotPipeline(policy="on-failure").wants(failed=True)
+    assert not ScreenshotPipeline(policy="on-failure").wants(failed=False)
+
+    pipeline = ScreenshotPipeline(image_format="jpeg", quality=60, scale="css")
+    page = _StaticPage(b"jpeg-bytes")
+    image = pipeline.capture(page)
+    assert page.options == {"full_page": True, "scale": "css", "type": "jpeg", "quality": 60}
+
+    screenshot, reason = pipeline.embed(pipeline.submit(image, tmp_path / "shots" / "test_passed.jpg"))
+    pipeline.close()
+    assert reason is None
+    assert base64.b64decode(screenshot.data) == b"jpeg-bytes"
+    assert (screenshot.mime_type, screenshot.extension) == ("image/jpeg", "jpg")
+    assert (tmp_path / "shots" / "test_passed.jpg").read_bytes() == b"jpeg-bytes"
+
+
+def test_size_budgets_keep_large_screenshots_out_of_the_report(monkeypatch):
+    # The total budget is shared between xdist workers
+    monkeypatch.delenv("PYTEST_XDIST_WORKER_COUNT", raising=False)
+    pipeline = ScreenshotPipeline(max_test_bytes=100, max_total_bytes=150)
+    try:
+        assert pipeline.embed(pipeline.submit(b"x" * 80))[0] is not None
+        assert "per-test budget" in pipeline.embed(pipeline.submit(b"x" * 120))[1]
+        assert "report budget" in pipeline.embed(pipeline.submit(b"x" * 80))[1]
+        assert pipeline.embed(pipeline.submit(b"x" * 60))[0] is not None
+        assert pipeline.skipped == 2
+    finally:
+        pipeline.close()
+
+
+def test_registered_screenshots_count_against_the_same_budget(monkeypatch):
+    monkeypatch.delenv("PYTEST_XDIST_WORKER_COUNT", raising=False)
+    pipeline = ScreenshotPipeline(image_format="png", max_total_bytes=100)
+    try:
+        captured, _ = pipeline.embed(pipeline.submit(b"x" * 60))
+        registered, reason = pipeline.embed(pipeline.submit(b"y" * 60, source_format="png"))
+        assert captured.mime_type == "image/png"
+        assert registered is None and "report budget" in reason
+    finally:
+        pipeline.close()
@@ -0,0 +1,80 @@
+import json
+import pytest
+from main.envi.settings import ConfigError, env_var_name, load_settings, parse_overrides
+
+CONFIG = {
+    "defaultEnvironment": "prod",
+    "baseURL": "https://example.com/",
+    "dashboardURL": "https://example.com/dashboard",
+    "loginURL": "https://example.com/login",
+    "defaultTimeout": 60000,
+    "navigationTimeout": 60000,
+    "environments": {
+        "prod": {},
+        "local": {"baseURL": "http://localhost:8080/", "defaultTimeout": 10000},
+    },
+}
+
+
+@pytest.fixture
+def config_path(tmp_path, monkeypatch):
+    for key in ("TEST_ENV", "TEST_BASE_URL", "TEST_DEFAULT_TIMEOUT", "TEST_NAVIGATION_TIMEOUT"):
+        monkeypatch.delenv(key, raising=False)
+    path = tmp_path / "urls.json"
+    path.write_text(json.dumps(CONFIG))
+    return path
+
+
+def test_values_are_layered_defaults_profile_env_overrides(config_path, monkeypatch):
+    settings = load_settings(config_path=config_path)
+    assert settings.environment == "prod"
+    assert (settings.base_url, settings.default_timeout) == ("https://example.com/", 60000)
+
+    # --env picks the profile, falling back to TEST_ENV
+    monkeypatch.setenv("TEST_ENV", "local")
+    settings = load_settings(config_path=config_path)
+    assert (settings.environment, settings.base_url, settings.default_timeout) == ("local", "http://localhost:8080/", 10000)
+    assert settings.dashboard_url == "https://example.com/dashboard"
+    assert load_settings("prod", config_path=config_path).environment == "prod"
+
+    # TEST_* variables beat the profile and are coerced to the setting's type; overrides beat both
+    monkeypatch.setenv("TEST_DEFAULT_TIMEOUT", "15000")
+    monkeypatch.setenv("TEST_BASE_URL", "http://127.0.0.1:9000/")
+    settings = load_settings(config_path=config_path)
+    assert (settings.base_url, settings.default_timeout) == ("http://127.0.0.1:9000/", 15000)
+    settings = load_settings(overrides={"defaultTimeout": "5000"}, config_path=config_path)
+    assert settings.default_timeout == 5000
+    assert settings["defaultTimeout"] == 5000
+
+
+def test_config_overrides_are_parsed_as_key_value_pairs():
+    assert env_var_name("navigationTimeout") == "TEST_NAVIGATION_TIMEOUT"
+    assert env_var_name("baseURL") == "TEST_BASE_URL"
+    assert parse_overrides(["baseURL=http://127.0.0.1:9000/?a=b", "defaultTimeout=5000"]) == {
+        "baseURL": "http://127.0.0.1:9000/?a=b", "defaultTimeout": "5000",
+    }
+    assert parse_overrides(None) == {}
+    for pair in ("baseURL", "=value"):
+        with pytest.raises(ConfigError, match="KEY=VALUE"):
+            parse_overrides([pair])
+
+
+def test_invalid_settings_raise_config_error(config_path, monkeypatch):
+    with pytest.raises(ConfigError, match="Unknown environment 'qa'"):
+        load_settings("qa", config_path=config_path)
+    with pytest.raises(ConfigError, match="must be int"):
+        load_settings(overrides={"defaultTimeout": "soon"}, config_path=config_path)
+    with pytest.raises(ConfigError, match="not an http"):
+        load_settings(overrides={"baseURL": "localhost:8080"}, config_path=config_path)
+    with pytest.raises(ConfigError, match="must be positive"):
+        load_settings(overrides={"navigationTimeout": "0"}, config_path=config_path)
+    monkeypatch.setenv("TEST_DEFAULT_TIMEOUT", "ten")
+    with pytest.raises(ConfigError, match="TEST_DEFAULT_TIMEOUT"):
+        load_settings(config_path=config_path)
+    monkeypatch.delenv("TEST_DEFAULT_TIMEOUT")
+
+    missing = dict(CONFIG)
+    del missing["loginURL"]
+    config_path.write_text(json.dumps(missing))
+    with pytest.raises(ConfigError, match="missing settings: loginURL"):
+        load_settings(config_path=config_path)
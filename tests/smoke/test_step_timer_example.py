@@ -0,0 +1,62 @@
+import asyncio
+import pytest
+from main.utils.step_timer import StepTimer, step_timer, timed_step
+
+
+class _Flow:
+    @timed_step
+    def open(self, target):
+        return target
+
+    @timed_step
+    async def open_async(self, target):
+        await asyncio.sleep(0)
+        return target
+
+    @timed_step(name="Flow.fail", target_arg=None)
+    def fail(self, reason):
+        raise ValueError(reason)
+
+
+@pytest.fixture
+def enabled_timer(monkeypatch):
+    monkeypatch.setattr(step_timer, "enabled", True)
+    monkeypatch.setattr(step_timer, "records", [])
+    return step_timer
+
+
+def test_steps_are_not_recorded_when_disabled(monkeypatch):
+    monkeypatch.setattr(step_timer, "enabled", False)
+    monkeypatch.setattr(step_timer, "records", [])
+    assert _Flow().open("Home") == "Home"
+    assert step_timer.records == []
+
+
+def test_records_duration_target_and_outcome(enabled_timer, request):
+    flow = _Flow()
+    flow.open("Home")
+    with pytest.raises(ValueError):
+        flow.fail("boom")
+
+    opened, failed = enabled_timer.records
+    assert (opened["step"], opened["target"], opened["outcome"]) == ("_Flow.open", "Home", "passed")
+    assert (failed["step"], failed["target"], failed["outcome"]) == ("Flow.fail", None, "failed")
+    assert opened["test"] == request.node.nodeid
+
+
+def test_records_coroutine_steps(enabled_timer):
+    assert asyncio.run(_Flow().open_async("About")) == "About"
+    assert [(record["step"], record["target"]) for record in enabled_timer.records] == [("_Flow.open_async", "About")]
+
+
+def test_summary_merges_worker_files(tmp_path):
+    for worker, durations in (("gw0", [1, 2, 3]), ("gw1", [4, 100])):
+        timer = StepTimer()
+        for duration in durations:
+            timer.record("BaseActions.click_element", "#submit", duration / 1000, "passed")
+        timer.save(tmp_path / f"{worker}.json")
+
+    summary = StepTimer.summarize(StepTimer.load_all(tmp_path))
+    row = summary["steps"][0]
+    assert (row["count"], row["p50_ms"], row["p95_ms"], row["max_ms"]) == (5, 3, 100, 100)
+    assert summary["targets"][0]["name"] == "BaseActions.click_element #submit"
@@ -0,0 +1,63 @@
+import asyncio
+import os
+import pytest
+from main.fixtures.traceRecorder import TraceRecorder
+
+
+def test_retain_on_failure_keeps_one_session_per_context(fakes, tmp_path):
+    recorder = TraceRecorder(tmp_path, mode="retain-on-failure")
+    context = fakes.Context()
+
+    recorder.start(context, "test_passes")
+    assert recorder.stop(context, "test_passes", recorder.should_keep(failed=False)) is None
+    recorder.start(context, "test_fails")
+    saved = recorder.stop(context, "test_fails", recorder.should_keep(failed=True))
+    recorder.start(context, "test_without_snapshots", snapshots=False)
+    recorder.stop(context, "test_without_snapshots", recorder.should_keep(failed=False, execution_count=2))
+
+    assert saved.exists()
+    assert context.calls == [
+        ("start", True, True), ("start_chunk", "test_passes"), ("stop_chunk", False),
+        ("start_chunk", "test_fails"), ("stop_chunk", True),
+        ("stop",), ("start", True, False), ("start_chunk", "test_without_snapshots"), ("stop_chunk", True),
+    ]
+
+
+def test_async_contexts_are_traced_like_sync_ones(fakes, tmp_path):
+    recorder = TraceRecorder(tmp_path, mode="retain-on-failure")
+    context = fakes.AsyncContext()
+
+    async def run():
+        await recorder.start_async(context, "test_passes")
+        assert await recorder.stop_async(context, "test_passes", recorder.should_keep(failed=False)) is None
+        await recorder.start_async(context, "test_fails", snapshots=False)
+        return await recorder.stop_async(context, "test_fails", recorder.should_keep(failed=True))
+
+    assert asyncio.run(run()).exists()
+    assert context.calls == [
+        ("start", True, True), ("start_chunk", "test_passes"), ("stop_chunk", False),
+        ("stop",), ("start", True, False), ("start_chunk", "test_fails"), ("stop_chunk", True),
+    ]
+
+
+def test_oldest_traces_are_deleted_beyond_the_limits(fakes, tmp_path):
+    recorder = TraceRecorder(tmp_path, mode="on", max_files=3, max_bytes=250)
+    for index in range(3):
+        old_trace = tmp_path / f"old_{index}.zip"
+        old_trace.write_bytes(b"x" * 100)
+        os.utime(old_trace, (index, index))
+
+    context = fakes.Context()
+    recorder.start(context, "test_new")
+    saved = recorder.stop(context, "test_new", keep=True)
+
+    assert sorted(path.name for path in tmp_path.glob("*.zip")) == sorted(["old_2.zip", saved.name])
+
+
+def test_trace_marker_options_are_validated():
+    assert TraceRecorder.marker_options(None) == {}
+    assert TraceRecorder.marker_options(pytest.mark.trace(snapshots=False).mark) == {"snapshots": False}
+    with pytest.raises(ValueError, match="does not take snapshot"):
+        TraceRecorder.marker_options(pytest.mark.trace(snapshot=False).mark)
+    with pytest.raises(ValueError, match="does not take False"):
+        TraceRecorder.marker_options(pytest.mark.trace(False).mark)
@@ -0,0 +1,66 @@
+import json
+import time
+import pytest
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from main.envi.settings import load_settings
+from main.fixtures.baseActions import BaseActions
+from main.utils.wait_budget import BudgetExceeded, WaitBudget
+
+
+def test_budget_is_learned_from_history_and_clamped(tmp_path):
+    path = tmp_path / "latency_history.json"
+    waits = WaitBudget(path, factor=3, min_ms=500, max_ms=5000, min_samples=5)
+    waits.enable()
+    assert waits.budget("click_element #submit") is None
+
+    for duration in (0.1, 0.2, 0.3, 0.4, 0.6):
+        waits.observe("click_element #submit", time.perf_counter() - duration)
+    for duration in (5, 6, 7, 8, 9):
+        waits.observe("navigate_to http://localhost:8080/", time.perf_counter() - duration)
+    waits.observe("assert_element #rare", time.perf_counter())
+    waits.save()
+
+    learned = WaitBudget(path, factor=3, min_ms=500, max_ms=5000, min_samples=5)
+    learned.enable()
+    assert 1800 <= learned.budget("click_element #submit") < 1900
+    assert learned.budget("navigate_to http://localhost:8080/") == 5000
+    assert learned.budget("assert_element #rare") is None
+
+    error = learned.exceeded("click_element #submit", learned.budget("click_element #submit"), TimeoutError("boom"))
+    assert isinstance(error, BudgetExceeded)
+    assert "learned budget" in str(error)
+
+
+def test_samples_from_several_processes_are_merged(tmp_path):
+    path = tmp_path / "latency_history.json"
+    for worker_samples in ([0.1] * 3, [0.2] * 3):
+        waits = WaitBudget(path, min_samples=5, window=5)
+        waits.enable()
+        for duration in worker_samples:
+            waits.observe("fill_textfield #name", time.perf_counter() - duration)
+        waits.save()
+
+    merged = WaitBudget(path, min_samples=5, window=5)
+    merged.enable()
+    assert len(json.loads(path.read_text())["fill_textfield #name"]) == 5
+    assert merged.p99("fill_textfield #name") == pytest.approx(200, abs=20)
+
+
+def test_disabled_budget_costs_nothing(tmp_path):
+    waits = WaitBudget(tmp_path / "latency_history.json")
+    waits.observe("click_element #submit", time.perf_counter())
+    waits.save()
+    assert waits.budget("click_element #submit") is None
+    assert not (tmp_path / "latency_history.json").exists()
+
+
+def test_timeouts_without_a_budget_are_raised_unchanged(tmp_path):
+    waits = WaitBudget(tmp_path / "latency_history.json")
+    actions = BaseActions(None, load_settings("local"), waits)
+
+    def times_out(budget):
+        raise PlaywrightTimeoutError("Timeout 30000ms exceeded")
+
+    with pytest.raises(PlaywrightTimeoutError) as raised:
+        actions._within_budget("click_element", "#submit", times_out)
+    assert raised.value.__cause__ is None